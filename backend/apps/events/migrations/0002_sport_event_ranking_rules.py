@@ -0,0 +1,43 @@
+# Generated by Django 5.1.6 on 2026-10-17 01:52
+
+import events.models.sport_event
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("events", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="sportevent",
+            name="points_system",
+            field=models.CharField(
+                blank=True,
+                choices=[
+                    ("", "Default for sport type"),
+                    ("football", "Football (3 win, 1 draw, 0 loss)"),
+                    ("basketball", "Basketball (2 win, 1 loss)"),
+                    ("volleyball", "Volleyball (3 win, 2 for 3-2 win, 1 for 2-3 loss)"),
+                    ("cricket", "Cricket (2 win, 1 tie, 0 loss)"),
+                ],
+                default="",
+                help_text="How many standings points a result is worth; empty uses the default for the sport type",
+                max_length=20,
+                verbose_name="Points System",
+            ),
+        ),
+        migrations.AddField(
+            model_name="sportevent",
+            name="tiebreakers",
+            field=models.JSONField(
+                blank=True,
+                default=list,
+                help_text="Ordered criteria separating teams level on points; empty uses goal difference, then goals scored",
+                validators=[events.models.sport_event.validate_tiebreakers],
+                verbose_name="Tiebreakers",
+            ),
+        ),
+    ]
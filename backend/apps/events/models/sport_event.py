@@ -1,9 +1,27 @@
 import uuid
+from django.core.exceptions import ValidationError
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 from users.models import User
 
 
+def validate_tiebreakers(value):
+    """
+    Validate that tiebreakers is a list of known, distinct criteria.
+    """
+    known = [choice for choice, label in SportEvent.TIEBREAKER_CHOICES]
+    if not isinstance(value, list):
+        raise ValidationError(_('Tiebreakers must be a list of criteria.'))
+    unknown = [criterion for criterion in value if criterion not in known]
+    if unknown:
+        raise ValidationError(
+            _('Unknown tiebreakers: %(unknown)s. Choose from: %(known)s.'),
+            params={'unknown': ', '.join(map(str, unknown)), 'known': ', '.join(known)}
+        )
+    if len(set(value)) != len(value):
+        raise ValidationError(_('Each tiebreaker can only be used once.'))
+
+
 class SportEvent(models.Model):
     """
     Model representing specific sports within an event.
@@ -31,6 +49,26 @@ class SportEvent(models.Model):
         ('cancelled', _('Cancelled')),
     )
 
+    POINTS_SYSTEM_CHOICES = (
+        ('', _('Default for sport type')),
+        ('football', _('Football (3 win, 1 draw, 0 loss)')),
+        ('basketball', _('Basketball (2 win, 1 loss)')),
+        ('volleyball', _('Volleyball (3 win, 2 for 3-2 win, 1 for 2-3 loss)')),
+        ('cricket', _('Cricket (2 win, 1 tie, 0 loss)')),
+    )
+
+    TIEBREAKER_CHOICES = (
+        ('goal_difference', _('Goal Difference')),
+        ('goals_for', _('Goals Scored')),
+        ('won', _('Games Won')),
+        ('away_goals', _('Away Goals Scored')),
+        ('fair_play', _('Fair Play (fewest card points)')),
+        ('head_to_head_points', _('Head-to-Head Points')),
+        ('head_to_head_goal_difference', _('Head-to-Head Goal Difference')),
+        ('head_to_head_goals_for', _('Head-to-Head Goals Scored')),
+        ('head_to_head_away_goals', _('Head-to-Head Away Goals Scored')),
+    )
+
     id = models.UUIDField(
         primary_key=True,
         default=uuid.uuid4,
@@ -59,6 +97,21 @@ class SportEvent(models.Model):
     registration_deadline = models.DateTimeField(_('Registration Deadline'))
     rules = models.TextField(_('Rules'), blank=True)
     scoring_system = models.TextField(_('Scoring System'), blank=True)
+    points_system = models.CharField(
+        _('Points System'),
+        max_length=20,
+        choices=POINTS_SYSTEM_CHOICES,
+        blank=True,
+        default='',
+        help_text=_('How many standings points a result is worth; empty uses the default for the sport type')
+    )
+    tiebreakers = models.JSONField(
+        _('Tiebreakers'),
+        default=list,
+        blank=True,
+        validators=[validate_tiebreakers],
+        help_text=_('Ordered criteria separating teams level on points; empty uses goal difference, then goals scored')
+    )
     status = models.CharField(
         _('Status'),
         max_length=20,
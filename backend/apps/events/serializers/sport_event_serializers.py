@@ -19,8 +19,8 @@ class SportEventSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'event', 'event_name', 'sport_type', 'sport_type_display',
             'name', 'description', 'start_date', 'end_date', 'max_teams',
-            'registration_deadline', 'rules', 'scoring_system', 'status',
-            'status_display', 'created_by', 'created_at', 'updated_by', 'updated_at'
+            'registration_deadline', 'rules', 'scoring_system', 'points_system',
+            'tiebreakers', 'status', 'status_display', 'created_by', 'created_at', 'updated_by', 'updated_at'
         ]
         read_only_fields = ['created_by', 'created_at', 'updated_by', 'updated_at']
 
@@ -35,7 +35,7 @@ class SportEventCreateUpdateSerializer(serializers.ModelSerializer):
         fields = [
             'event', 'sport_type', 'name', 'description', 'start_date', 
             'end_date', 'max_teams', 'registration_deadline', 'rules', 
-            'scoring_system', 'status'
+            'scoring_system', 'points_system', 'tiebreakers', 'status'
         ]
     
     def validate(self, data):
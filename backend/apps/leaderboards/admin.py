@@ -2,7 +2,16 @@ from django.contrib import admin
 from django.utils.translation import gettext_lazy as _
 from django.urls import reverse
 from django.utils.html import format_html
-from .models import Leaderboard, LeaderboardEntry
+from .models import (
+    DirtyLeaderboard,
+    Leaderboard,
+    LeaderboardEntry,
+    LeaderboardSnapshot,
+    PlayerLeaderboardEntry,
+)
+from .caching import bump_versions
+from .snapshots import take_snapshot
+from .standings import recalculate_leaderboard
 
 
 class LeaderboardEntryInline(admin.TabularInline):
@@ -29,7 +38,7 @@ class LeaderboardAdmin(admin.ModelAdmin):
     list_display = ['get_sport_event_name', 'last_updated', 'is_final', 'get_entries_count']
     list_filter = ['is_final', 'last_updated']
     search_fields = ['sport_event__name']
-    readonly_fields = ['last_updated']
+    readonly_fields = ['last_updated', 'calculated_at', 'version']
     inlines = [LeaderboardEntryInline]
     actions = ['recalculate_leaderboards', 'finalize_leaderboards']
     
@@ -50,6 +59,12 @@ class LeaderboardAdmin(admin.ModelAdmin):
         return obj.entries.count()
     get_entries_count.short_description = _('Teams')
     
+    def save_model(self, request, obj, form, change):
+        """Move an edited leaderboard to a new version so cached renderings are not served"""
+        super().save_model(request, obj, form, change)
+        if change:
+            obj.touch()
+    
     def recalculate_leaderboards(self, request, queryset):
         """
         Admin action to recalculate the selected leaderboards.
@@ -57,140 +72,21 @@ class LeaderboardAdmin(admin.ModelAdmin):
         from django.contrib import messages
         
         for leaderboard in queryset:
-            # Get the sport event
             sport_event = leaderboard.sport_event
             
-            # Get all completed and verified games for this sport event
-            from scores.models import Score
-            from games.models import Game
-            
-            games = Game.objects.filter(
-                sport_event=sport_event,
-                status='completed',
-                score__verification_status='verified'
-            ).select_related('score')
+            rows = recalculate_leaderboard(leaderboard)
             
-            if not games.exists():
+            if not rows:
                 messages.warning(
                     request, 
                     _(f"No completed and verified games found for {sport_event.name}.")
                 )
                 continue
             
-            # Get all teams that participated in these games
-            team_ids = set()
-            for game in games:
-                for game_team in game.game_teams.all():
-                    team_ids.add(game_team.team_id)
-            
-            # Calculate stats for each team
-            entries = []
-            for team_id in team_ids:
-                # Get team object
-                from teams.models import Team
-                team = Team.objects.get(id=team_id)
-                
-                # Calculate team statistics
-                stats = {
-                    'team': team,
-                    'played': 0,
-                    'won': 0,
-                    'drawn': 0,
-                    'lost': 0,
-                    'goals_for': 0,
-                    'goals_against': 0,
-                    'points': 0,
-                    'clean_sheets': 0,
-                    'yellow_cards': 0,
-                    'red_cards': 0
-                }
-                
-                # Process each game
-                for game in games:
-                    # Check if this team participated in this game
-                    team_designations = game.game_teams.filter(team_id=team_id)
-                    if not team_designations.exists():
-                        continue
-                    
-                    # Increment games played
-                    stats['played'] += 1
-                    
-                    # Get the score
-                    score = game.score
-                    
-                    # Get team designation
-                    team_designation = team_designations.first().designation
-                    
-                    # Set team position (1 or 2) based on designation
-                    team_position = 1 if team_designation in ['team_a', 'home'] else 2
-                    
-                    # Get goals for/against
-                    if team_position == 1:
-                        goals_for = score.final_score_team1 or 0
-                        goals_against = score.final_score_team2 or 0
-                    else:
-                        goals_for = score.final_score_team2 or 0
-                        goals_against = score.final_score_team1 or 0
-                    
-                    stats['goals_for'] += goals_for
-                    stats['goals_against'] += goals_against
-                    
-                    # Check for clean sheet
-                    if goals_against == 0:
-                        stats['clean_sheets'] += 1
-                    
-                    # Determine win/loss/draw
-                    if score.is_draw:
-                        stats['drawn'] += 1
-                        stats['points'] += 1  # 1 point for a draw
-                    elif score.winner and score.winner.id == team_id:
-                        stats['won'] += 1
-                        stats['points'] += 3  # 3 points for a win
-                    else:
-                        stats['lost'] += 1  # 0 points for a loss
-                
-                # Calculate goal difference
-                stats['goal_difference'] = stats['goals_for'] - stats['goals_against']
-                
-                # Update or create leaderboard entry
-                entry, created = LeaderboardEntry.objects.update_or_create(
-                    leaderboard=leaderboard,
-                    team=team,
-                    defaults={
-                        'played': stats['played'],
-                        'won': stats['won'],
-                        'drawn': stats['drawn'],
-                        'lost': stats['lost'],
-                        'goals_for': stats['goals_for'],
-                        'goals_against': stats['goals_against'],
-                        'goal_difference': stats['goal_difference'],
-                        'points': stats['points'],
-                        'clean_sheets': stats['clean_sheets'],
-                        'yellow_cards': stats['yellow_cards'],
-                        'red_cards': stats['red_cards'],
-                        'position': 0  # Temporary position, will be updated below
-                    }
-                )
-                entries.append(entry)
-            
-            # Sort entries by points, goal difference, goals for
-            sorted_entries = sorted(
-                entries,
-                key=lambda x: (-x.points, -x.goal_difference, -x.goals_for)
-            )
-            
-            # Update positions
-            for i, entry in enumerate(sorted_entries):
-                entry.position = i + 1
-                entry.save(update_fields=['position'])
-            
-            # Update leaderboard's last_updated timestamp
-            leaderboard.save()
-            
             # Show success message
             messages.success(
                 request, 
-                _(f"Successfully recalculated leaderboard for {sport_event.name} with {len(entries)} teams.")
+                _(f"Successfully recalculated leaderboard for {sport_event.name} with {len(rows)} teams.")
             )
             
     recalculate_leaderboards.short_description = _("Recalculate selected leaderboards")
@@ -209,8 +105,8 @@ class LeaderboardAdmin(admin.ModelAdmin):
                 )
                 continue
                 
-            leaderboard.is_final = True
-            leaderboard.save(update_fields=['is_final'])
+            leaderboard.touch(is_final=True)
+            take_snapshot(leaderboard, 'finalized')
             
             messages.success(
                 request, 
@@ -260,4 +156,62 @@ class LeaderboardEntryAdmin(admin.ModelAdmin):
             )
         return "-"
     get_leaderboard_name.short_description = _('Sport Event')
-    get_leaderboard_name.admin_order_field = 'leaderboard__sport_event__name'
\ No newline at end of file
+    get_leaderboard_name.admin_order_field = 'leaderboard__sport_event__name'
+    
+    def save_model(self, request, obj, form, change):
+        """Move the leaderboard to a new version so cached renderings are not served"""
+        super().save_model(request, obj, form, change)
+        obj.leaderboard.touch()
+    
+    def delete_model(self, request, obj):
+        """Move the leaderboard to a new version so cached renderings are not served"""
+        super().delete_model(request, obj)
+        obj.leaderboard.touch()
+    
+    def delete_queryset(self, request, queryset):
+        """Move the affected leaderboards to a new version after a bulk delete"""
+        leaderboard_ids = set(queryset.values_list('leaderboard_id', flat=True))
+        super().delete_queryset(request, queryset)
+        bump_versions(Leaderboard.objects.filter(pk__in=leaderboard_ids))
+
+
+@admin.register(DirtyLeaderboard)
+class DirtyLeaderboardAdmin(admin.ModelAdmin):
+    """
+    Admin interface for the leaderboard recalculation queue.
+    """
+    list_display = ['sport_event', 'first_marked_at', 'last_marked_at', 'marks']
+    readonly_fields = ['sport_event', 'first_marked_at', 'last_marked_at', 'marks']
+    ordering = ['first_marked_at']
+
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(LeaderboardSnapshot)
+class LeaderboardSnapshotAdmin(admin.ModelAdmin):
+    """
+    Admin interface for historical standings snapshots.
+    """
+    list_display = ['leaderboard', 'version', 'reason', 'taken_at']
+    list_filter = ['reason', 'leaderboard__sport_event']
+    readonly_fields = ['leaderboard', 'version', 'reason', 'taken_at', 'table']
+    ordering = ['-taken_at']
+
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(PlayerLeaderboardEntry)
+class PlayerLeaderboardEntryAdmin(admin.ModelAdmin):
+    """
+    Admin interface for player scoring totals.
+    """
+    list_display = ['player', 'sport_event', 'goals', 'assists', 'own_goals', 'penalties', 'points']
+    list_filter = ['sport_event']
+    search_fields = ['player__first_name', 'player__last_name', 'player__team__name']
+    readonly_fields = ['sport_event', 'player', 'goals', 'assists', 'own_goals', 'penalties', 'points', 'updated_at']
+    ordering = ['sport_event', '-goals', '-assists']
+
+    def has_add_permission(self, request):
+        return False
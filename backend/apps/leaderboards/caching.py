@@ -0,0 +1,61 @@
+"""
+Caching of rendered leaderboards.
+
+A leaderboard only changes when its version does, so its rendered
+representation is cached per (leaderboard, version) and the version doubles
+as the ETag clients send back in ``If-None-Match``. Writes that change the
+rendering without changing the standings, such as renaming a team, move the
+leaderboard to a new version as well.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+
+
+def leaderboard_etag(leaderboard):
+    """
+    Return the strong ETag of the current version of a leaderboard.
+    """
+    return f'"{leaderboard.pk}-{leaderboard.version}"'
+
+
+def etag_matches(request, etag):
+    """
+    Return True if the request's If-None-Match header matches ``etag``.
+    """
+    header = request.headers.get('If-None-Match')
+    if not header:
+        return False
+    if header.strip() == '*':
+        return True
+    # Weak validators compare equal for GET requests
+    candidates = [value.strip().removeprefix('W/') for value in header.split(',')]
+    return etag in candidates
+
+
+def representation_key(leaderboard, media_type):
+    """
+    Return the cache key of a rendered leaderboard version.
+    """
+    return f'leaderboards:{leaderboard.pk}:v{leaderboard.version}:{media_type}'
+
+
+def get_rendered(leaderboard, media_type, render):
+    """
+    Return the cached rendering of a leaderboard version, calling ``render``
+    to build and cache it on a miss.
+    """
+    key = representation_key(leaderboard, media_type)
+    content = cache.get(key)
+    if content is None:
+        content = render()
+        cache.set(key, content, settings.LEADERBOARD_CACHE_TIMEOUT)
+    return content
+
+
+def bump_versions(leaderboards):
+    """
+    Move the leaderboards in a queryset to a new version, so renderings and
+    ETags of their previous version are no longer served.
+    """
+    return leaderboards.update(version=F('version') + 1)
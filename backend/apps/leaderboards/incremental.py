@@ -0,0 +1,203 @@
+"""
+Incremental leaderboard maintenance.
+
+When a score starts or stops counting towards the standings, or is corrected
+while counted, only the difference between the contribution it last applied
+and its current contribution is written to the two affected entries.
+"""
+from django.db import transaction
+from django.db.models import F
+
+from .models import Leaderboard, LeaderboardEntry, LeaderboardResult
+from .snapshots import take_snapshot
+from .standings import (
+    CONTRIBUTION_FIELDS,
+    STAT_FIELDS,
+    GameResult,
+    game_cards,
+    load_results,
+    rank_rows,
+    ranking_rules,
+    recalculate_leaderboard,
+    resolve_outcome,
+    result_contribution,
+)
+from .tiebreakers import needs_results
+
+
+def is_counted(score):
+    """
+    Return True if the score counts towards the standings.
+    """
+    return score.status == 'completed' and score.verification_status == 'verified'
+
+
+def result_for_score(score):
+    """
+    Build the GameResult of a score, with the cards shown in the game, or
+    None if the game does not have both sides assigned.
+    """
+    team1_id, team2_id = score.team1_id, score.team2_id
+    if team1_id is None or team2_id is None:
+        return None
+
+    team1_score = score.final_score_team1 or 0
+    team2_score = score.final_score_team2 or 0
+    return GameResult(
+        score_id=score.id,
+        game_id=score.game_id,
+        team1_id=team1_id,
+        team2_id=team2_id,
+        team1_score=team1_score,
+        team2_score=team2_score,
+        outcome=resolve_outcome(
+            team1_id, team2_id, team1_score, team2_score,
+            score.winner_id, score.is_draw
+        ),
+        cards=game_cards([score.pk]).get(score.pk),
+    )
+
+
+def contribution_delta(new, old):
+    """
+    Return ``new - old`` per team and field, leaving out zero changes.
+    """
+    delta = {}
+    for team_id in set(new) | set(old):
+        team_new = new.get(team_id, {})
+        team_old = old.get(team_id, {})
+        changes = {
+            field: team_new.get(field, 0) - team_old.get(field, 0)
+            for field in CONTRIBUTION_FIELDS
+        }
+        changes = {field: value for field, value in changes.items() if value}
+        if changes:
+            delta[team_id] = changes
+    return delta
+
+
+def apply_delta(leaderboard, delta):
+    """
+    Add ``delta`` to the entries of a leaderboard, creating entries for teams
+    that are new to the table and removing entries left without games.
+    """
+    for team_id, changes in delta.items():
+        updated = LeaderboardEntry.objects.filter(
+            leaderboard=leaderboard,
+            team_id=team_id
+        ).update(**{field: F(field) + value for field, value in changes.items()})
+
+        if not updated:
+            LeaderboardEntry.objects.create(
+                leaderboard=leaderboard,
+                team_id=team_id,
+                position=0,  # Temporary position, will be updated by rerank
+                **changes
+            )
+
+    LeaderboardEntry.objects.filter(leaderboard=leaderboard, played=0).delete()
+
+
+def rerank(leaderboard, points_system, tiebreakers, removed_score_id=None):
+    """
+    Recompute the positions of a leaderboard from its stored entries.
+    The verified results are only loaded when a tiebreaker needs them,
+    leaving out a score that is being deleted.
+    """
+    entries = list(LeaderboardEntry.objects.filter(
+        leaderboard=leaderboard
+    ).select_related('team'))
+
+    rows = [
+        {
+            'entry': entry,
+            'team_id': entry.team_id,
+            'team_name': entry.team.name,
+            **{field: getattr(entry, field) for field in STAT_FIELDS},
+        }
+        for entry in entries
+    ]
+
+    results = ()
+    if needs_results(tiebreakers):
+        results = [
+            result for result in load_results(leaderboard.sport_event_id)[0]
+            if result.score_id != removed_score_id
+        ]
+
+    changed = []
+    for row in rank_rows(rows, tiebreakers, results, points_system):
+        entry = row['entry']
+        if entry.position != row['position']:
+            entry.position = row['position']
+            changed.append(entry)
+
+    if changed:
+        LeaderboardEntry.objects.bulk_update(changed, ['position'])
+
+
+def apply_score(score):
+    """
+    Bring the leaderboard of the score's sport event in line with the
+    score's current state.
+
+    A leaderboard that was never fully calculated is recalculated instead,
+    which establishes the baseline that later increments build on.
+    """
+    leaderboard, created = Leaderboard.objects.get_or_create(
+        sport_event_id=score.game.sport_event_id
+    )
+    if leaderboard.calculated_at is None:
+        recalculate_leaderboard(leaderboard)
+        return
+
+    points_system, tiebreakers = ranking_rules(leaderboard.sport_event_id)
+    result = result_for_score(score) if is_counted(score) else None
+    new = result_contribution(result, points_system) if result else {}
+
+    with transaction.atomic():
+        # Lock the leaderboard so concurrent results are applied one at a time
+        leaderboard = Leaderboard.objects.select_for_update().get(pk=leaderboard.pk)
+
+        record = LeaderboardResult.objects.filter(score=score).first()
+        old = record.contribution if record else {}
+
+        delta = contribution_delta(new, old)
+        if not delta:
+            return
+
+        apply_delta(leaderboard, delta)
+
+        if not new:
+            record.delete()
+        elif record:
+            record.contribution = new
+            record.save(update_fields=['contribution', 'applied_at'])
+        else:
+            LeaderboardResult.objects.create(
+                leaderboard=leaderboard,
+                score=score,
+                contribution=new
+            )
+
+        rerank(leaderboard, points_system, tiebreakers)
+        leaderboard.touch()
+        take_snapshot(leaderboard, 'result')
+
+
+def revert_score(score):
+    """
+    Remove the contribution of a score that is about to be deleted.
+    """
+    record = LeaderboardResult.objects.filter(score=score).select_related('leaderboard').first()
+    if record is None:
+        return
+
+    points_system, tiebreakers = ranking_rules(record.leaderboard.sport_event_id)
+    with transaction.atomic():
+        leaderboard = Leaderboard.objects.select_for_update().get(pk=record.leaderboard_id)
+        apply_delta(leaderboard, contribution_delta({}, record.contribution))
+        record.delete()
+        rerank(leaderboard, points_system, tiebreakers, removed_score_id=score.id)
+        leaderboard.touch()
+        take_snapshot(leaderboard, 'result')
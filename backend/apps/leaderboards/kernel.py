@@ -0,0 +1,112 @@
+"""
+Vectorized standings kernel.
+
+Works on parallel arrays of team indices and scores and knows nothing about
+Django, so the same code tallies stored results, large leagues and
+simulated seasons. Scores may carry leading batch axes, e.g. one row per
+simulated season, and every season is tallied and ranked at once.
+"""
+import numpy as np
+
+
+TALLY_FIELDS = (
+    'played', 'won', 'drawn', 'lost', 'points',
+    'goals_for', 'goals_against', 'goal_difference', 'clean_sheets',
+)
+
+# Outcome codes, from the point of view of the home (team 1) side
+HOME_WIN = 1
+DRAW = 0
+AWAY_WIN = -1
+
+
+def game_points(points_system, outcome, margin):
+    """
+    Return the points of the home and away side of every game.
+    """
+    close_margin = points_system.get('close_margin', -1)
+    close = margin <= close_margin
+    win = np.where(close, points_system.get('close_win', points_system['win']), points_system['win'])
+    loss = np.where(close, points_system.get('close_loss', points_system['loss']), points_system['loss'])
+    draw = points_system['draw']
+
+    home_points = np.where(outcome == HOME_WIN, win, np.where(outcome == DRAW, draw, loss))
+    away_points = np.where(outcome == AWAY_WIN, win, np.where(outcome == DRAW, draw, loss))
+    return home_points, away_points
+
+
+def tally(n_teams, home, away, home_score, away_score, points_system, outcome=None):
+    """
+    Aggregate every team's statistics with scatter-adds.
+
+    ``home`` and ``away`` are team indices of shape ``(games,)``; the scores
+    and the optional ``outcome`` codes have shape ``(..., games)``. Without
+    ``outcome`` the result follows from the scores. Returns a dict of
+    TALLY_FIELDS to integer arrays of shape ``(..., n_teams)``.
+    """
+    home_score = np.asarray(home_score, dtype=np.int64)
+    away_score = np.asarray(away_score, dtype=np.int64)
+    batch_shape = home_score.shape[:-1]
+    n_games = home_score.shape[-1]
+    n_batches = int(np.prod(batch_shape, dtype=np.int64))
+
+    home_score = home_score.reshape(n_batches, n_games)
+    away_score = away_score.reshape(n_batches, n_games)
+    if outcome is None:
+        outcome = np.sign(home_score - away_score)
+    else:
+        outcome = np.broadcast_to(np.asarray(outcome), batch_shape + (n_games,)).reshape(n_batches, n_games)
+
+    # Offset the team indices of every batch so one bincount covers all batches
+    offsets = (np.arange(n_batches, dtype=np.intp) * n_teams)[:, None]
+    home_index = (np.asarray(home, dtype=np.intp)[None, :] + offsets).ravel()
+    away_index = (np.asarray(away, dtype=np.intp)[None, :] + offsets).ravel()
+    size = n_batches * n_teams
+
+    def per_team(home_values, away_values):
+        totals = (
+            np.bincount(home_index, weights=np.ravel(home_values), minlength=size) +
+            np.bincount(away_index, weights=np.ravel(away_values), minlength=size)
+        )
+        return totals.astype(np.int64).reshape(batch_shape + (n_teams,))
+
+    home_points, away_points = game_points(points_system, outcome, np.abs(home_score - away_score))
+    ones = np.ones_like(home_score)
+
+    tallies = {
+        'played': per_team(ones, ones),
+        'won': per_team(outcome == HOME_WIN, outcome == AWAY_WIN),
+        'drawn': per_team(outcome == DRAW, outcome == DRAW),
+        'lost': per_team(outcome == AWAY_WIN, outcome == HOME_WIN),
+        'points': per_team(home_points, away_points),
+        'goals_for': per_team(home_score, away_score),
+        'goals_against': per_team(away_score, home_score),
+        'clean_sheets': per_team(away_score == 0, home_score == 0),
+    }
+    tallies['goal_difference'] = tallies['goals_for'] - tallies['goals_against']
+    return tallies
+
+
+def rank_order(columns, name_rank):
+    """
+    Return the team indices in ranked order along the last axis.
+
+    ``columns`` are the ranking criteria, most significant first, where
+    higher values rank first; teams level on all of them are ordered by
+    ascending ``name_rank``.
+    """
+    shape = np.shape(columns[0])
+    keys = [np.broadcast_to(name_rank, shape)]
+    keys.extend(-np.asarray(column) for column in reversed(columns))
+    return np.lexsort(keys, axis=-1)
+
+
+def positions(order):
+    """
+    Return the 1-based position of every team given its ranked order.
+    """
+    order = np.asarray(order)
+    ranks = np.empty_like(order)
+    places = np.broadcast_to(np.arange(1, order.shape[-1] + 1), order.shape)
+    np.put_along_axis(ranks, order, places, axis=-1)
+    return ranks
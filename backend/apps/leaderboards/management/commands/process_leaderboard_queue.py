@@ -0,0 +1,70 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from leaderboards.queue import drain, queue_stats
+
+
+class Command(BaseCommand):
+    """
+    Worker that drains the dirty leaderboard queue.
+
+    Each queued sport event is recalculated once after its marks have been
+    quiet for the configured period, however many results marked it.
+    """
+    help = 'Recalculate leaderboards queued for recalculation'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Drain the queue once and exit instead of polling'
+        )
+        parser.add_argument(
+            '--stats',
+            action='store_true',
+            help='Print queue depth and lag and exit'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=settings.LEADERBOARD_QUEUE_POLL_SECONDS,
+            help='Seconds to wait between polls'
+        )
+        parser.add_argument(
+            '--quiet-period',
+            type=float,
+            default=settings.LEADERBOARD_QUEUE_QUIET_SECONDS,
+            help='Seconds a leaderboard must go without new marks before it is recalculated'
+        )
+        parser.add_argument(
+            '--max-delay',
+            type=float,
+            default=settings.LEADERBOARD_QUEUE_MAX_DELAY_SECONDS,
+            help='Recalculate a leaderboard after this many seconds even if marks keep arriving'
+        )
+
+    def handle(self, *args, **options):
+        quiet_period = options['quiet_period']
+        max_delay = options['max_delay']
+
+        if options['stats']:
+            self.write_stats(queue_stats(quiet_period, max_delay))
+            return
+
+        while True:
+            processed = drain(quiet_period, max_delay)
+            if processed or options['verbosity'] > 1:
+                self.stdout.write(f"Recalculated {processed} leaderboard(s)")
+                self.write_stats(queue_stats(quiet_period, max_delay))
+
+            if options['once']:
+                return
+            time.sleep(options['interval'])
+
+    def write_stats(self, stats):
+        self.stdout.write(
+            f"Queue depth: {stats['depth']} ({stats['ready']} ready), "
+            f"lag: {stats['lag_seconds']:.1f}s"
+        )
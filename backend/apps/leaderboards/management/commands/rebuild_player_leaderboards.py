@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from events.models import SportEvent
+from leaderboards.players import rebuild_player_leaderboard
+
+
+class Command(BaseCommand):
+    """
+    Rebuild player leaderboards from all recorded scoring events.
+
+    Player leaderboards are kept current as scoring events change; this is
+    only needed to backfill existing data or repair drift.
+    """
+    help = 'Recompute player scoring leaderboards from score details'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sport-event',
+            action='append',
+            dest='sport_events',
+            help='ID of a sport event to rebuild (repeatable); all sport events by default'
+        )
+
+    def handle(self, *args, **options):
+        sport_events = SportEvent.objects.all()
+        if options['sport_events']:
+            sport_events = sport_events.filter(id__in=options['sport_events'])
+
+        for sport_event_id, name in sport_events.values_list('id', 'name'):
+            entries = rebuild_player_leaderboard(sport_event_id)
+            self.stdout.write(f"Rebuilt player leaderboard for {name}: {entries} player(s)")
@@ -0,0 +1,75 @@
+# Generated by Django 5.1.6 on 2026-10-17 01:46
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("leaderboards", "0001_initial"),
+        ("scores", "0002_score_goals_against_team1_score_goals_against_team2_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="leaderboard",
+            name="calculated_at",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="When the entries were last fully recalculated from all results",
+                null=True,
+                verbose_name="Calculated At",
+            ),
+        ),
+        migrations.CreateModel(
+            name="LeaderboardResult",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                (
+                    "contribution",
+                    models.JSONField(
+                        default=dict,
+                        help_text="Per-team statistics this game added to the leaderboard",
+                        verbose_name="Contribution",
+                    ),
+                ),
+                (
+                    "applied_at",
+                    models.DateTimeField(auto_now=True, verbose_name="Applied At"),
+                ),
+                (
+                    "leaderboard",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="results",
+                        to="leaderboards.leaderboard",
+                        verbose_name="Leaderboard",
+                    ),
+                ),
+                (
+                    "score",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="leaderboard_result",
+                        to="scores.score",
+                        verbose_name="Score",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Leaderboard Result",
+                "verbose_name_plural": "Leaderboard Results",
+                "ordering": ["leaderboard", "-applied_at"],
+            },
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.1.6 on 2026-10-17 01:47
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("events", "0001_initial"),
+        ("leaderboards", "0002_leaderboard_results"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DirtyLeaderboard",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                (
+                    "first_marked_at",
+                    models.DateTimeField(verbose_name="First Marked At"),
+                ),
+                ("last_marked_at", models.DateTimeField(verbose_name="Last Marked At")),
+                (
+                    "marks",
+                    models.PositiveIntegerField(
+                        default=1,
+                        help_text="Number of changes coalesced into this recalculation",
+                        verbose_name="Marks",
+                    ),
+                ),
+                (
+                    "sport_event",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="dirty_leaderboard",
+                        to="events.sportevent",
+                        verbose_name="Sport Event",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Dirty Leaderboard",
+                "verbose_name_plural": "Dirty Leaderboards",
+                "ordering": ["first_marked_at"],
+            },
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.1.6 on 2026-10-17 01:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("leaderboards", "0003_dirty_leaderboard"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="leaderboard",
+            name="version",
+            field=models.PositiveIntegerField(
+                default=0,
+                help_text="Incremented every time the standings or their status change",
+                verbose_name="Version",
+            ),
+        ),
+    ]
@@ -0,0 +1,77 @@
+# Generated by Django 5.1.6 on 2026-10-17 01:50
+
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("leaderboards", "0004_leaderboard_version"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LeaderboardSnapshot",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("version", models.PositiveIntegerField(verbose_name="Version")),
+                (
+                    "reason",
+                    models.CharField(
+                        choices=[
+                            ("recalculated", "Recalculated"),
+                            ("result", "Result Applied"),
+                            ("finalized", "Finalized"),
+                        ],
+                        max_length=20,
+                        verbose_name="Reason",
+                    ),
+                ),
+                (
+                    "taken_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now, verbose_name="Taken At"
+                    ),
+                ),
+                (
+                    "table",
+                    models.JSONField(
+                        default=list,
+                        help_text="Ranked rows of team statistics in SNAPSHOT_COLUMNS order",
+                        verbose_name="Table",
+                    ),
+                ),
+                (
+                    "leaderboard",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="snapshots",
+                        to="leaderboards.leaderboard",
+                        verbose_name="Leaderboard",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Leaderboard Snapshot",
+                "verbose_name_plural": "Leaderboard Snapshots",
+                "ordering": ["leaderboard", "-taken_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["leaderboard", "taken_at"],
+                        name="leaderboard_leaderb_c87cbc_idx",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,86 @@
+# Generated by Django 5.1.6 on 2026-10-17 01:57
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("events", "0002_sport_event_ranking_rules"),
+        ("leaderboards", "0005_leaderboard_snapshots"),
+        ("teams", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PlayerLeaderboardEntry",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("goals", models.PositiveIntegerField(default=0, verbose_name="Goals")),
+                (
+                    "assists",
+                    models.PositiveIntegerField(default=0, verbose_name="Assists"),
+                ),
+                (
+                    "own_goals",
+                    models.PositiveIntegerField(default=0, verbose_name="Own Goals"),
+                ),
+                (
+                    "penalties",
+                    models.PositiveIntegerField(default=0, verbose_name="Penalties"),
+                ),
+                (
+                    "points",
+                    models.PositiveIntegerField(default=0, verbose_name="Points"),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, verbose_name="Updated At"),
+                ),
+                (
+                    "player",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="leaderboard_entries",
+                        to="teams.player",
+                        verbose_name="Player",
+                    ),
+                ),
+                (
+                    "sport_event",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="player_leaderboard_entries",
+                        to="events.sportevent",
+                        verbose_name="Sport Event",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Player Leaderboard Entry",
+                "verbose_name_plural": "Player Leaderboard Entries",
+                "ordering": ["sport_event", "-goals", "-assists"],
+                "indexes": [
+                    models.Index(
+                        fields=["sport_event", "-goals", "-assists"],
+                        name="leaderboard_sport_e_3233c2_idx",
+                    ),
+                    models.Index(
+                        fields=["sport_event", "-points"],
+                        name="leaderboard_sport_e_236bf7_idx",
+                    ),
+                ],
+                "unique_together": {("sport_event", "player")},
+            },
+        ),
+    ]
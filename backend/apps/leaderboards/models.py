@@ -1,5 +1,7 @@
 import uuid
 from django.db import models
+from django.db.models import F
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 
@@ -20,11 +22,22 @@ class Leaderboard(models.Model):
         verbose_name=_('Sport Event')
     )
     last_updated = models.DateTimeField(_('Last Updated'), auto_now=True)
+    calculated_at = models.DateTimeField(
+        _('Calculated At'),
+        null=True,
+        blank=True,
+        help_text=_('When the entries were last fully recalculated from all results')
+    )
     is_final = models.BooleanField(
         _('Is Final'),
         default=False,
         help_text=_('Whether this leaderboard represents the final standings')
     )
+    version = models.PositiveIntegerField(
+        _('Version'),
+        default=0,
+        help_text=_('Incremented every time the standings or their status change')
+    )
 
     class Meta:
         verbose_name = _('Leaderboard')
@@ -34,6 +47,19 @@ class Leaderboard(models.Model):
     def __str__(self):
         return f"Leaderboard for {self.sport_event.name}"
 
+    def touch(self, **fields):
+        """
+        Save ``fields`` and move the leaderboard to a new version.
+
+        The version is incremented in the database so concurrent writers
+        never hand out the same version twice.
+        """
+        fields['last_updated'] = timezone.now()
+        Leaderboard.objects.filter(pk=self.pk).update(version=F('version') + 1, **fields)
+        for name, value in fields.items():
+            setattr(self, name, value)
+        self.version = Leaderboard.objects.values_list('version', flat=True).get(pk=self.pk)
+
 
 class LeaderboardEntry(models.Model):
     """
@@ -82,3 +108,168 @@ class LeaderboardEntry(models.Model):
         
     def __str__(self):
         return f"{self.team.name} - Position {self.position}"
+
+
+class LeaderboardResult(models.Model):
+    """
+    Model storing the contribution a verified game last applied to a leaderboard.
+    Keeping it allows corrections and un-verifications to be reverted exactly
+    without recalculating the whole table.
+    """
+    id = models.UUIDField(
+        primary_key=True,
+        default=uuid.uuid4,
+        editable=False
+    )
+    leaderboard = models.ForeignKey(
+        'leaderboards.Leaderboard',
+        on_delete=models.CASCADE,
+        related_name='results',
+        verbose_name=_('Leaderboard')
+    )
+    score = models.OneToOneField(
+        'scores.Score',
+        on_delete=models.CASCADE,
+        related_name='leaderboard_result',
+        verbose_name=_('Score')
+    )
+    contribution = models.JSONField(
+        _('Contribution'),
+        default=dict,
+        help_text=_('Per-team statistics this game added to the leaderboard')
+    )
+    applied_at = models.DateTimeField(_('Applied At'), auto_now=True)
+
+    class Meta:
+        verbose_name = _('Leaderboard Result')
+        verbose_name_plural = _('Leaderboard Results')
+        ordering = ['leaderboard', '-applied_at']
+
+    def __str__(self):
+        return f"Result of {self.score_id} in {self.leaderboard_id}"
+
+
+class DirtyLeaderboard(models.Model):
+    """
+    Model representing a pending leaderboard recalculation.
+    A sport event is queued at most once; repeated marks only move
+    last_marked_at forward, so bursts of results coalesce into one recompute.
+    """
+    id = models.UUIDField(
+        primary_key=True,
+        default=uuid.uuid4,
+        editable=False
+    )
+    sport_event = models.OneToOneField(
+        'events.SportEvent',
+        on_delete=models.CASCADE,
+        related_name='dirty_leaderboard',
+        verbose_name=_('Sport Event')
+    )
+    first_marked_at = models.DateTimeField(_('First Marked At'))
+    last_marked_at = models.DateTimeField(_('Last Marked At'))
+    marks = models.PositiveIntegerField(
+        _('Marks'),
+        default=1,
+        help_text=_('Number of changes coalesced into this recalculation')
+    )
+
+    class Meta:
+        verbose_name = _('Dirty Leaderboard')
+        verbose_name_plural = _('Dirty Leaderboards')
+        ordering = ['first_marked_at']
+
+    def __str__(self):
+        return f"Pending recalculation for {self.sport_event_id}"
+
+
+class LeaderboardSnapshot(models.Model):
+    """
+    Model storing the standings of a leaderboard as they were at one version.
+    The table is kept as a compact list of rows, one list of values per team
+    in SNAPSHOT_COLUMNS order, so long seasons stay small.
+    """
+    REASON_CHOICES = (
+        ('recalculated', _('Recalculated')),
+        ('result', _('Result Applied')),
+        ('finalized', _('Finalized')),
+    )
+
+    id = models.UUIDField(
+        primary_key=True,
+        default=uuid.uuid4,
+        editable=False
+    )
+    leaderboard = models.ForeignKey(
+        'leaderboards.Leaderboard',
+        on_delete=models.CASCADE,
+        related_name='snapshots',
+        verbose_name=_('Leaderboard')
+    )
+    version = models.PositiveIntegerField(_('Version'))
+    reason = models.CharField(
+        _('Reason'),
+        max_length=20,
+        choices=REASON_CHOICES
+    )
+    taken_at = models.DateTimeField(_('Taken At'), default=timezone.now)
+    table = models.JSONField(
+        _('Table'),
+        default=list,
+        help_text=_('Ranked rows of team statistics in SNAPSHOT_COLUMNS order')
+    )
+
+    class Meta:
+        verbose_name = _('Leaderboard Snapshot')
+        verbose_name_plural = _('Leaderboard Snapshots')
+        ordering = ['leaderboard', '-taken_at']
+        indexes = [
+            models.Index(fields=['leaderboard', 'taken_at']),
+        ]
+
+    def __str__(self):
+        return f"Snapshot v{self.version} of {self.leaderboard_id}"
+
+
+class PlayerLeaderboardEntry(models.Model):
+    """
+    Model representing a player's scoring totals in a sport event.
+    Maintained incrementally from ScoreDetail changes so top scorer and
+    assist tables never aggregate the scoring events per request.
+    """
+    id = models.UUIDField(
+        primary_key=True,
+        default=uuid.uuid4,
+        editable=False
+    )
+    sport_event = models.ForeignKey(
+        'events.SportEvent',
+        on_delete=models.CASCADE,
+        related_name='player_leaderboard_entries',
+        verbose_name=_('Sport Event')
+    )
+    player = models.ForeignKey(
+        'teams.Player',
+        on_delete=models.CASCADE,
+        related_name='leaderboard_entries',
+        verbose_name=_('Player')
+    )
+    goals = models.PositiveIntegerField(_('Goals'), default=0)
+    assists = models.PositiveIntegerField(_('Assists'), default=0)
+    own_goals = models.PositiveIntegerField(_('Own Goals'), default=0)
+    penalties = models.PositiveIntegerField(_('Penalties'), default=0)
+    points = models.PositiveIntegerField(_('Points'), default=0)
+    updated_at = models.DateTimeField(_('Updated At'), auto_now=True)
+
+    class Meta:
+        verbose_name = _('Player Leaderboard Entry')
+        verbose_name_plural = _('Player Leaderboard Entries')
+        ordering = ['sport_event', '-goals', '-assists']
+        unique_together = ['sport_event', 'player']
+        indexes = [
+            models.Index(fields=['sport_event', '-goals', '-assists']),
+            models.Index(fields=['sport_event', '-points']),
+        ]
+
+    def __str__(self):
+        return f"{self.player_id} - {self.goals} goals in {self.sport_event_id}"
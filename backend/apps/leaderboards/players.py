@@ -0,0 +1,193 @@
+"""
+Player scoring leaderboards.
+
+Each scoring event adds a small contribution to the totals of its scorer
+and assisting player. Saving, editing or deleting a ScoreDetail applies the
+difference between the contribution it had and the one it has now, so the
+per-event totals never need to be aggregated from all scoring events.
+"""
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q, Sum, Value
+from django.db.models.functions import Coalesce
+
+from .models import PlayerLeaderboardEntry
+
+
+PLAYER_STAT_FIELDS = ('goals', 'assists', 'own_goals', 'penalties', 'points')
+
+# Event types credited as a goal to the scoring player
+GOAL_EVENT_TYPES = ('goal', 'penalty', 'free_kick')
+
+# Event types that earn neither points for the player nor an assist
+UNCREDITED_EVENT_TYPES = ('own_goal', 'assist', 'yellow_card', 'red_card')
+
+
+def detail_state(detail, sport_event_id=None):
+    """
+    Return the part of a scoring event the player leaderboard depends on.
+    The sport event is looked up from the detail's score unless given.
+    """
+    if sport_event_id is None:
+        from scores.models import Score
+
+        sport_event_id = Score.objects.filter(
+            pk=detail.score_id
+        ).values_list('game__sport_event_id', flat=True).first()
+    return {
+        'sport_event_id': sport_event_id,
+        'player_id': detail.player_id,
+        'assisted_by_id': detail.assisted_by_id,
+        'event_type': detail.event_type,
+        'points': detail.points,
+    }
+
+
+def stored_detail_state(detail_id):
+    """
+    Return the state of a scoring event as currently stored, or None.
+    """
+    from scores.models import ScoreDetail
+
+    return ScoreDetail.objects.filter(pk=detail_id).values(
+        'score_id', 'player_id', 'assisted_by_id', 'event_type', 'points',
+        sport_event_id=F('score__game__sport_event_id')
+    ).first()
+
+
+def detail_contribution(state):
+    """
+    Return ``{(sport_event_id, player_id): {field: value}}`` for one scoring
+    event given its ``detail_state``.
+    """
+    if state is None:
+        return {}
+
+    contribution = {}
+    sport_event_id = state['sport_event_id']
+    event_type = state['event_type']
+
+    if state['player_id']:
+        stats = {}
+        if event_type in GOAL_EVENT_TYPES:
+            stats['goals'] = 1
+        if event_type == 'penalty':
+            stats['penalties'] = 1
+        if event_type == 'own_goal':
+            stats['own_goals'] = 1
+        if event_type == 'assist':
+            stats['assists'] = 1
+        if event_type not in UNCREDITED_EVENT_TYPES and state['points']:
+            stats['points'] = state['points']
+        if stats:
+            contribution[(sport_event_id, state['player_id'])] = stats
+
+    if state['assisted_by_id'] and event_type not in UNCREDITED_EVENT_TYPES:
+        stats = contribution.setdefault((sport_event_id, state['assisted_by_id']), {})
+        stats['assists'] = stats.get('assists', 0) + 1
+
+    return contribution
+
+
+def player_delta(new_state, old_state):
+    """
+    Return the change between two states of a scoring event, per player.
+    """
+    new = detail_contribution(new_state)
+    old = detail_contribution(old_state)
+    delta = {}
+    for key in set(new) | set(old):
+        changes = {
+            field: new.get(key, {}).get(field, 0) - old.get(key, {}).get(field, 0)
+            for field in PLAYER_STAT_FIELDS
+        }
+        changes = {field: value for field, value in changes.items() if value}
+        if changes:
+            delta[key] = changes
+    return delta
+
+
+def merge_deltas(deltas):
+    """
+    Sum several per-player deltas into one.
+    """
+    merged = {}
+    for delta in deltas:
+        for key, changes in delta.items():
+            totals = merged.setdefault(key, {})
+            for field, value in changes.items():
+                totals[field] = totals.get(field, 0) + value
+    return {key: changes for key, changes in merged.items() if any(changes.values())}
+
+
+def apply_player_delta(delta):
+    """
+    Add a per-player delta to the stored entries, creating missing entries
+    and removing entries left empty.
+    """
+    if not delta:
+        return
+
+    with transaction.atomic():
+        for (sport_event_id, player_id), changes in delta.items():
+            entries = PlayerLeaderboardEntry.objects.filter(
+                sport_event_id=sport_event_id,
+                player_id=player_id
+            )
+            increments = {field: F(field) + value for field, value in changes.items()}
+            if entries.update(**increments):
+                continue
+            try:
+                with transaction.atomic():
+                    PlayerLeaderboardEntry.objects.create(
+                        sport_event_id=sport_event_id,
+                        player_id=player_id,
+                        **changes
+                    )
+            except IntegrityError:
+                # Created concurrently; add to the existing entry instead
+                entries.update(**increments)
+
+        empty = Q()
+        for sport_event_id, player_id in delta:
+            empty |= Q(sport_event_id=sport_event_id, player_id=player_id)
+        PlayerLeaderboardEntry.objects.filter(
+            empty, **{field: 0 for field in PLAYER_STAT_FIELDS}
+        ).delete()
+
+
+def rebuild_player_leaderboard(sport_event_id):
+    """
+    Recompute the player leaderboard of a sport event from all of its
+    scoring events with two grouped aggregates. Returns the number of entries.
+    """
+    from scores.models import ScoreDetail
+
+    details = ScoreDetail.objects.filter(score__game__sport_event_id=sport_event_id)
+
+    totals = {}
+    scorers = details.filter(player__isnull=False).values('player_id').annotate(
+        goals=Count('id', filter=Q(event_type__in=GOAL_EVENT_TYPES)),
+        penalties=Count('id', filter=Q(event_type='penalty')),
+        own_goals=Count('id', filter=Q(event_type='own_goal')),
+        assists=Count('id', filter=Q(event_type='assist')),
+        points=Coalesce(Sum('points', filter=~Q(event_type__in=UNCREDITED_EVENT_TYPES)), Value(0)),
+    ).order_by()
+    for row in scorers:
+        totals[row.pop('player_id')] = row
+
+    assisters = details.filter(assisted_by__isnull=False).exclude(
+        event_type__in=UNCREDITED_EVENT_TYPES
+    ).values('assisted_by_id').annotate(assists=Count('id')).order_by()
+    for row in assisters:
+        stats = totals.setdefault(row['assisted_by_id'], {field: 0 for field in PLAYER_STAT_FIELDS})
+        stats['assists'] += row['assists']
+
+    entries = [
+        PlayerLeaderboardEntry(sport_event_id=sport_event_id, player_id=player_id, **stats)
+        for player_id, stats in totals.items()
+        if any(stats.values())
+    ]
+    with transaction.atomic():
+        PlayerLeaderboardEntry.objects.filter(sport_event_id=sport_event_id).delete()
+        PlayerLeaderboardEntry.objects.bulk_create(entries)
+    return len(entries)
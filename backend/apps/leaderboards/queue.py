@@ -0,0 +1,126 @@
+"""
+Database-backed queue of leaderboards waiting for recalculation.
+
+Writers only mark a sport event as dirty; a worker drains the queue and
+recalculates each leaderboard once its marks have been quiet for a while.
+The database is the only dependency, so no broker is needed.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F, Min, Q
+from django.utils import timezone
+
+from .models import DirtyLeaderboard, Leaderboard
+from .standings import recalculate_leaderboard
+
+
+def mark_dirty(sport_event_id):
+    """
+    Queue the leaderboard of a sport event for recalculation.
+    """
+    now = timezone.now()
+    updated = DirtyLeaderboard.objects.filter(sport_event_id=sport_event_id).update(
+        last_marked_at=now,
+        marks=F('marks') + 1
+    )
+    if updated:
+        return
+
+    try:
+        with transaction.atomic():
+            DirtyLeaderboard.objects.create(
+                sport_event_id=sport_event_id,
+                first_marked_at=now,
+                last_marked_at=now
+            )
+    except IntegrityError:
+        # Another writer queued it first; coalesce into its mark
+        DirtyLeaderboard.objects.filter(sport_event_id=sport_event_id).update(
+            last_marked_at=now,
+            marks=F('marks') + 1
+        )
+
+
+def is_dirty(sport_event_id):
+    """
+    Return True if the leaderboard of a sport event is waiting for recalculation.
+    """
+    return DirtyLeaderboard.objects.filter(sport_event_id=sport_event_id).exists()
+
+
+def ready_filter(quiet_period=None, max_delay=None, now=None):
+    """
+    Return the filter selecting queued leaderboards that are due:
+    quiet for ``quiet_period`` seconds, or waiting for more than ``max_delay``.
+    """
+    if quiet_period is None:
+        quiet_period = settings.LEADERBOARD_QUEUE_QUIET_SECONDS
+    if max_delay is None:
+        max_delay = settings.LEADERBOARD_QUEUE_MAX_DELAY_SECONDS
+    now = now or timezone.now()
+    return (
+        Q(last_marked_at__lte=now - timedelta(seconds=quiet_period)) |
+        Q(first_marked_at__lte=now - timedelta(seconds=max_delay))
+    )
+
+
+def queue_stats(quiet_period=None, max_delay=None):
+    """
+    Return the queue depth, the number of due leaderboards and the lag in
+    seconds of the oldest pending mark.
+    """
+    now = timezone.now()
+    queue = DirtyLeaderboard.objects.all()
+    oldest = queue.aggregate(oldest=Min('first_marked_at'))['oldest']
+    return {
+        'depth': queue.count(),
+        'ready': queue.filter(ready_filter(quiet_period, max_delay, now)).count(),
+        'lag_seconds': (now - oldest).total_seconds() if oldest else 0.0,
+    }
+
+
+def process_one(mark):
+    """
+    Recalculate the leaderboard of one queued mark.
+
+    The mark is only removed if nothing marked the sport event again while it
+    was being recalculated, in which case it stays queued for the next pass.
+    Returns False if another worker is already processing it.
+    """
+    with transaction.atomic():
+        locked = DirtyLeaderboard.objects.select_for_update(skip_locked=True).filter(
+            pk=mark.pk
+        ).order_by().first()
+        if locked is None:
+            return False
+
+        leaderboard, created = Leaderboard.objects.get_or_create(
+            sport_event_id=locked.sport_event_id
+        )
+        recalculate_leaderboard(leaderboard)
+
+        DirtyLeaderboard.objects.filter(
+            pk=locked.pk,
+            last_marked_at=locked.last_marked_at
+        ).delete()
+    return True
+
+
+def drain(quiet_period=None, max_delay=None, limit=None):
+    """
+    Recalculate every due leaderboard, oldest first.
+    Returns the number of leaderboards recalculated.
+    """
+    marks = DirtyLeaderboard.objects.filter(
+        ready_filter(quiet_period, max_delay)
+    ).order_by('first_marked_at')
+    if limit:
+        marks = marks[:limit]
+
+    processed = 0
+    for mark in list(marks):
+        if process_one(mark):
+            processed += 1
+    return processed
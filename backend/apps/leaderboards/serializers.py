@@ -1,6 +1,6 @@
 from rest_framework import serializers
 from drf_spectacular.utils import extend_schema_serializer, OpenApiExample
-from .models import Leaderboard, LeaderboardEntry
+from .models import Leaderboard, LeaderboardEntry, PlayerLeaderboardEntry
 
 
 class LeaderboardEntrySerializer(serializers.ModelSerializer):
@@ -29,6 +29,7 @@ class LeaderboardEntrySerializer(serializers.ModelSerializer):
                 'sport_event_name': 'Annual Football Tournament 2025',
                 'last_updated': '2025-03-15T14:30:00Z',
                 'is_final': False,
+                'version': 12,
                 'entries': [
                     {
                         'id': '3fa85f64-5717-4562-b3fc-2c963f66afa8',
@@ -62,7 +63,7 @@ class LeaderboardSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Leaderboard
-        fields = ['id', 'sport_event', 'sport_event_name', 'last_updated', 'is_final', 'entries']
+        fields = ['id', 'sport_event', 'sport_event_name', 'last_updated', 'is_final', 'version', 'entries']
         read_only_fields = fields
 
 
@@ -99,4 +100,85 @@ class TeamLeaderboardSerializer(serializers.Serializer):
     goals_for = serializers.IntegerField()
     goals_against = serializers.IntegerField()
     goal_difference = serializers.IntegerField()
-    is_final = serializers.BooleanField()
\ No newline at end of file
+    is_final = serializers.BooleanField()
+
+class SnapshotEntrySerializer(serializers.Serializer):
+    """
+    Serializer for one team's row in a historical standings snapshot.
+    """
+    team_id = serializers.CharField()
+    team_name = serializers.CharField()
+    position = serializers.IntegerField()
+    played = serializers.IntegerField()
+    won = serializers.IntegerField()
+    drawn = serializers.IntegerField()
+    lost = serializers.IntegerField()
+    points = serializers.IntegerField()
+    goals_for = serializers.IntegerField()
+    goals_against = serializers.IntegerField()
+    goal_difference = serializers.IntegerField()
+
+
+class LeaderboardHistorySerializer(serializers.Serializer):
+    """
+    Serializer for the standings of a leaderboard at a point in time.
+    """
+    version = serializers.IntegerField()
+    taken_at = serializers.DateTimeField()
+    reason = serializers.CharField()
+    entries = SnapshotEntrySerializer(many=True)
+
+
+class PositionHistorySerializer(serializers.Serializer):
+    """
+    Serializer for a team's position in one historical snapshot.
+    """
+    taken_at = serializers.DateTimeField()
+    version = serializers.IntegerField()
+    position = serializers.IntegerField()
+    points = serializers.IntegerField()
+    played = serializers.IntegerField()
+
+
+class SimulatedTeamSerializer(serializers.Serializer):
+    """
+    Serializer for one team's simulated finishing positions.
+    """
+    team_id = serializers.CharField()
+    team_name = serializers.CharField()
+    positions = serializers.ListField(
+        child=serializers.FloatField(),
+        help_text='Probability of finishing in each position, first place first'
+    )
+    expected_position = serializers.FloatField()
+    top_probability = serializers.FloatField(help_text='Probability of finishing in the top positions')
+
+
+class LeaderboardSimulationSerializer(serializers.Serializer):
+    """
+    Serializer for a Monte Carlo simulation of the remaining fixtures.
+    """
+    version = serializers.IntegerField()
+    seasons = serializers.IntegerField()
+    remaining_games = serializers.IntegerField()
+    skipped_games = serializers.IntegerField(help_text='Ongoing or unverified games left out of the simulation')
+    top = serializers.IntegerField()
+    teams = SimulatedTeamSerializer(many=True)
+
+
+class PlayerLeaderboardEntrySerializer(serializers.ModelSerializer):
+    """
+    Serializer for a player's ranked scoring totals in a sport event.
+    """
+    rank = serializers.IntegerField(read_only=True)
+    player_name = serializers.CharField(source='player.get_full_name', read_only=True)
+    team = serializers.UUIDField(source='player.team_id', read_only=True)
+    team_name = serializers.CharField(source='player.team.name', read_only=True)
+
+    class Meta:
+        model = PlayerLeaderboardEntry
+        fields = [
+            'rank', 'player', 'player_name', 'team', 'team_name',
+            'goals', 'assists', 'own_goals', 'penalties', 'points'
+        ]
+        read_only_fields = fields
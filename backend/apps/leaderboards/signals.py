@@ -1,27 +1,193 @@
-from django.db.models.signals import post_save
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
 from django.dispatch import receiver
-from scores.models import Score
-from .models import Leaderboard
+from events.models import SportEvent
+from teams.models import Team
+from scores.models import Score, ScoreDetail
+from scores.signals import score_details_recorded, scores_recalculated, scores_unverified, scores_verified
+from .caching import bump_versions
+from .incremental import apply_score, is_counted, revert_score
+from .models import Leaderboard, LeaderboardResult
+from .players import apply_player_delta, detail_state, merge_deltas, player_delta, stored_detail_state
+from .queue import mark_dirty
+from .standings import recalculate_leaderboard
+
+# SportEvent fields that decide how results are ranked
+RANKING_RULE_FIELDS = ('sport_type', 'points_system', 'tiebreakers')
+
+
+def is_deferred():
+    """
+    Return True if leaderboard updates are left to the queue worker.
+    """
+    return settings.LEADERBOARD_UPDATE_MODE == 'deferred'
 
 
 @receiver(post_save, sender=Score)
 def update_leaderboard_on_score_change(sender, instance, **kwargs):
     """
     Signal handler to update leaderboards when a score is updated.
-    
-    When a score is updated and verified, flag the corresponding leaderboard
-    to be recalculated. This is a lightweight approach that avoids expensive
-    calculations on every save, but ensures the leaderboard is marked for update.
-    """
-    # Only respond when score is completed and verified
-    if instance.status == 'completed' and instance.verification_status == 'verified':
-        # Get the sport event from the game
-        sport_event = instance.game.sport_event
-        
-        # Get or create the leaderboard
-        leaderboard, created = Leaderboard.objects.get_or_create(
-            sport_event=sport_event
-        )
-        
-        # Just update the last_updated timestamp to indicate it needs recalculation
-        leaderboard.save(update_fields=['last_updated'] if not created else None)
\ No newline at end of file
+
+    When a score becomes completed and verified, or stops counting or is
+    corrected after it was applied, only that game's contribution is
+    applied to the two affected leaderboard entries before re-ranking.
+    In deferred mode the sport event is only queued for recalculation.
+    """
+    # Scores that never counted towards the standings have nothing to update
+    if not is_counted(instance):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and not {'status', 'verification_status'} & set(update_fields):
+            return
+        if not LeaderboardResult.objects.filter(score=instance).exists():
+            return
+
+    if is_deferred():
+        mark_dirty(instance.game.sport_event_id)
+    else:
+        apply_score(instance)
+
+
+@receiver([scores_verified, scores_unverified, scores_recalculated], sender=Score)
+def update_leaderboards_on_bulk_verification(sender, scores, **kwargs):
+    """
+    Signal handler to refresh the leaderboard of every sport event with
+    scores verified, unverified or recalculated in bulk, once per sport
+    event rather than once per score.
+    """
+    for sport_event_id in {score.game.sport_event_id for score in scores}:
+        if is_deferred():
+            mark_dirty(sport_event_id)
+        else:
+            leaderboard, created = Leaderboard.objects.get_or_create(sport_event_id=sport_event_id)
+            recalculate_leaderboard(leaderboard)
+
+
+@receiver(pre_delete, sender=Score)
+def revert_leaderboard_on_score_delete(sender, instance, **kwargs):
+    """
+    Signal handler to remove a deleted score's contribution from its leaderboard.
+    """
+    if is_deferred():
+        if LeaderboardResult.objects.filter(score=instance).exists():
+            mark_dirty(instance.game.sport_event_id)
+    else:
+        revert_score(instance)
+
+
+@receiver(pre_save, sender=SportEvent)
+def remember_ranking_rules(sender, instance, raw=False, **kwargs):
+    """
+    Signal handler to remember the ranking rules a sport event had before saving.
+    """
+    if raw:
+        return
+    instance._previous_ranking_rules = SportEvent.objects.filter(
+        pk=instance.pk
+    ).values_list(*RANKING_RULE_FIELDS).first()
+
+
+@receiver(post_save, sender=SportEvent)
+def recalculate_leaderboard_on_rules_change(sender, instance, created, raw=False, **kwargs):
+    """
+    Signal handler to re-rank a leaderboard when its points system or
+    tiebreakers change, since every stored contribution depends on them.
+    """
+    previous = getattr(instance, '_previous_ranking_rules', None)
+    if created or raw or previous is None:
+        return
+    if tuple(previous) == tuple(getattr(instance, field) for field in RANKING_RULE_FIELDS):
+        return
+
+    leaderboard = Leaderboard.objects.filter(
+        sport_event=instance,
+        calculated_at__isnull=False
+    ).first()
+    if leaderboard is None:
+        return
+
+    if is_deferred():
+        mark_dirty(instance.pk)
+    else:
+        recalculate_leaderboard(leaderboard)
+
+
+@receiver(pre_save, sender=Team)
+@receiver(pre_save, sender=SportEvent)
+def remember_name(sender, instance, raw=False, **kwargs):
+    """
+    Signal handler to remember the name a team or sport event had before saving.
+    """
+    if raw:
+        return
+    instance._previous_name = sender.objects.filter(pk=instance.pk).values_list('name', flat=True).first()
+
+
+@receiver(post_save, sender=Team)
+@receiver(post_save, sender=SportEvent)
+def bump_leaderboards_on_rename(sender, instance, created, raw=False, **kwargs):
+    """
+    Signal handler to move the leaderboards showing a renamed team or sport
+    event to a new version, since their cached renderings carry the old name.
+    """
+    previous = getattr(instance, '_previous_name', None)
+    if created or raw or previous is None or previous == instance.name:
+        return
+    if sender is Team:
+        bump_versions(Leaderboard.objects.filter(entries__team=instance))
+    else:
+        bump_versions(Leaderboard.objects.filter(sport_event=instance))
+
+
+@receiver(pre_save, sender=ScoreDetail)
+def remember_player_contribution(sender, instance, raw=False, **kwargs):
+    """
+    Signal handler to remember what an edited scoring event contributed
+    to the player leaderboard before it is saved.
+    """
+    if raw:
+        return
+    instance._previous_player_state = None
+    if not instance._state.adding:
+        instance._previous_player_state = stored_detail_state(instance.pk)
+
+
+@receiver(post_save, sender=ScoreDetail)
+def update_player_leaderboard_on_detail_save(sender, instance, raw=False, **kwargs):
+    """
+    Signal handler to apply a created or edited scoring event to the player leaderboard.
+    """
+    if raw:
+        return
+    previous = getattr(instance, '_previous_player_state', None)
+    sport_event_id = previous['sport_event_id'] if previous and previous.get('score_id') == instance.score_id else None
+    apply_player_delta(player_delta(detail_state(instance, sport_event_id), previous))
+
+
+@receiver(pre_delete, sender=ScoreDetail)
+def remember_deleted_player_contribution(sender, instance, **kwargs):
+    """
+    Signal handler to remember the contribution of a scoring event that is
+    about to be deleted, while its score and game can still be looked up.
+    """
+    instance._previous_player_state = detail_state(instance)
+
+
+@receiver(post_delete, sender=ScoreDetail)
+def update_player_leaderboard_on_detail_delete(sender, instance, **kwargs):
+    """
+    Signal handler to remove a deleted scoring event from the player leaderboard.
+    """
+    apply_player_delta(player_delta(None, getattr(instance, '_previous_player_state', None)))
+
+
+@receiver(score_details_recorded, sender=ScoreDetail)
+def update_player_leaderboard_on_detail_batch(sender, score, details, **kwargs):
+    """
+    Signal handler to apply a batch of inserted scoring events to the player
+    leaderboard in one pass.
+    """
+    sport_event_id = score.game.sport_event_id
+    apply_player_delta(merge_deltas(
+        player_delta(detail_state(detail, sport_event_id), None)
+        for detail in details
+    ))
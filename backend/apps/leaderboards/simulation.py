@@ -0,0 +1,308 @@
+"""
+Monte Carlo simulation of the remaining fixtures of a sport event.
+
+The verified results are kept as they are and every scheduled game is
+sampled from a Poisson scoring model built from them. Ongoing games, and
+completed games whose result is not verified yet, are left out: their
+outcome is neither known nor open. Seasons are simulated
+in vectorized batches by the standings kernel, spread over a process pool,
+and summarised as each team's finishing-position distribution.
+
+Loading the inputs needs the database; everything after that works on
+plain arrays so it can run in worker processes and background threads.
+"""
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import get_context
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+
+from . import kernel
+from .tiebreakers import fair_play_value
+
+
+# Seasons simulated per vectorized batch
+BATCH_SIZE = 2000
+
+# Pseudo-games at the league average added to every team's scoring record,
+# so that teams with few results are not rated on one or two games
+PRIOR_GAMES = 3
+
+# Scoring rates used before any result has been verified
+DEFAULT_HOME_RATE = 1.4
+DEFAULT_AWAY_RATE = 1.1
+
+
+def load_simulation_inputs(leaderboard):
+    """
+    Load the verified results and scheduled games of a leaderboard's sport
+    event as the arrays the simulation runs on. Issues five queries.
+    """
+    from games.models import GameTeam
+
+    from .standings import (
+        OUTCOME_CODES,
+        TEAM1_DESIGNATIONS,
+        counted_scores,
+        load_results,
+        ranking_rules,
+    )
+
+    sport_event_id = leaderboard.sport_event_id
+    points_system, tiebreakers = ranking_rules(sport_event_id)
+    results, team_names, cards = load_results(sport_event_id)
+
+    fixtures = {}
+    skipped = set()
+    remaining = GameTeam.objects.filter(
+        game__sport_event_id=sport_event_id
+    ).exclude(
+        game__status='cancelled'
+    ).exclude(
+        game__score__in=counted_scores(sport_event_id)
+    ).values('game_id', 'game__status', 'team_id', 'team__name', 'designation')
+    for row in remaining:
+        if row['game__status'] != 'scheduled':
+            # Under way or awaiting verification: not sampled from scratch
+            skipped.add(row['game_id'])
+            continue
+        team_names[row['team_id']] = row['team__name']
+        slot = 'home' if row['designation'] in TEAM1_DESIGNATIONS else 'away'
+        fixtures.setdefault(row['game_id'], {})[slot] = row['team_id']
+    fixtures = [teams for teams in fixtures.values() if len(teams) == 2]
+
+    index = {}
+    for result in results:
+        index.setdefault(result.team1_id, len(index))
+        index.setdefault(result.team2_id, len(index))
+    for teams in fixtures:
+        index.setdefault(teams['home'], len(index))
+        index.setdefault(teams['away'], len(index))
+    team_ids = list(index)
+
+    alphabetical = sorted(range(len(team_ids)), key=lambda i: team_names.get(team_ids[i]) or '')
+    name_rank = np.empty(len(team_ids), dtype=np.intp)
+    name_rank[alphabetical] = np.arange(len(team_ids))
+
+    return {
+        'team_ids': team_ids,
+        'team_names': [team_names.get(team_id) for team_id in team_ids],
+        'name_rank': name_rank,
+        'points_system': points_system,
+        'tiebreakers': tiebreakers,
+        'yellow_cards': np.array([cards.get(t, {}).get('yellow_cards', 0) for t in team_ids]),
+        'red_cards': np.array([cards.get(t, {}).get('red_cards', 0) for t in team_ids]),
+        'played_home': np.array([index[r.team1_id] for r in results], dtype=np.intp),
+        'played_away': np.array([index[r.team2_id] for r in results], dtype=np.intp),
+        'played_home_score': np.array([r.team1_score for r in results], dtype=np.int64),
+        'played_away_score': np.array([r.team2_score for r in results], dtype=np.int64),
+        'played_outcome': np.array([OUTCOME_CODES[r.outcome] for r in results], dtype=np.int64),
+        'fixture_home': np.array([index[teams['home']] for teams in fixtures], dtype=np.intp),
+        'fixture_away': np.array([index[teams['away']] for teams in fixtures], dtype=np.intp),
+        'skipped_games': len(skipped),
+    }
+
+
+def scoring_rates(inputs):
+    """
+    Return the expected home and away score of every remaining fixture.
+
+    Each team's attack and defence are its scoring and conceding rates,
+    shrunk towards the league average by PRIOR_GAMES, and the league's home
+    advantage is applied on top.
+    """
+    n_teams = len(inputs['team_ids'])
+    home, away = inputs['played_home'], inputs['played_away']
+    home_score, away_score = inputs['played_home_score'], inputs['played_away_score']
+
+    if len(home_score):
+        home_rate = max(home_score.mean(), 0.1)
+        away_rate = max(away_score.mean(), 0.1)
+    else:
+        home_rate, away_rate = DEFAULT_HOME_RATE, DEFAULT_AWAY_RATE
+    average = (home_rate + away_rate) / 2
+
+    played = np.bincount(home, minlength=n_teams) + np.bincount(away, minlength=n_teams)
+    scored = (
+        np.bincount(home, weights=home_score, minlength=n_teams) +
+        np.bincount(away, weights=away_score, minlength=n_teams)
+    )
+    conceded = (
+        np.bincount(home, weights=away_score, minlength=n_teams) +
+        np.bincount(away, weights=home_score, minlength=n_teams)
+    )
+    attack = (scored + PRIOR_GAMES * average) / (played + PRIOR_GAMES) / average
+    defence = (conceded + PRIOR_GAMES * average) / (played + PRIOR_GAMES) / average
+
+    fixture_home, fixture_away = inputs['fixture_home'], inputs['fixture_away']
+    return (
+        home_rate * attack[fixture_home] * defence[fixture_away],
+        away_rate * attack[fixture_away] * defence[fixture_home],
+    )
+
+
+def simulate_batch(inputs, seasons, seed):
+    """
+    Simulate ``seasons`` seasons and return a ``(teams, teams)`` array
+    counting how often each team finished in each position.
+
+    Row-level tiebreakers are applied as configured; head-to-head and
+    away-goal tiebreakers are approximated by goal difference and goals.
+    """
+    n_teams = len(inputs['team_ids'])
+    rng = np.random.default_rng(seed)
+    points_system = inputs['points_system']
+
+    # The verified results are the same in every season, so tally them once
+    current = kernel.tally(
+        n_teams, inputs['played_home'], inputs['played_away'],
+        inputs['played_home_score'], inputs['played_away_score'],
+        points_system, inputs['played_outcome']
+    )
+
+    home_rate, away_rate = scoring_rates(inputs)
+    n_fixtures = len(home_rate)
+    simulated = kernel.tally(
+        n_teams, inputs['fixture_home'], inputs['fixture_away'],
+        rng.poisson(home_rate, size=(seasons, n_fixtures)),
+        rng.poisson(away_rate, size=(seasons, n_fixtures)),
+        points_system
+    )
+    totals = {field: simulated[field] + current[field] for field in ('points', 'goal_difference', 'goals_for', 'won')}
+
+    columns = [totals['points']]
+    for tiebreaker in inputs['tiebreakers']:
+        if tiebreaker == 'fair_play':
+            columns.append(np.broadcast_to(
+                fair_play_value(inputs['yellow_cards'], inputs['red_cards']), totals['points'].shape
+            ))
+        elif tiebreaker in totals:
+            columns.append(totals[tiebreaker])
+    if len(columns) == 1:
+        columns.extend([totals['goal_difference'], totals['goals_for']])
+
+    positions = kernel.positions(kernel.rank_order(columns, inputs['name_rank'])) - 1
+    cells = np.arange(n_teams)[None, :] * n_teams + positions
+    return np.bincount(cells.ravel(), minlength=n_teams * n_teams).reshape(n_teams, n_teams)
+
+
+_process_pool = None
+_process_pool_lock = threading.Lock()
+
+
+def get_process_pool(workers):
+    """
+    Return the shared process pool used to split simulations, creating it
+    on first use. Workers are spawned so they never inherit request threads.
+    """
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            _process_pool = ProcessPoolExecutor(max_workers=workers, mp_context=get_context('spawn'))
+        return _process_pool
+
+
+def simulate(inputs, seasons, seed=None, workers=None):
+    """
+    Simulate ``seasons`` seasons in batches and return the finishing-position
+    counts. Batches run in the shared process pool when ``workers`` > 0.
+    """
+    if workers is None:
+        workers = settings.LEADERBOARD_SIMULATION_WORKERS
+    n_teams = len(inputs['team_ids'])
+    counts = np.zeros((n_teams, n_teams), dtype=np.int64)
+    if not n_teams or not seasons:
+        return counts
+
+    sizes = [BATCH_SIZE] * (seasons // BATCH_SIZE)
+    if seasons % BATCH_SIZE:
+        sizes.append(seasons % BATCH_SIZE)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    if workers > 0 and len(sizes) > 1:
+        pool = get_process_pool(workers)
+        futures = [pool.submit(simulate_batch, inputs, size, s) for size, s in zip(sizes, seeds)]
+        for future in futures:
+            counts += future.result()
+    else:
+        for size, s in zip(sizes, seeds):
+            counts += simulate_batch(inputs, size, s)
+    return counts
+
+
+def summarise(inputs, counts, seasons):
+    """
+    Turn finishing-position counts into per-team distributions.
+    """
+    teams = []
+    for i, team_id in enumerate(inputs['team_ids']):
+        distribution = counts[i] / seasons if seasons else counts[i].astype(float)
+        teams.append({
+            'team_id': str(team_id),
+            'team_name': inputs['team_names'][i],
+            'positions': [round(float(p), 4) for p in distribution],
+            'expected_position': round(float((distribution * np.arange(1, len(distribution) + 1)).sum()), 2),
+        })
+    teams.sort(key=lambda team: team['expected_position'])
+    return {
+        'seasons': seasons,
+        'remaining_games': int(len(inputs['fixture_home'])),
+        'skipped_games': inputs['skipped_games'],
+        'teams': teams,
+    }
+
+
+def simulation_key(leaderboard, seasons):
+    """
+    Return the cache key of a simulation of a leaderboard version.
+    """
+    return f'leaderboards:{leaderboard.pk}:v{leaderboard.version}:simulation:{seasons}'
+
+
+def get_cached_simulation(leaderboard, seasons):
+    """
+    Return the cached simulation of the leaderboard's current version, if any.
+    """
+    return cache.get(simulation_key(leaderboard, seasons))
+
+
+_jobs = {}
+_jobs_lock = threading.Lock()
+_job_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='leaderboard-simulation')
+
+
+def run_and_cache(key, inputs, seasons, seed):
+    """
+    Run a simulation, cache its summary and return it.
+    """
+    try:
+        summary = summarise(inputs, simulate(inputs, seasons, seed), seasons)
+        cache.set(key, summary, settings.LEADERBOARD_CACHE_TIMEOUT)
+        return summary
+    finally:
+        with _jobs_lock:
+            _jobs.pop(key, None)
+
+
+def start_simulation(leaderboard, seasons):
+    """
+    Start simulating the current version of a leaderboard in the background
+    and return its future. Requests for a version already being simulated
+    share the running job.
+    """
+    key = simulation_key(leaderboard, seasons)
+    with _jobs_lock:
+        future = _jobs.get(key)
+        if future is not None and not future.done():
+            return future
+
+    inputs = load_simulation_inputs(leaderboard)
+    seed = [leaderboard.pk.int, leaderboard.version]
+
+    with _jobs_lock:
+        future = _jobs.get(key)
+        if future is None or future.done():
+            future = _jobs[key] = _job_executor.submit(run_and_cache, key, inputs, seasons, seed)
+    return future
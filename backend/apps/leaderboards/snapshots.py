@@ -0,0 +1,120 @@
+"""
+Historical standings snapshots.
+
+Every change of a leaderboard's version stores the ranked table as it was,
+so the standings at any moment and a team's position over time are read
+back from snapshots instead of replaying games.
+"""
+from teams.models import Team
+
+from .models import LeaderboardEntry, LeaderboardSnapshot
+
+# Order of the values in each snapshot row; team ids are stored as strings
+SNAPSHOT_COLUMNS = (
+    'team_id', 'position', 'played', 'won', 'drawn', 'lost', 'points',
+    'goals_for', 'goals_against', 'goal_difference',
+)
+
+
+def compact_table(rows):
+    """
+    Convert standings rows to the compact list-of-lists snapshot format.
+    """
+    table = [
+        [str(row['team_id'])] + [row[column] for column in SNAPSHOT_COLUMNS[1:]]
+        for row in rows
+    ]
+    table.sort(key=lambda values: values[1])
+    return table
+
+
+def take_snapshot(leaderboard, reason, rows=None):
+    """
+    Store the current standings of a leaderboard.
+
+    ``rows`` are the standings just written, if the caller has them; otherwise
+    they are read from the stored entries. No snapshot is stored if the table
+    is unchanged since the previous one, unless the leaderboard was finalized.
+    Returns the new snapshot or None.
+    """
+    if rows is None:
+        rows = LeaderboardEntry.objects.filter(leaderboard=leaderboard).values(*SNAPSHOT_COLUMNS)
+    table = compact_table(rows)
+
+    if reason != 'finalized':
+        previous = LeaderboardSnapshot.objects.filter(
+            leaderboard=leaderboard
+        ).order_by('-taken_at').values_list('table', flat=True).first()
+        if previous == table:
+            return None
+
+    return LeaderboardSnapshot.objects.create(
+        leaderboard=leaderboard,
+        version=leaderboard.version,
+        reason=reason,
+        table=table
+    )
+
+
+def expand_table(table, team_names):
+    """
+    Convert a compact snapshot table back to standings rows.
+    """
+    rows = []
+    for values in table:
+        row = dict(zip(SNAPSHOT_COLUMNS, values))
+        row['team_name'] = team_names.get(row['team_id'], '')
+        rows.append(row)
+    return rows
+
+
+def team_names_for(team_ids):
+    """
+    Return a mapping of team id strings to team names.
+    """
+    return {
+        str(team_id): name
+        for team_id, name in Team.objects.filter(id__in=team_ids).values_list('id', 'name')
+    }
+
+
+def standings_at(leaderboard, at):
+    """
+    Return the latest snapshot taken at or before ``at`` with its table
+    expanded to rows, or None if the leaderboard had no standings yet.
+    """
+    snapshot = LeaderboardSnapshot.objects.filter(
+        leaderboard=leaderboard,
+        taken_at__lte=at
+    ).order_by('-taken_at').first()
+    if snapshot is None:
+        return None
+
+    team_names = team_names_for([values[0] for values in snapshot.table])
+    return snapshot, expand_table(snapshot.table, team_names)
+
+
+def position_series(leaderboard, team_id):
+    """
+    Return the position and points of a team in every snapshot, oldest first.
+    Snapshots the team does not appear in are left out.
+    """
+    team_id = str(team_id)
+    series = []
+    snapshots = LeaderboardSnapshot.objects.filter(
+        leaderboard=leaderboard
+    ).order_by('taken_at').values_list('taken_at', 'version', 'table')
+
+    for taken_at, version, table in snapshots.iterator():
+        for values in table:
+            if values[0] == team_id:
+                row = dict(zip(SNAPSHOT_COLUMNS, values))
+                series.append({
+                    'taken_at': taken_at,
+                    'version': version,
+                    'position': row['position'],
+                    'points': row['points'],
+                    'played': row['played'],
+                })
+                break
+    return series
@@ -0,0 +1,443 @@
+"""
+Set-based standings engine.
+
+Loads every verified result of a sport event in a fixed number of queries
+and aggregates the team table in a single pass, so the cost of a
+recalculation does not grow in queries with the number of teams or games.
+The aggregation itself runs in the vectorized kernel; this module only
+converts results to arrays and the kernel's tallies back to rows.
+"""
+from collections import namedtuple
+
+import numpy as np
+from django.db import transaction
+from django.db.models import Count, Exists, F, OuterRef
+from django.utils import timezone
+
+from . import kernel
+from .tiebreakers import (
+    DEFAULT_POINT_SYSTEM,
+    DEFAULT_TIEBREAKERS,
+    POINT_SYSTEMS,
+    fair_play_value,
+    get_points_system,
+    get_tiebreakers,
+    needs_results,
+    order_rows,
+    result_points,
+)
+
+
+TEAM1_DESIGNATIONS = ('team_a', 'home')
+TEAM2_DESIGNATIONS = ('team_b', 'away')
+
+# Statistics a single game contributes to a team's row
+CONTRIBUTION_FIELDS = (
+    'played', 'won', 'drawn', 'lost', 'points',
+    'goals_for', 'goals_against', 'goal_difference', 'clean_sheets',
+    'yellow_cards', 'red_cards',
+)
+
+STAT_FIELDS = (
+    'played', 'won', 'drawn', 'lost', 'points',
+    'goals_for', 'goals_against', 'goal_difference',
+    'clean_sheets', 'yellow_cards', 'red_cards',
+)
+
+
+# One verified game as seen by the standings engine.
+# `outcome` is 'team1', 'team2' or 'draw'; `cards` maps team id to the
+# game's card counts, as returned by game_cards.
+GameResult = namedtuple('GameResult', [
+    'score_id', 'game_id', 'team1_id', 'team2_id',
+    'team1_score', 'team2_score', 'outcome', 'cards',
+], defaults=(None,))
+
+
+def counted_scores(sport_event):
+    """
+    Return the queryset of scores that count towards the standings
+    of a sport event: completed and verified.
+    """
+    from scores.models import Score
+
+    return Score.objects.filter(
+        game__sport_event=sport_event,
+        status='completed',
+        verification_status='verified'
+    )
+
+
+def resolve_outcome(team1_id, team2_id, team1_score, team2_score, winner_id, is_draw):
+    """
+    Decide the outcome of a game from the stored winner/draw flags,
+    falling back to the final score when the flags are not set.
+    """
+    if is_draw:
+        return 'draw'
+    if winner_id is not None and winner_id == team1_id:
+        return 'team1'
+    if winner_id is not None and winner_id == team2_id:
+        return 'team2'
+    if team1_score > team2_score:
+        return 'team1'
+    if team2_score > team1_score:
+        return 'team2'
+    return 'draw'
+
+
+def game_cards(scores):
+    """
+    Return the cards shown in each of ``scores`` (a queryset or ids) as
+    ``{score_id: {team_id: {'yellow_cards': n, 'red_cards': n}}}``.
+    Issues one query.
+    """
+    from scores.models import ScoreDetail
+
+    cards = {}
+    card_rows = ScoreDetail.objects.filter(
+        score__in=scores,
+        event_type__in=ScoreDetail.CARD_EVENT_TYPES
+    ).values('score_id', 'team_id', 'event_type').annotate(total=Count('id'))
+    for row in card_rows:
+        field = 'yellow_cards' if row['event_type'] == 'yellow_card' else 'red_cards'
+        cards.setdefault(row['score_id'], {}).setdefault(row['team_id'], {})[field] = row['total']
+    return cards
+
+
+def load_results(sport_event):
+    """
+    Load the verified results of a sport event.
+
+    Returns a tuple ``(results, team_names, cards)`` where ``results`` is a
+    list of GameResult, ``team_names`` maps team id to name and ``cards``
+    maps team id to a ``{'yellow_cards': n, 'red_cards': n}`` dict.
+    Always issues exactly three queries.
+    """
+    from games.models import GameTeam
+
+    scores = counted_scores(sport_event)
+
+    score_rows = list(scores.values(
+        'id', 'game_id', 'final_score_team1', 'final_score_team2',
+        'winner_id', 'is_draw'
+    ))
+
+    designations = {}
+    team_names = {}
+    game_team_rows = GameTeam.objects.filter(
+        game__score__in=scores
+    ).values('game_id', 'team_id', 'team__name', 'designation')
+    for row in game_team_rows:
+        team_names[row['team_id']] = row['team__name']
+        slot = 'team1' if row['designation'] in TEAM1_DESIGNATIONS else 'team2'
+        designations.setdefault(row['game_id'], {})[slot] = row['team_id']
+
+    per_game_cards = game_cards(scores)
+    cards = {}
+    results = []
+    for row in score_rows:
+        teams = designations.get(row['game_id'], {})
+        team1_id = teams.get('team1')
+        team2_id = teams.get('team2')
+        if team1_id is None or team2_id is None:
+            # A game without both sides assigned cannot be ranked
+            continue
+        team1_score = row['final_score_team1'] or 0
+        team2_score = row['final_score_team2'] or 0
+        results.append(GameResult(
+            score_id=row['id'],
+            game_id=row['game_id'],
+            team1_id=team1_id,
+            team2_id=team2_id,
+            team1_score=team1_score,
+            team2_score=team2_score,
+            outcome=resolve_outcome(
+                team1_id, team2_id, team1_score, team2_score,
+                row['winner_id'], row['is_draw']
+            ),
+            cards=per_game_cards.get(row['id']),
+        ))
+        for team_id, counts in (results[-1].cards or {}).items():
+            team_cards = cards.setdefault(team_id, {})
+            for field, total in counts.items():
+                team_cards[field] = team_cards.get(field, 0) + total
+
+    return results, team_names, cards
+
+
+def empty_stats(team_id, team_name=None):
+    """
+    Return a zeroed standings row for a team.
+    """
+    stats = {field: 0 for field in STAT_FIELDS}
+    stats['team_id'] = team_id
+    stats['team_name'] = team_name
+    return stats
+
+
+def ranking_rules(sport_event):
+    """
+    Return ``(points_system, tiebreakers)`` of a sport event, given as an
+    instance or an id. Only an id costs a query. An unknown sport event has
+    no results to rank, so the default rules are returned for it.
+    """
+    from events.models import SportEvent
+
+    if not isinstance(sport_event, SportEvent):
+        sport_event = SportEvent.objects.only(
+            'sport_type', 'points_system', 'tiebreakers'
+        ).filter(pk=sport_event).first()
+        if sport_event is None:
+            return POINT_SYSTEMS[DEFAULT_POINT_SYSTEM], DEFAULT_TIEBREAKERS
+    return get_points_system(sport_event), get_tiebreakers(sport_event)
+
+
+def add_result(table, result, team_names=None, points_system=None):
+    """
+    Add one game result to both teams' rows of ``table``.
+    """
+    team_names = team_names or {}
+    points_system = points_system or POINT_SYSTEMS[DEFAULT_POINT_SYSTEM]
+    sides = (
+        (result.team1_id, result.team1_score, result.team2_score, 'team1'),
+        (result.team2_id, result.team2_score, result.team1_score, 'team2'),
+    )
+    for team_id, goals_for, goals_against, side in sides:
+        stats = table.get(team_id)
+        if stats is None:
+            stats = table[team_id] = empty_stats(team_id, team_names.get(team_id))
+
+        stats['played'] += 1
+        stats['goals_for'] += goals_for
+        stats['goals_against'] += goals_against
+        if goals_against == 0:
+            stats['clean_sheets'] += 1
+
+        if result.outcome == 'draw':
+            outcome = 'drawn'
+        elif result.outcome == side:
+            outcome = 'won'
+        else:
+            outcome = 'lost'
+        stats[outcome] += 1
+        stats['points'] += result_points(points_system, goals_for, goals_against, outcome)
+
+
+def result_contribution(result, points_system=None):
+    """
+    Return the per-team statistics a single result adds to the table,
+    keyed by the team id as a string so that it can be stored as JSON.
+    """
+    table = {}
+    add_result(table, result, points_system=points_system)
+
+    contribution = {}
+    for team_id, stats in table.items():
+        stats['goal_difference'] = stats['goals_for'] - stats['goals_against']
+        stats.update((result.cards or {}).get(team_id, {}))
+        contribution[str(team_id)] = {field: stats[field] for field in CONTRIBUTION_FIELDS}
+    return contribution
+
+
+def rank_rows(rows, tiebreakers=DEFAULT_TIEBREAKERS, results=(), points_system=None):
+    """
+    Sort standings rows and assign their 1-based ``position``.
+    Teams level on points are separated by ``tiebreakers`` and finally by
+    team name so that the order is stable between recalculations.
+    """
+    ranked = order_rows(rows, tiebreakers, results, points_system)
+    for i, row in enumerate(ranked):
+        row['position'] = i + 1
+    return ranked
+
+
+OUTCOME_CODES = {'team1': kernel.HOME_WIN, 'draw': kernel.DRAW, 'team2': kernel.AWAY_WIN}
+
+
+def results_to_arrays(results):
+    """
+    Convert results to the kernel's parallel arrays.
+
+    Returns ``(team_ids, arrays)`` where ``team_ids`` lists the teams in
+    index order and ``arrays`` holds the home/away indices, scores and
+    outcome codes of every result.
+    """
+    index = {}
+    for result in results:
+        index.setdefault(result.team1_id, len(index))
+        index.setdefault(result.team2_id, len(index))
+
+    count = len(results)
+    arrays = {
+        'home': np.fromiter((index[r.team1_id] for r in results), dtype=np.intp, count=count),
+        'away': np.fromiter((index[r.team2_id] for r in results), dtype=np.intp, count=count),
+        'home_score': np.fromiter((r.team1_score for r in results), dtype=np.int64, count=count),
+        'away_score': np.fromiter((r.team2_score for r in results), dtype=np.int64, count=count),
+        'outcome': np.fromiter((OUTCOME_CODES[r.outcome] for r in results), dtype=np.int64, count=count),
+    }
+    return list(index), arrays
+
+
+def name_ranks(team_ids, team_names):
+    """
+    Return the alphabetical rank of every team, the final tiebreaker.
+    """
+    alphabetical = sorted(range(len(team_ids)), key=lambda i: team_names.get(team_ids[i]) or '')
+    ranks = np.empty(len(team_ids), dtype=np.intp)
+    ranks[alphabetical] = np.arange(len(team_ids))
+    return ranks
+
+
+def kernel_columns(tallies, tiebreakers, yellow_cards, red_cards):
+    """
+    Return the kernel ranking columns for points and row-level tiebreakers.
+    """
+    columns = [tallies['points']]
+    for tiebreaker in tiebreakers:
+        if tiebreaker == 'fair_play':
+            columns.append(fair_play_value(yellow_cards, red_cards))
+        else:
+            columns.append(tallies[tiebreaker])
+    return columns
+
+
+def compute_standings(results, team_names=None, cards=None, points_system=None,
+                      tiebreakers=DEFAULT_TIEBREAKERS):
+    """
+    Aggregate results into ranked standings rows.
+    """
+    team_names = team_names or {}
+    cards = cards or {}
+    points_system = points_system or POINT_SYSTEMS[DEFAULT_POINT_SYSTEM]
+    if not results:
+        return []
+
+    team_ids, arrays = results_to_arrays(results)
+    tallies = kernel.tally(
+        len(team_ids), arrays['home'], arrays['away'],
+        arrays['home_score'], arrays['away_score'],
+        points_system, arrays['outcome']
+    )
+
+    rows = []
+    for i, team_id in enumerate(team_ids):
+        stats = empty_stats(team_id, team_names.get(team_id))
+        for field in kernel.TALLY_FIELDS:
+            stats[field] = int(tallies[field][i])
+        stats.update(cards.get(team_id, {}))
+        rows.append(stats)
+
+    if needs_results(tiebreakers):
+        return rank_rows(rows, tiebreakers, results, points_system)
+
+    yellow_cards = np.array([row['yellow_cards'] for row in rows])
+    red_cards = np.array([row['red_cards'] for row in rows])
+    order = kernel.rank_order(
+        kernel_columns(tallies, tiebreakers, yellow_cards, red_cards),
+        name_ranks(team_ids, team_names)
+    )
+    ranked = [rows[i] for i in order]
+    for i, row in enumerate(ranked):
+        row['position'] = i + 1
+    return ranked
+
+
+def calculate_standings(sport_event):
+    """
+    Load the verified results of a sport event and return ranked rows.
+    """
+    points_system, tiebreakers = ranking_rules(sport_event)
+    results, team_names, cards = load_results(sport_event)
+    return compute_standings(results, team_names, cards, points_system, tiebreakers)
+
+
+def fresh_standings(sport_event):
+    """
+    Return ``(leaderboard, rows)`` read from the stored leaderboard entries
+    of a sport event, or ``(leaderboard, None)`` when the stored entries are
+    stale: never calculated or waiting in the recalculation queue.
+    """
+    from .models import DirtyLeaderboard, Leaderboard, LeaderboardEntry
+
+    leaderboard = Leaderboard.objects.filter(sport_event=sport_event).annotate(
+        is_dirty=Exists(DirtyLeaderboard.objects.filter(sport_event=OuterRef('sport_event')))
+    ).order_by().first()
+    if leaderboard is None or leaderboard.calculated_at is None or leaderboard.is_dirty:
+        return leaderboard, None
+
+    rows = list(LeaderboardEntry.objects.filter(
+        leaderboard=leaderboard
+    ).order_by('position').values(
+        'team_id', 'position', *STAT_FIELDS, team_name=F('team__name')
+    ))
+    return leaderboard, rows
+
+
+def write_entries(leaderboard, rows):
+    """
+    Store ranked standings rows as the entries of a leaderboard.
+
+    All entries are upserted with their final positions in a single
+    statement, and entries of teams that are no longer in the standings are
+    removed. Must be called inside a transaction so that readers never see
+    a partially written table.
+    """
+    from .models import LeaderboardEntry
+
+    entries = [
+        LeaderboardEntry(
+            leaderboard=leaderboard,
+            team_id=row['team_id'],
+            position=row['position'],
+            **{field: row[field] for field in STAT_FIELDS}
+        )
+        for row in rows
+    ]
+    LeaderboardEntry.objects.bulk_create(
+        entries,
+        update_conflicts=True,
+        unique_fields=['leaderboard', 'team'],
+        update_fields=list(STAT_FIELDS) + ['position'],
+    )
+
+    LeaderboardEntry.objects.filter(leaderboard=leaderboard).exclude(
+        team_id__in=[row['team_id'] for row in rows]
+    ).delete()
+
+
+def recalculate_leaderboard(leaderboard):
+    """
+    Recalculate and store all entries of a leaderboard.
+
+    Also rebuilds the per-game contributions used by incremental updates.
+    Returns the ranked standings rows.
+    """
+    from .models import Leaderboard, LeaderboardResult
+    from .snapshots import take_snapshot
+
+    with transaction.atomic():
+        # Lock the leaderboard before reading results, so a result applied
+        # concurrently is either read here or applied after this rebuild
+        Leaderboard.objects.select_for_update().get(pk=leaderboard.pk)
+
+        points_system, tiebreakers = ranking_rules(leaderboard.sport_event_id)
+        results, team_names, cards = load_results(leaderboard.sport_event_id)
+        rows = compute_standings(results, team_names, cards, points_system, tiebreakers)
+
+        write_entries(leaderboard, rows)
+
+        LeaderboardResult.objects.filter(leaderboard=leaderboard).delete()
+        LeaderboardResult.objects.bulk_create([
+            LeaderboardResult(
+                leaderboard=leaderboard,
+                score_id=result.score_id,
+                contribution=result_contribution(result, points_system)
+            )
+            for result in results
+        ])
+
+        # Update the leaderboard's timestamps and version
+        leaderboard.touch(calculated_at=timezone.now())
+        take_snapshot(leaderboard, 'recalculated', rows)
+    return rows
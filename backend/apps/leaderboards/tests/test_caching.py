@@ -0,0 +1,125 @@
+import pytest
+from django.contrib import admin
+from django.urls import reverse
+from rest_framework import status
+
+from leaderboards.admin import LeaderboardAdmin, LeaderboardEntryAdmin
+from leaderboards.models import Leaderboard, LeaderboardEntry
+
+pytestmark = pytest.mark.leaderboards  # Mark all tests in this file as leaderboards tests
+
+
+@pytest.mark.django_db
+class TestLeaderboardCaching:
+    """
+    Versioned leaderboard representation tests
+    """
+
+    def test_version_increases_with_every_change(self, sport_event, make_team, make_game):
+        """
+        Test that applying results and finalizing move the leaderboard to a new version
+        """
+        eagles, falcons = make_team('Eagles'), make_team('Falcons')
+        make_game(eagles, falcons, 1, 0)
+        leaderboard = Leaderboard.objects.get(sport_event=sport_event)
+        first = leaderboard.version
+
+        make_game(falcons, eagles, 2, 0)
+        leaderboard.refresh_from_db()
+        second = leaderboard.version
+
+        leaderboard.touch(is_final=True)
+
+        assert 0 < first < second < leaderboard.version
+        assert Leaderboard.objects.get(pk=leaderboard.pk).is_final
+
+    def test_retrieve_returns_304_for_current_etag(
+        self, api_client, sport_event, make_team, make_game, django_assert_num_queries
+    ):
+        """
+        Test that a matching If-None-Match returns 304 without reading entries
+        """
+        make_game(make_team('Eagles'), make_team('Falcons'), 1, 0)
+        leaderboard = Leaderboard.objects.get(sport_event=sport_event)
+        url = reverse('leaderboards:leaderboard-detail', args=[leaderboard.id])
+
+        response = api_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        etag = response['ETag']
+        assert etag == f'"{leaderboard.id}-{leaderboard.version}"'
+        assert response.json()['version'] == leaderboard.version
+
+        with django_assert_num_queries(1):
+            response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+        make_game(make_team('Hawks'), make_team('Owls'), 0, 0)
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response['ETag'] != etag
+        assert len(response.json()['entries']) == 4
+
+    def test_rendered_version_is_cached(
+        self, api_client, locmem_cache, sport_event, make_team, make_game, django_assert_num_queries
+    ):
+        """
+        Test that repeated reads of the same version are served from the cache
+        """
+        eagles, falcons = make_team('Eagles'), make_team('Falcons')
+        make_game(eagles, falcons, 1, 0)
+        leaderboard = Leaderboard.objects.get(sport_event=sport_event)
+        url = reverse('leaderboards:leaderboard-detail', args=[leaderboard.id])
+
+        first = api_client.get(url)
+        with django_assert_num_queries(1):
+            second = api_client.get(url)
+        assert second.content == first.content
+
+        make_game(falcons, eagles, 3, 0)
+        third = api_client.get(url)
+        assert [entry['team_name'] for entry in third.json()['entries']] == ['Falcons', 'Eagles']
+
+    def test_renames_and_entry_edits_move_to_new_version(
+        self, api_client, locmem_cache, sport_event, make_team, make_game
+    ):
+        """
+        Test that renaming a team or sport event, or editing entries in the admin, is not served from cache
+        """
+        eagles, falcons = make_team('Eagles'), make_team('Falcons')
+        make_game(eagles, falcons, 1, 0)
+        leaderboard = Leaderboard.objects.get(sport_event=sport_event)
+        url = reverse('leaderboards:leaderboard-detail', args=[leaderboard.id])
+        etag = api_client.get(url)['ETag']
+
+        eagles.name = 'Golden Eagles'
+        eagles.save()
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()['entries'][0]['team_name'] == 'Golden Eagles'
+
+        sport_event.name = 'Spring Cup'
+        sport_event.save()
+        assert api_client.get(url).json()['sport_event_name'] == 'Spring Cup'
+
+        entry_admin = LeaderboardEntryAdmin(LeaderboardEntry, admin.site)
+        entry_admin.delete_queryset(None, LeaderboardEntry.objects.filter(team=falcons))
+        assert [entry['team_name'] for entry in api_client.get(url).json()['entries']] == ['Golden Eagles']
+
+        entry_admin.delete_model(None, LeaderboardEntry.objects.get(team=eagles))
+        assert api_client.get(url).json()['entries'] == []
+
+    def test_admin_edits_move_to_new_version(self, sport_event, make_team, make_game):
+        """
+        Test that the version is read-only in the admin and saving a leaderboard there bumps it
+        """
+        make_game(make_team('Eagles'), make_team('Falcons'), 1, 0)
+        leaderboard = Leaderboard.objects.get(sport_event=sport_event)
+        version = leaderboard.version
+        leaderboard_admin = LeaderboardAdmin(Leaderboard, admin.site)
+        assert 'version' in leaderboard_admin.get_readonly_fields(None, leaderboard)
+
+        leaderboard.is_final = True
+        leaderboard_admin.save_model(None, leaderboard, None, True)
+
+        leaderboard.refresh_from_db()
+        assert leaderboard.is_final and leaderboard.version == version + 1
@@ -0,0 +1,87 @@
+import pytest
+
+from leaderboards.models import Leaderboard, LeaderboardEntry, LeaderboardResult
+from leaderboards.standings import calculate_standings
+
+pytestmark = pytest.mark.leaderboards  # Mark all tests in this file as leaderboards tests
+
+
+def stored_table(sport_event):
+    """
+    Return the stored leaderboard as comparable tuples ordered by position
+    """
+    return [
+        (entry.team_id, entry.position, entry.played, entry.won, entry.drawn,
+         entry.lost, entry.points, entry.goals_for, entry.goals_against, entry.goal_difference)
+        for entry in LeaderboardEntry.objects.filter(
+            leaderboard__sport_event=sport_event
+        ).order_by('position')
+    ]
+
+
+def computed_table(sport_event):
+    """
+    Return a full recomputation as comparable tuples ordered by position
+    """
+    return [
+        (row['team_id'], row['position'], row['played'], row['won'], row['drawn'],
+         row['lost'], row['points'], row['goals_for'], row['goals_against'], row['goal_difference'])
+        for row in calculate_standings(sport_event)
+    ]
+
+
+@pytest.mark.django_db
+class TestIncrementalLeaderboard:
+    """
+    Incremental leaderboard update tests
+    """
+
+    def test_verified_results_are_applied(self, sport_event, make_team, make_game):
+        """
+        Test that each verified result updates the stored leaderboard
+        """
+        eagles, falcons, hawks = make_team('Eagles'), make_team('Falcons'), make_team('Hawks')
+        make_game(eagles, falcons, 2, 1)
+        make_game(hawks, eagles, 2, 2)
+        make_game(falcons, hawks, 0, 1)
+
+        leaderboard = Leaderboard.objects.get(sport_event=sport_event)
+        assert leaderboard.calculated_at is not None
+        assert LeaderboardResult.objects.filter(leaderboard=leaderboard).count() == 3
+        assert stored_table(sport_event) == computed_table(sport_event)
+
+    def test_correction_applies_difference(self, sport_event, make_team, make_game):
+        """
+        Test that correcting a verified score replaces its old contribution
+        """
+        eagles, falcons = make_team('Eagles'), make_team('Falcons')
+        make_game(falcons, eagles, 1, 1)
+        score = make_game(eagles, falcons, 2, 1)
+
+        score.final_score_team1 = 0
+        score.final_score_team2 = 3
+        score.winner = falcons
+        score.is_draw = False
+        score.save()
+
+        table = stored_table(sport_event)
+        assert table == computed_table(sport_event)
+        assert table[0][0] == falcons.id
+        assert table[0][6] == 4
+
+    def test_unverify_and_delete_revert_contribution(self, sport_event, make_team, make_game):
+        """
+        Test that un-verified and deleted scores are removed from the leaderboard
+        """
+        eagles, falcons, hawks = make_team('Eagles'), make_team('Falcons'), make_team('Hawks')
+        make_game(eagles, falcons, 1, 0)
+        score = make_game(hawks, falcons, 3, 0)
+
+        score.verification_status = 'disputed'
+        score.save()
+        assert stored_table(sport_event) == computed_table(sport_event)
+        assert not LeaderboardEntry.objects.filter(team=hawks).exists()
+
+        other = LeaderboardResult.objects.get().score
+        other.delete()
+        assert stored_table(sport_event) == []
@@ -0,0 +1,82 @@
+import random
+
+import numpy as np
+import pytest
+
+from leaderboards import kernel
+from leaderboards.standings import GameResult, add_result, compute_standings, rank_rows
+from leaderboards.tiebreakers import POINT_SYSTEMS
+
+pytestmark = pytest.mark.leaderboards  # Mark all tests in this file as leaderboards tests
+
+
+def random_results(n_teams, n_games, seed=7):
+    """
+    Build random results between team ids 0..n_teams-1.
+    """
+    rng = random.Random(seed)
+    results = []
+    for _ in range(n_games):
+        team1, team2 = rng.sample(range(n_teams), 2)
+        score1, score2 = rng.randint(0, 4), rng.randint(0, 4)
+        outcome = 'team1' if score1 > score2 else 'team2' if score2 > score1 else 'draw'
+        results.append(GameResult(None, None, team1, team2, score1, score2, outcome))
+    return results
+
+
+class TestStandingsKernel:
+    """
+    Vectorized standings kernel tests
+    """
+
+    def test_tallies_match_row_by_row_aggregation(self):
+        """
+        Test that the kernel aggregates and ranks like the row-by-row engine
+        """
+        results = random_results(40, 600)
+        team_names = {team_id: f'Team {team_id:02d}' for team_id in range(40)}
+        cards = {3: {'yellow_cards': 2}, 11: {'red_cards': 1}}
+
+        table = {}
+        for result in results:
+            add_result(table, result, team_names)
+        for team_id, stats in table.items():
+            stats['goal_difference'] = stats['goals_for'] - stats['goals_against']
+            stats.update(cards.get(team_id, {}))
+        expected = rank_rows(list(table.values()), ('goal_difference', 'goals_for', 'fair_play'))
+
+        rows = compute_standings(results, team_names, cards, tiebreakers=('goal_difference', 'goals_for', 'fair_play'))
+
+        assert rows == expected
+
+    def test_batches_are_tallied_and_ranked_independently(self):
+        """
+        Test that a leading batch axis tallies and ranks each season on its own
+        """
+        home = np.array([0, 1, 2])
+        away = np.array([1, 2, 0])
+        home_score = np.array([[1, 0, 0], [0, 0, 3]])
+        away_score = np.array([[0, 0, 2], [1, 0, 0]])
+
+        tallies = kernel.tally(3, home, away, home_score, away_score, POINT_SYSTEMS['football'])
+        order = kernel.rank_order(
+            [tallies['points'], tallies['goal_difference'], tallies['goals_for']],
+            np.arange(3)
+        )
+
+        assert tallies['points'].tolist() == [[6, 1, 1], [0, 4, 4]]
+        assert tallies['played'].tolist() == [[2, 2, 2], [2, 2, 2]]
+        assert order.tolist() == [[0, 1, 2], [2, 1, 0]]
+        assert kernel.positions(order).tolist() == [[1, 2, 3], [3, 2, 1]]
+
+    def test_close_results_use_close_points(self):
+        """
+        Test that volleyball's close-result points are applied per game
+        """
+        tallies = kernel.tally(
+            2, np.array([0, 1]), np.array([1, 0]),
+            np.array([3, 3]), np.array([2, 0]),
+            POINT_SYSTEMS['volleyball']
+        )
+
+        assert tallies['points'].tolist() == [2 + 0, 1 + 3]
@@ -0,0 +1,117 @@
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+
+from leaderboards.models import Leaderboard, PlayerLeaderboardEntry
+from leaderboards.players import rebuild_player_leaderboard
+
+pytestmark = pytest.mark.leaderboards  # Mark all tests in this file as leaderboards tests
+
+
+def player_table(sport_event):
+    """
+    Return the stored player leaderboard as comparable tuples
+    """
+    return sorted(
+        (entry.player_id, entry.goals, entry.assists, entry.own_goals, entry.penalties, entry.points)
+        for entry in PlayerLeaderboardEntry.objects.filter(sport_event=sport_event)
+    )
+
+
+@pytest.fixture
+def squads(make_team, make_player):
+    """
+    Two teams with two players each
+    """
+    eagles, falcons = make_team('Eagles'), make_team('Falcons')
+    return {
+        'eagles': eagles,
+        'falcons': falcons,
+        'ann': make_player(eagles, 'Ann', 'Archer'),
+        'bob': make_player(eagles, 'Bob', 'Baker'),
+        'cid': make_player(falcons, 'Cid', 'Carter'),
+        'dan': make_player(falcons, 'Dan', 'Dover'),
+    }
+
+
+@pytest.mark.django_db
+class TestPlayerLeaderboard:
+    """
+    Player scoring leaderboard tests
+    """
+
+    def test_incremental_totals_match_a_rebuild(self, sport_event, make_game, squads, make_score_event):
+        """
+        Test that creating, editing and deleting scoring events keeps totals exact
+        """
+        score = make_game(squads['eagles'], squads['falcons'])
+        first = make_score_event(score, squads['eagles'], squads['ann'], assisted_by=squads['bob'])
+        make_score_event(score, squads['eagles'], squads['ann'], event_type='penalty')
+        own_goal = make_score_event(score, squads['falcons'], squads['dan'], event_type='own_goal', points=0)
+        make_score_event(score, squads['falcons'], squads['cid'], assisted_by=squads['dan'])
+
+        first.player = squads['bob']
+        first.assisted_by = squads['ann']
+        first.save()
+        own_goal.delete()
+
+        incremental = player_table(sport_event)
+        rebuild_player_leaderboard(sport_event.id)
+
+        assert incremental == player_table(sport_event)
+        ann = PlayerLeaderboardEntry.objects.get(player=squads['ann'])
+        assert (ann.goals, ann.penalties, ann.assists, ann.points) == (1, 1, 1, 1)
+        assert not PlayerLeaderboardEntry.objects.filter(player=squads['dan'], own_goals__gt=0).exists()
+
+    def test_deleting_a_score_removes_its_events(self, sport_event, make_game, squads, make_score_event):
+        """
+        Test that cascading deletes remove the contributions of every scoring event
+        """
+        score = make_game(squads['eagles'], squads['falcons'])
+        make_score_event(score, squads['eagles'], squads['ann'])
+        make_score_event(score, squads['falcons'], squads['cid'], assisted_by=squads['dan'])
+
+        score.delete()
+
+        assert player_table(sport_event) == []
+
+    def test_endpoint_pages_by_rank_window(
+        self, api_client, sport_event, make_game, squads, make_score_event
+    ):
+        """
+        Test that players tied on a rank are returned in the same window
+        """
+        score = make_game(squads['eagles'], squads['falcons'], 0, 0)
+        for player, goals in (('ann', 3), ('bob', 2), ('cid', 2), ('dan', 1)):
+            team = squads['eagles'] if player in ('ann', 'bob') else squads['falcons']
+            for minute in range(goals):
+                make_score_event(score, team, squads[player], minute=minute)
+        leaderboard = Leaderboard.objects.get(sport_event=sport_event)
+        url = reverse('leaderboards:leaderboard-players', args=[leaderboard.id])
+
+        first = api_client.get(url, {'size': 2})
+        assert first.status_code == status.HTTP_200_OK
+        assert [(row['player_name'], row['rank']) for row in first.data['results']] == [
+            ('Ann Archer', 1), ('Bob Baker', 2), ('Cid Carter', 2)
+        ]
+        assert first.data['next_start'] == 3
+
+        second = api_client.get(url, {'size': 2, 'start': first.data['next_start']})
+        assert [(row['player_name'], row['rank']) for row in second.data['results']] == [('Dan Dover', 4)]
+        assert second.data['next_start'] is None
+
+        assert api_client.get(url, {'order': 'saves'}).status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_rebuild_command(self, sport_event, make_game, squads, capsys, make_score_event):
+        """
+        Test that the rebuild command restores drifted totals
+        """
+        score = make_game(squads['eagles'], squads['falcons'])
+        make_score_event(score, squads['eagles'], squads['ann'])
+        PlayerLeaderboardEntry.objects.update(goals=7)
+
+        call_command('rebuild_player_leaderboards', sport_event=[str(sport_event.id)])
+
+        assert PlayerLeaderboardEntry.objects.get(player=squads['ann']).goals == 1
+        assert 'Rebuilt player leaderboard for Football Cup: 1 player(s)' in capsys.readouterr().out
@@ -0,0 +1,55 @@
+import pytest
+from django.core.management import call_command
+
+from leaderboards.models import DirtyLeaderboard, LeaderboardEntry
+from leaderboards.queue import drain, mark_dirty, queue_stats
+
+pytestmark = pytest.mark.leaderboards  # Mark all tests in this file as leaderboards tests
+
+
+@pytest.mark.django_db
+class TestLeaderboardQueue:
+    """
+    Dirty leaderboard queue tests
+    """
+
+    def test_deferred_mode_only_queues(self, settings, sport_event, make_team, make_game):
+        """
+        Test that verified scores only mark the sport event in deferred mode
+        """
+        settings.LEADERBOARD_UPDATE_MODE = 'deferred'
+        eagles, falcons = make_team('Eagles'), make_team('Falcons')
+        make_game(eagles, falcons, 1, 0)
+        make_game(falcons, eagles, 2, 2)
+
+        mark = DirtyLeaderboard.objects.get(sport_event=sport_event)
+        assert mark.marks == 2
+        assert not LeaderboardEntry.objects.exists()
+
+    def test_marks_coalesce_into_one_recalculation(self, settings, sport_event, make_team, make_game):
+        """
+        Test that the worker recalculates once after the quiet period
+        """
+        settings.LEADERBOARD_UPDATE_MODE = 'deferred'
+        eagles, falcons = make_team('Eagles'), make_team('Falcons')
+        make_game(eagles, falcons, 1, 0)
+        mark_dirty(sport_event.id)
+
+        # Still within the quiet period
+        assert drain(quiet_period=60, max_delay=600) == 0
+        assert queue_stats(quiet_period=60, max_delay=600)['depth'] == 1
+
+        assert drain(quiet_period=0) == 1
+        assert not DirtyLeaderboard.objects.exists()
+        assert LeaderboardEntry.objects.filter(leaderboard__sport_event=sport_event).count() == 2
+
+    def test_worker_command_runs_once(self, sport_event, capsys):
+        """
+        Test that the management command drains the queue and reports stats
+        """
+        mark_dirty(sport_event.id)
+
+        call_command('process_leaderboard_queue', once=True, quiet_period=0)
+
+        assert 'Recalculated 1 leaderboard(s)' in capsys.readouterr().out
+        assert not DirtyLeaderboard.objects.exists()
@@ -0,0 +1,129 @@
+import numpy as np
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from leaderboards.models import Leaderboard
+from leaderboards.simulation import load_simulation_inputs, simulate, start_simulation
+
+pytestmark = pytest.mark.leaderboards  # Mark all tests in this file as leaderboards tests
+
+
+@pytest.fixture
+def season(sport_event, make_team, make_game):
+    """
+    Three teams with two verified results and two remaining games.
+    Eagles cannot be caught; Hawks cannot finish above second.
+    """
+    eagles, falcons, hawks = make_team('Eagles'), make_team('Falcons'), make_team('Hawks')
+    make_game(eagles, falcons, 3, 0)
+    make_game(eagles, hawks, 2, 0)
+    make_game(eagles, falcons)
+    make_game(falcons, hawks)
+    return Leaderboard.objects.get(sport_event=sport_event)
+
+
+@pytest.mark.django_db
+class TestSimulation:
+    """
+    Monte Carlo simulation tests
+    """
+
+    def test_distributions_respect_the_current_table(self, season, django_assert_num_queries):
+        """
+        Test that simulated positions are valid distributions consistent with the results
+        """
+        with django_assert_num_queries(5):
+            inputs = load_simulation_inputs(season)
+        assert len(inputs['fixture_home']) == 2
+
+        counts = simulate(inputs, 3000, seed=1, workers=0)
+
+        assert (counts.sum(axis=0) == 3000).all() and (counts.sum(axis=1) == 3000).all()
+        eagles = inputs['team_names'].index('Eagles')
+        hawks = inputs['team_names'].index('Hawks')
+        assert counts[eagles, 0] == 3000
+        assert counts[hawks, 0] == 0
+        assert 0 < counts[hawks, 1] < 3000
+
+    def test_only_scheduled_games_are_simulated(self, season, make_team, make_game):
+        """
+        Test that ongoing and unverified completed games are left out of the remaining fixtures
+        """
+        owls, ravens = make_team('Owls'), make_team('Ravens')
+        ongoing = make_game(owls, ravens)
+        ongoing.game.status = 'ongoing'
+        ongoing.game.save(update_fields=['status'])
+        unverified = make_game(ravens, owls)
+        unverified.game.status = 'completed'
+        unverified.game.save(update_fields=['status'])
+
+        inputs = load_simulation_inputs(season)
+
+        assert len(inputs['fixture_home']) == 2
+        assert inputs['skipped_games'] == 2
+        assert 'Owls' not in inputs['team_names']
+
+        ongoing.game.status = 'scheduled'
+        ongoing.game.save(update_fields=['status'])
+        inputs = load_simulation_inputs(season)
+
+        assert len(inputs['fixture_home']) == 3
+        assert inputs['skipped_games'] == 1
+        assert 'Owls' in inputs['team_names']
+
+    def test_process_pool_gives_the_same_result(self, season):
+        """
+        Test that batches split across worker processes add up to the inline result
+        """
+        inputs = load_simulation_inputs(season)
+
+        inline = simulate(inputs, 5000, seed=3, workers=0)
+        pooled = simulate(inputs, 5000, seed=3, workers=2)
+
+        assert np.array_equal(inline, pooled)
+
+    def test_endpoint_returns_probabilities_and_caches_them(self, api_client, locmem_cache, settings, season):
+        """
+        Test that the simulation endpoint reports qualification chances per version
+        """
+        settings.LEADERBOARD_SIMULATION_WORKERS = 0
+        url = reverse('leaderboards:leaderboard-simulation', args=[season.id])
+
+        response = api_client.get(url, {'seasons': 2000, 'top': 2})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['version'] == season.version
+        teams = {team['team_name']: team for team in response.data['teams']}
+        assert teams['Eagles']['top_probability'] == 1.0
+        assert teams['Eagles']['positions'][0] == 1.0
+        assert sum(teams['Hawks']['positions']) == pytest.approx(1.0)
+
+        again = api_client.get(url, {'seasons': 2000, 'top': 1})
+        assert again.data['teams'][0]['positions'] == response.data['teams'][0]['positions']
+        assert teams['Falcons']['top_probability'] > again.data['teams'][1]['top_probability']
+
+    def test_endpoint_answers_202_when_over_budget(self, api_client, locmem_cache, settings, season):
+        """
+        Test that a simulation exceeding the latency budget continues in the background
+        """
+        settings.LEADERBOARD_SIMULATION_WORKERS = 0
+        settings.LEADERBOARD_SIMULATION_BUDGET_SECONDS = 0
+        url = reverse('leaderboards:leaderboard-simulation', args=[season.id])
+
+        response = api_client.get(url, {'seasons': 60000})
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert response['Retry-After']
+
+        start_simulation(season, 60000).result(timeout=60)
+        response = api_client.get(url, {'seasons': 60000})
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_invalid_parameters_are_rejected(self, api_client, season):
+        """
+        Test that non-numeric or out-of-range parameters return 400
+        """
+        url = reverse('leaderboards:leaderboard-simulation', args=[season.id])
+
+        assert api_client.get(url, {'top': 'two'}).status_code == status.HTTP_400_BAD_REQUEST
+        assert api_client.get(url, {'seasons': 0}).status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,73 @@
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from leaderboards.models import Leaderboard, LeaderboardSnapshot
+from leaderboards.standings import recalculate_leaderboard
+
+pytestmark = pytest.mark.leaderboards  # Mark all tests in this file as leaderboards tests
+
+
+@pytest.mark.django_db
+class TestLeaderboardSnapshots:
+    """
+    Historical standings tests
+    """
+
+    def test_snapshot_is_stored_for_each_change(self, sport_event, make_team, make_game):
+        """
+        Test that every change stores one compact snapshot and unchanged recalculations none
+        """
+        eagles, falcons = make_team('Eagles'), make_team('Falcons')
+        make_game(eagles, falcons, 1, 0)
+        make_game(falcons, eagles, 2, 0)
+        leaderboard = Leaderboard.objects.get(sport_event=sport_event)
+
+        recalculate_leaderboard(leaderboard)
+
+        snapshots = list(LeaderboardSnapshot.objects.filter(leaderboard=leaderboard).order_by('taken_at'))
+        assert [snapshot.reason for snapshot in snapshots] == ['recalculated', 'result']
+        assert snapshots[-1].version == leaderboard.version - 1
+        assert snapshots[-1].table[0][:2] == [str(falcons.id), 1]
+
+    def test_history_returns_table_at_timestamp(self, api_client, sport_event, make_team, make_game):
+        """
+        Test that the history endpoint returns the standings as they were at a time
+        """
+        eagles, falcons = make_team('Eagles'), make_team('Falcons')
+        make_game(eagles, falcons, 1, 0)
+        after_first = timezone.now()
+        make_game(falcons, eagles, 3, 0)
+        leaderboard = Leaderboard.objects.get(sport_event=sport_event)
+        url = reverse('leaderboards:leaderboard-history', args=[leaderboard.id])
+
+        response = api_client.get(url, {'at': after_first.isoformat()})
+        assert response.status_code == status.HTTP_200_OK
+        assert [row['team_name'] for row in response.data['entries']] == ['Eagles', 'Falcons']
+
+        response = api_client.get(url)
+        assert [row['team_name'] for row in response.data['entries']] == ['Falcons', 'Eagles']
+
+        response = api_client.get(url, {'at': '2000-01-01T00:00:00Z'})
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+        response = api_client.get(url, {'at': 'yesterday'})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_history_returns_team_position_series(self, api_client, admin_client, sport_event, make_team, make_game):
+        """
+        Test that the history endpoint returns a team's position over time
+        """
+        eagles, falcons = make_team('Eagles'), make_team('Falcons')
+        make_game(eagles, falcons, 1, 0)
+        make_game(falcons, eagles, 3, 0)
+        leaderboard = Leaderboard.objects.get(sport_event=sport_event)
+        admin_client.post(reverse('leaderboards:leaderboard-finalize', args=[leaderboard.id]))
+
+        url = reverse('leaderboards:leaderboard-history', args=[leaderboard.id])
+        response = api_client.get(url, {'team': str(eagles.id)})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [point['position'] for point in response.data] == [1, 2, 2]
+        assert [point['played'] for point in response.data] == [1, 2, 2]
@@ -0,0 +1,152 @@
+import uuid
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from leaderboards.models import Leaderboard, LeaderboardEntry
+from leaderboards.standings import calculate_standings, recalculate_leaderboard
+from scores.models import Score
+
+pytestmark = pytest.mark.leaderboards  # Mark all tests in this file as leaderboards tests
+
+
+@pytest.mark.django_db
+class TestStandingsEngine:
+    """
+    Standings engine tests
+    """
+
+    def test_standings_are_aggregated_and_ranked(self, sport_event, make_team, make_game):
+        """
+        Test that verified results are aggregated into a ranked table
+        """
+        eagles, falcons, hawks = make_team('Eagles'), make_team('Falcons'), make_team('Hawks')
+        make_game(eagles, falcons, 2, 0)
+        make_game(falcons, hawks, 1, 1)
+        make_game(hawks, eagles, 0, 3)
+        # Unverified games are ignored
+        make_game(hawks, falcons)
+
+        rows = calculate_standings(sport_event)
+
+        assert [row['team_name'] for row in rows] == ['Eagles', 'Falcons', 'Hawks']
+        top = rows[0]
+        assert top['position'] == 1
+        assert (top['played'], top['won'], top['drawn'], top['lost']) == (2, 2, 0, 0)
+        assert (top['goals_for'], top['goals_against'], top['goal_difference']) == (5, 0, 5)
+        assert top['points'] == 6
+        assert top['clean_sheets'] == 2
+        assert rows[1]['points'] == 1 and rows[2]['points'] == 1
+
+    def test_query_count_does_not_grow_with_games(
+        self, sport_event, make_team, make_game, django_assert_num_queries
+    ):
+        """
+        Test that the engine issues a fixed number of queries
+        """
+        teams = [make_team(f'Team {i}') for i in range(6)]
+        for home in teams:
+            for away in teams:
+                if home != away:
+                    make_game(home, away, 1, 0)
+
+        with django_assert_num_queries(3):
+            rows = calculate_standings(sport_event)
+
+        assert len(rows) == 6
+        assert all(row['played'] == 10 for row in rows)
+
+    def test_calculate_endpoint_stores_entries(self, admin_client, sport_event, make_team, make_game):
+        """
+        Test that the calculate action stores ranked leaderboard entries
+        """
+        eagles, falcons = make_team('Eagles'), make_team('Falcons')
+        make_game(eagles, falcons, 1, 2)
+        leaderboard, _ = Leaderboard.objects.get_or_create(sport_event=sport_event)
+
+        url = reverse('leaderboards:leaderboard-calculate', args=[leaderboard.id])
+        response = admin_client.post(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        entries = LeaderboardEntry.objects.filter(leaderboard=leaderboard).order_by('position')
+        assert [entry.team for entry in entries] == [falcons, eagles]
+        assert [entry['team_name'] for entry in response.data['entries']] == ['Falcons', 'Eagles']
+
+    def test_event_leaderboard_endpoint(self, api_client, sport_event, make_team, make_game):
+        """
+        Test that the public event leaderboard uses the same standings
+        """
+        eagles, falcons = make_team('Eagles'), make_team('Falcons')
+        make_game(eagles, falcons, 3, 3)
+
+        url = reverse('scores:score-event-leaderboard')
+        response = api_client.get(url, {'sport_event': str(sport_event.id)})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data) == 2
+        assert all(row['drawn'] == 1 and row['points'] == 1 for row in response.data)
+
+    def test_event_leaderboard_of_unknown_sport_event_is_empty(self, api_client):
+        """
+        Test that an unknown sport event has an empty leaderboard rather than an error
+        """
+        url = reverse('scores:score-event-leaderboard')
+        response = api_client.get(url, {'sport_event': str(uuid.uuid4())})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == []
+
+    def test_recalculation_removes_teams_that_no_longer_qualify(
+        self, sport_event, make_team, make_game, django_assert_max_num_queries
+    ):
+        """
+        Test that a recalculation writes all entries in bulk and drops stale ones
+        """
+        eagles, falcons, hawks = make_team('Eagles'), make_team('Falcons'), make_team('Hawks')
+        make_game(eagles, falcons, 1, 0)
+        make_game(hawks, falcons, 2, 0)
+        leaderboard = Leaderboard.objects.get(sport_event=sport_event)
+        Score.objects.filter(game__game_teams__team=hawks).update(verification_status='disputed')
+
+        with django_assert_max_num_queries(15):
+            recalculate_leaderboard(leaderboard)
+
+        entries = LeaderboardEntry.objects.filter(leaderboard=leaderboard).order_by('position')
+        assert [(entry.team, entry.position) for entry in entries] == [(eagles, 1), (falcons, 2)]
+
+    def test_recalculation_reads_results_under_the_lock(
+        self, sport_event, make_team, make_game, django_assert_max_num_queries
+    ):
+        """
+        Test that the leaderboard is locked before the results it is rebuilt from are read
+        """
+        make_game(make_team('Eagles'), make_team('Falcons'), 1, 0)
+        leaderboard = Leaderboard.objects.get(sport_event=sport_event)
+
+        with django_assert_max_num_queries(15) as captured:
+            recalculate_leaderboard(leaderboard)
+
+        statements = [query['sql'] for query in captured.captured_queries if 'SAVEPOINT' not in query['sql']]
+        assert 'FROM "leaderboards_leaderboard"' in statements[0]
+
+    def test_event_leaderboard_reads_fresh_leaderboard(
+        self, api_client, settings, sport_event, make_team, make_game, django_assert_num_queries
+    ):
+        """
+        Test that the public event leaderboard is served from stored entries when fresh
+        """
+        eagles, falcons = make_team('Eagles'), make_team('Falcons')
+        make_game(eagles, falcons, 0, 1)
+        url = reverse('scores:score-event-leaderboard')
+
+        with django_assert_num_queries(2):
+            response = api_client.get(url, {'sport_event': str(sport_event.id)})
+        assert response['X-Leaderboard-Freshness'] == 'fresh'
+        assert [row['team_name'] for row in response.data] == ['Falcons', 'Eagles']
+
+        settings.LEADERBOARD_UPDATE_MODE = 'deferred'
+        make_game(eagles, falcons, 5, 0)
+        response = api_client.get(url, {'sport_event': str(sport_event.id)})
+        assert response['X-Leaderboard-Freshness'] == 'stale'
+        assert [row['team_name'] for row in response.data] == ['Eagles', 'Falcons']
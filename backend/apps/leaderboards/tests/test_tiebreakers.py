@@ -0,0 +1,185 @@
+import pytest
+from django.core.exceptions import ValidationError
+
+from events.models.sport_event import validate_tiebreakers
+from leaderboards.models import Leaderboard, LeaderboardEntry, PlayerLeaderboardEntry
+from leaderboards.standings import GameResult, calculate_standings, compute_standings
+from leaderboards.tiebreakers import POINT_SYSTEMS
+
+pytestmark = pytest.mark.leaderboards  # Mark all tests in this file as leaderboards tests
+
+
+def result(team1, team2, score1, score2):
+    """
+    Build a GameResult between two team ids.
+    """
+    outcome = 'team1' if score1 > score2 else 'team2' if score2 > score1 else 'draw'
+    return GameResult(None, None, team1, team2, score1, score2, outcome)
+
+
+def names(rows):
+    return [row['team_name'] for row in rows]
+
+
+class TestTiebreakers:
+    """
+    Tiebreaker pipeline tests
+    """
+
+    team_names = {'a': 'Alpha', 'b': 'Bravo', 'c': 'Charlie', 'd': 'Delta'}
+
+    def test_default_order_is_goal_difference_then_goals(self):
+        """
+        Test that without configuration ties are broken by goal difference and goals scored
+        """
+        results = [result('a', 'c', 1, 0), result('b', 'd', 3, 2), result('c', 'd', 0, 0)]
+
+        rows = compute_standings(results, self.team_names)
+
+        assert names(rows) == ['Bravo', 'Alpha', 'Delta', 'Charlie']
+
+    def test_head_to_head_is_decided_among_tied_teams_only(self):
+        """
+        Test that head-to-head mini-leagues only use games between the tied teams
+        """
+        results = [
+            result('a', 'b', 1, 0),
+            result('b', 'c', 5, 0),
+            result('c', 'a', 1, 0),
+            result('d', 'a', 0, 4),
+            result('d', 'b', 0, 4),
+        ]
+
+        default = compute_standings(results, self.team_names)
+        head_to_head = compute_standings(
+            results, self.team_names,
+            tiebreakers=['head_to_head_points', 'head_to_head_goal_difference', 'goal_difference']
+        )
+
+        # Alpha and Bravo are level on 6 points; Bravo has the better goal difference
+        assert names(default)[:2] == ['Bravo', 'Alpha']
+        # but Alpha won the game between them
+        assert names(head_to_head)[:2] == ['Alpha', 'Bravo']
+
+    def test_away_goals_and_fair_play(self):
+        """
+        Test that away goals and fair play points separate otherwise level teams
+        """
+        results = [result('a', 'b', 1, 2), result('b', 'a', 1, 2)]
+        cards = {'a': {'yellow_cards': 1}, 'b': {'red_cards': 1}}
+
+        by_away_goals = compute_standings(results, self.team_names, cards, tiebreakers=['away_goals'])
+        by_fair_play = compute_standings(results, self.team_names, cards, tiebreakers=['fair_play'])
+
+        assert names(by_away_goals) == ['Alpha', 'Bravo']
+        assert names(by_fair_play) == ['Alpha', 'Bravo']
+
+    @pytest.mark.parametrize('system, score, points', [
+        ('basketball', (80, 75), (2, 1)),
+        ('volleyball', (3, 0), (3, 0)),
+        ('volleyball', (3, 2), (2, 1)),
+        ('cricket', (150, 150), (1, 1)),
+    ])
+    def test_point_systems(self, system, score, points):
+        """
+        Test that each sport's points system awards the right points
+        """
+        rows = compute_standings(
+            [result('a', 'b', *score)], self.team_names, points_system=POINT_SYSTEMS[system]
+        )
+
+        assert {row['team_id']: row['points'] for row in rows} == {'a': points[0], 'b': points[1]}
+
+    def test_unknown_tiebreaker_is_rejected(self):
+        """
+        Test that sport events only accept known tiebreakers
+        """
+        validate_tiebreakers(['head_to_head_points', 'fair_play'])
+        with pytest.raises(ValidationError):
+            validate_tiebreakers(['coin_toss'])
+        with pytest.raises(ValidationError):
+            validate_tiebreakers(['won', 'won'])
+
+
+@pytest.mark.django_db
+class TestConfiguredTiebreakers:
+    """
+    Tiebreakers configured on a sport event
+    """
+
+    def test_head_to_head_needs_no_extra_queries(
+        self, sport_event, make_team, make_game, django_assert_num_queries
+    ):
+        """
+        Test that head-to-head ranking is computed from the preloaded results
+        """
+        alpha, bravo, charlie = make_team('Alpha'), make_team('Bravo'), make_team('Charlie')
+        make_game(alpha, bravo, 1, 0)
+        make_game(bravo, charlie, 5, 0)
+        make_game(charlie, alpha, 0, 0)
+        make_game(charlie, bravo, 0, 0)
+        sport_event.tiebreakers = ['head_to_head_points', 'goal_difference']
+        sport_event.save()
+
+        with django_assert_num_queries(3):
+            rows = calculate_standings(sport_event)
+
+        assert names(rows) == ['Alpha', 'Bravo', 'Charlie']
+
+    def test_changing_rules_reranks_stored_leaderboard(self, sport_event, make_team, make_game):
+        """
+        Test that changing the points system or tiebreakers re-ranks the leaderboard
+        """
+        alpha, bravo = make_team('Alpha'), make_team('Bravo')
+        make_game(alpha, bravo, 0, 2)
+        make_game(bravo, alpha, 2, 3)
+        leaderboard = Leaderboard.objects.get(sport_event=sport_event)
+
+        sport_event.points_system = 'basketball'
+        sport_event.tiebreakers = ['goals_for']
+        sport_event.save()
+
+        entries = LeaderboardEntry.objects.filter(leaderboard=leaderboard).order_by('position')
+        assert [(entry.team, entry.points) for entry in entries] == [(bravo, 3), (alpha, 3)]
+
+    def test_incremental_updates_use_configured_rules(self, sport_event, make_team, make_game):
+        """
+        Test that results applied incrementally follow the sport event's rules
+        """
+        sport_event.sport_type = 'basketball'
+        sport_event.tiebreakers = ['head_to_head_points']
+        sport_event.save()
+        alpha, bravo, charlie = make_team('Alpha'), make_team('Bravo'), make_team('Charlie')
+        make_game(charlie, alpha, 10, 90)
+        make_game(bravo, charlie, 80, 70)
+        make_game(bravo, alpha, 60, 61)
+
+        entries = LeaderboardEntry.objects.filter(
+            leaderboard__sport_event=sport_event
+        ).order_by('position').select_related('team')
+        assert [(entry.team.name, entry.points) for entry in entries] == [
+            ('Alpha', 4), ('Bravo', 3), ('Charlie', 2)
+        ]
+
+    def test_fair_play_counts_recorded_cards(self, sport_event, make_team, make_game, make_player, make_score_event):
+        """
+        Test that cards recorded as scoring events separate teams level on points by fair play
+        """
+        alpha, bravo = make_team('Alpha'), make_team('Bravo')
+        sport_event.tiebreakers = ['fair_play']
+        sport_event.save()
+        score = make_game(alpha, bravo, 0, 0)
+        leaderboard = Leaderboard.objects.get(sport_event=sport_event)
+
+        make_score_event(score, alpha, make_player(alpha, 'Aldo'), event_type='red_card', points=0)
+        make_score_event(score, bravo, event_type='yellow_card', points=0)
+
+        score.refresh_from_db()
+        assert (score.final_score_team1, score.final_score_team2) == (0, 0)
+        entries = LeaderboardEntry.objects.filter(leaderboard=leaderboard).order_by('position')
+        assert [(entry.team.name, entry.yellow_cards, entry.red_cards) for entry in entries] == [
+            ('Bravo', 1, 0), ('Alpha', 0, 1)
+        ]
+        assert names(calculate_standings(sport_event)) == ['Bravo', 'Alpha']
+        assert not PlayerLeaderboardEntry.objects.filter(goals__gt=0).exists()
+        assert not PlayerLeaderboardEntry.objects.filter(points__gt=0).exists()
@@ -0,0 +1,196 @@
+"""
+Points systems and tiebreakers.
+
+Teams are ranked by points, then by the tiebreakers configured on their
+sport event. Each tiebreaker only splits the groups of teams still level
+after the previous ones, and head-to-head criteria build their mini-league
+from the already loaded results of the teams in the group, so resolving
+ties needs no extra queries and grows with the tied teams' games only.
+"""
+from itertools import groupby
+
+
+# Points per result; 'close_*' apply when the margin is at most 'close_margin'
+POINT_SYSTEMS = {
+    'football': {'win': 3, 'draw': 1, 'loss': 0},
+    'basketball': {'win': 2, 'draw': 1, 'loss': 1},
+    'volleyball': {'win': 3, 'draw': 1, 'loss': 0, 'close_margin': 1, 'close_win': 2, 'close_loss': 1},
+    'cricket': {'win': 2, 'draw': 1, 'loss': 0},
+}
+
+# Points system used by sport events that do not configure one
+SPORT_POINT_SYSTEMS = {
+    'basketball': 'basketball',
+    'volleyball': 'volleyball',
+    'cricket': 'cricket',
+}
+DEFAULT_POINT_SYSTEM = 'football'
+
+DEFAULT_TIEBREAKERS = ('goal_difference', 'goals_for')
+
+HEAD_TO_HEAD_TIEBREAKERS = (
+    'head_to_head_points', 'head_to_head_goal_difference',
+    'head_to_head_goals_for', 'head_to_head_away_goals',
+)
+
+# Tiebreakers that need the individual results, not just the table rows
+RESULT_TIEBREAKERS = HEAD_TO_HEAD_TIEBREAKERS + ('away_goals',)
+
+# Fair play card points; fewer is better
+YELLOW_CARD_POINTS = 1
+RED_CARD_POINTS = 3
+
+
+def get_points_system(sport_event):
+    """
+    Return the points system of a sport event.
+    """
+    name = sport_event.points_system or SPORT_POINT_SYSTEMS.get(
+        sport_event.sport_type, DEFAULT_POINT_SYSTEM
+    )
+    return POINT_SYSTEMS[name]
+
+
+def get_tiebreakers(sport_event):
+    """
+    Return the ordered tiebreakers of a sport event.
+    """
+    return tuple(sport_event.tiebreakers or DEFAULT_TIEBREAKERS)
+
+
+def needs_results(tiebreakers):
+    """
+    Return True if any of the tiebreakers is decided from individual results.
+    """
+    return any(tiebreaker in RESULT_TIEBREAKERS for tiebreaker in tiebreakers)
+
+
+def fair_play_value(yellow_cards, red_cards):
+    """
+    Return the fair play value of a team's cards; higher ranks first.
+    Works on numbers and on arrays alike.
+    """
+    return -(yellow_cards * YELLOW_CARD_POINTS + red_cards * RED_CARD_POINTS)
+
+
+def result_points(points_system, own_score, other_score, outcome):
+    """
+    Return the points a team earns from one result.
+    ``outcome`` is 'won', 'drawn' or 'lost' from the team's point of view.
+    """
+    if outcome == 'drawn':
+        return points_system['draw']
+
+    close = abs(own_score - other_score) <= points_system.get('close_margin', -1)
+    if outcome == 'won':
+        return points_system['close_win'] if close else points_system['win']
+    return points_system['close_loss'] if close else points_system['loss']
+
+
+def team_perspectives(result):
+    """
+    Yield ``(team_id, opponent_id, goals_for, goals_against, outcome, is_away)``
+    for both teams of a result.
+    """
+    team1_outcome = {'team1': 'won', 'team2': 'lost'}.get(result.outcome, 'drawn')
+    team2_outcome = {'team1': 'lost', 'team2': 'won'}.get(result.outcome, 'drawn')
+    yield result.team1_id, result.team2_id, result.team1_score, result.team2_score, team1_outcome, False
+    yield result.team2_id, result.team1_id, result.team2_score, result.team1_score, team2_outcome, True
+
+
+class TiebreakContext:
+    """
+    Results of a sport event indexed by team, with the head-to-head
+    mini-leagues built from them memoized per tied group.
+    """
+
+    def __init__(self, results=(), points_system=None):
+        self.points_system = points_system or POINT_SYSTEMS[DEFAULT_POINT_SYSTEM]
+        self.games_by_team = {}
+        for result in results:
+            for perspective in team_perspectives(result):
+                self.games_by_team.setdefault(perspective[0], []).append(perspective)
+        self._away_goals = None
+        self._mini_leagues = {}
+
+    def away_goals(self):
+        """
+        Return the goals each team scored away from home over all results.
+        """
+        if self._away_goals is None:
+            self._away_goals = {
+                team_id: sum(goals_for for _, _, goals_for, _, _, is_away in games if is_away)
+                for team_id, games in self.games_by_team.items()
+            }
+        return self._away_goals
+
+    def mini_league(self, team_ids):
+        """
+        Return the table of the games played among ``team_ids`` only,
+        mapping each team id to its points, goal difference, goals and away goals.
+        """
+        key = frozenset(team_ids)
+        if key not in self._mini_leagues:
+            table = {
+                team_id: {'points': 0, 'goal_difference': 0, 'goals_for': 0, 'away_goals': 0}
+                for team_id in key
+            }
+            for team_id in key:
+                stats = table[team_id]
+                for _, opponent_id, goals_for, goals_against, outcome, is_away in self.games_by_team.get(team_id, ()):
+                    if opponent_id not in key:
+                        continue
+                    stats['points'] += result_points(self.points_system, goals_for, goals_against, outcome)
+                    stats['goal_difference'] += goals_for - goals_against
+                    stats['goals_for'] += goals_for
+                    if is_away:
+                        stats['away_goals'] += goals_for
+            self._mini_leagues[key] = table
+        return self._mini_leagues[key]
+
+
+def tiebreaker_values(tiebreaker, group, context):
+    """
+    Return a mapping of team id to the value of ``tiebreaker`` for a group of
+    level rows. Higher values rank first.
+    """
+    if tiebreaker in HEAD_TO_HEAD_TIEBREAKERS:
+        field = tiebreaker[len('head_to_head_'):]
+        table = context.mini_league([row['team_id'] for row in group])
+        return {team_id: stats[field] for team_id, stats in table.items()}
+    if tiebreaker == 'away_goals':
+        away_goals = context.away_goals()
+        return {row['team_id']: away_goals.get(row['team_id'], 0) for row in group}
+    if tiebreaker == 'fair_play':
+        return {
+            row['team_id']: fair_play_value(row.get('yellow_cards', 0), row.get('red_cards', 0))
+            for row in group
+        }
+    return {row['team_id']: row[tiebreaker] for row in group}
+
+
+def break_ties(group, tiebreakers, context):
+    """
+    Order a group of rows by the first tiebreaker and resolve the groups
+    still level with the remaining ones. Rows level on every tiebreaker are
+    ordered by team name so that the order is stable.
+    """
+    if len(group) < 2 or not tiebreakers:
+        return sorted(group, key=lambda row: row['team_name'] or '')
+
+    values = tiebreaker_values(tiebreakers[0], group, context)
+    group = sorted(group, key=lambda row: -values[row['team_id']])
+
+    ordered = []
+    for _, level in groupby(group, key=lambda row: values[row['team_id']]):
+        ordered.extend(break_ties(list(level), tiebreakers[1:], context))
+    return ordered
+
+
+def order_rows(rows, tiebreakers=DEFAULT_TIEBREAKERS, results=(), points_system=None):
+    """
+    Return standings rows ordered by points and then by ``tiebreakers``.
+    ``results`` are only used by tiebreakers decided from individual results.
+    """
+    context = TiebreakContext(results if needs_results(tiebreakers) else (), points_system)
+    return break_ties(list(rows), ('points',) + tuple(tiebreakers), context)
@@ -1,24 +1,46 @@
 from rest_framework import viewsets, filters, status
 from rest_framework.decorators import action
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from django_filters.rest_framework import DjangoFilterBackend
 from django.utils.translation import gettext_lazy as _
-from django.db.models import Q, F
+from django.conf import settings
+from django.db.models import Q, F, Prefetch, Window, prefetch_related_objects
+from django.db.models.functions import Rank
+from django.http import HttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiResponse
 
-from .models import Leaderboard, LeaderboardEntry
+from .caching import etag_matches, get_rendered, leaderboard_etag
+from .models import Leaderboard, LeaderboardEntry, PlayerLeaderboardEntry
 from .serializers import (
     LeaderboardSerializer,
     LeaderboardSummarySerializer, 
     LeaderboardEntrySerializer,
+    LeaderboardHistorySerializer,
+    LeaderboardSimulationSerializer,
+    PlayerLeaderboardEntrySerializer,
+    PositionHistorySerializer,
     TeamLeaderboardSerializer
 )
 from .permissions import CanManageLeaderboards
+from .simulation import get_cached_simulation, start_simulation
+from .snapshots import position_series, standings_at, take_snapshot
+from .standings import recalculate_leaderboard
 from users.permissions import IsAdminUser
 
 
+# Ranking of each player leaderboard table, most significant first
+PLAYER_ORDERINGS = {
+    'goals': ('goals', 'assists'),
+    'assists': ('assists', 'goals'),
+    'points': ('points', 'goals'),
+}
+
+
 class LeaderboardViewSet(viewsets.ModelViewSet):
     """
     API endpoint for leaderboards.
@@ -73,6 +95,7 @@ class LeaderboardViewSet(viewsets.ModelViewSet):
         description="Get detailed information about a specific leaderboard including all team entries",
         responses={
             200: LeaderboardSerializer,
+            304: OpenApiResponse(description="Not modified - the client's version is current"),
             404: OpenApiResponse(description="Leaderboard not found")
         }
     )
@@ -81,9 +104,29 @@ class LeaderboardViewSet(viewsets.ModelViewSet):
         Retrieve a specific leaderboard.
         
         Returns detailed leaderboard information including all team entries
-        sorted by position.
+        sorted by position. The response carries an ETag for the leaderboard
+        version; a matching If-None-Match returns 304 without reading entries.
         """
-        return super().retrieve(request, *args, **kwargs)
+        leaderboard = self.get_object()
+        etag = leaderboard_etag(leaderboard)
+        if etag_matches(request, etag):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+
+        prefetch = Prefetch('entries', queryset=LeaderboardEntry.objects.select_related('team'))
+        renderer = request.accepted_renderer
+        if not isinstance(renderer, JSONRenderer):
+            # The browsable API renders per request and is not cached
+            prefetch_related_objects([leaderboard], prefetch)
+            return Response(self.get_serializer(leaderboard).data, headers={'ETag': etag})
+
+        def render():
+            prefetch_related_objects([leaderboard], prefetch)
+            return renderer.render(self.get_serializer(leaderboard).data)
+
+        content = get_rendered(leaderboard, renderer.media_type, render)
+        response = HttpResponse(content, content_type=renderer.media_type)
+        response['ETag'] = etag
+        return response
     
     @extend_schema(
         summary="Create leaderboard",
@@ -172,146 +215,8 @@ class LeaderboardViewSet(viewsets.ModelViewSet):
         """
         leaderboard = self.get_object()
         
-        # Get the sport event
-        sport_event = leaderboard.sport_event
-        
-        # Get all completed and verified games for this sport event
-        from scores.models import Score
-        from games.models import Game
-        
-        games = Game.objects.filter(
-            sport_event=sport_event,
-            status='completed',
-            score__verification_status='verified'
-        ).select_related('score')
-        
-        # Get all teams that participated in these games
-        team_ids = set()
-        for game in games:
-            for game_team in game.game_teams.all():
-                team_ids.add(game_team.team_id)
-        
-        # Calculate stats for each team
-        entries = []
-        for team_id in team_ids:
-            # Get team object
-            from teams.models import Team
-            team = Team.objects.get(id=team_id)
-            
-            # Calculate team statistics
-            stats = {
-                'team': team,
-                'played': 0,
-                'won': 0,
-                'drawn': 0,
-                'lost': 0,
-                'goals_for': 0,
-                'goals_against': 0,
-                'goal_difference': 0,
-                'points': 0,
-                'clean_sheets': 0,
-                'yellow_cards': 0,
-                'red_cards': 0
-            }
-            
-            # Process each game
-            for game in games:
-                # Check if this team participated in this game
-                team_designations = game.game_teams.filter(team_id=team_id)
-                if not team_designations.exists():
-                    continue
-                
-                # Increment games played
-                stats['played'] += 1
-                
-                # Get the score
-                score = game.score
-                
-                # Get team designation
-                team_designation = team_designations.first().designation
-                
-                # Set team position (1 or 2) based on designation
-                team_position = 1 if team_designation in ['team_a', 'home'] else 2
-                other_position = 2 if team_position == 1 else 1
-                
-                # Get goals for/against
-                if team_position == 1:
-                    goals_for = score.final_score_team1 or 0
-                    goals_against = score.final_score_team2 or 0
-                else:
-                    goals_for = score.final_score_team2 or 0
-                    goals_against = score.final_score_team1 or 0
-                
-                stats['goals_for'] += goals_for
-                stats['goals_against'] += goals_against
-                
-                # Check for clean sheet
-                if goals_against == 0:
-                    stats['clean_sheets'] += 1
-                
-                # Determine win/loss/draw and points
-                if score.is_draw:
-                    stats['drawn'] += 1
-                    stats['points'] += 1  # 1 point for a draw
-                elif score.winner and score.winner.id == team_id:
-                    stats['won'] += 1
-                    stats['points'] += 3  # 3 points for a win
-                else:
-                    stats['lost'] += 1  # 0 points for a loss
-                
-                # Get yellow/red cards from score details
-                # This is just a placeholder; implementation depends on how cards are tracked
-                if hasattr(score, 'score_details'):
-                    yellow_cards = score.score_details.filter(
-                        team_id=team_id, 
-                        event_type='yellow_card'
-                    ).count()
-                    
-                    red_cards = score.score_details.filter(
-                        team_id=team_id, 
-                        event_type='red_card'
-                    ).count()
-                    
-                    stats['yellow_cards'] += yellow_cards
-                    stats['red_cards'] += red_cards
-            
-            # Calculate goal difference
-            stats['goal_difference'] = stats['goals_for'] - stats['goals_against']
-            
-            # Update or create leaderboard entry
-            entry, created = LeaderboardEntry.objects.update_or_create(
-                leaderboard=leaderboard,
-                team=team,
-                defaults={
-                    'played': stats['played'],
-                    'won': stats['won'],
-                    'drawn': stats['drawn'],
-                    'lost': stats['lost'],
-                    'goals_for': stats['goals_for'],
-                    'goals_against': stats['goals_against'],
-                    'goal_difference': stats['goal_difference'],
-                    'points': stats['points'],
-                    'clean_sheets': stats['clean_sheets'],
-                    'yellow_cards': stats['yellow_cards'],
-                    'red_cards': stats['red_cards'],
-                    'position': 0  # Temporary position, will be updated below
-                }
-            )
-            entries.append(entry)
-        
-        # Sort entries by points, goal difference, goals for
-        sorted_entries = sorted(
-            entries,
-            key=lambda x: (-x.points, -x.goal_difference, -x.goals_for)
-        )
-        
-        # Update positions
-        for i, entry in enumerate(sorted_entries):
-            entry.position = i + 1
-            entry.save(update_fields=['position'])
-        
-        # Update the leaderboard's last_updated timestamp
-        leaderboard.save()
+        # Recalculate all entries from the verified results of the sport event
+        recalculate_leaderboard(leaderboard)
         
         # Return the updated leaderboard
         serializer = self.get_serializer(leaderboard)
@@ -335,12 +240,190 @@ class LeaderboardViewSet(viewsets.ModelViewSet):
         Only administrators can finalize leaderboards.
         """
         leaderboard = self.get_object()
-        leaderboard.is_final = True
-        leaderboard.save(update_fields=['is_final'])
+        leaderboard.touch(is_final=True)
+        take_snapshot(leaderboard, 'finalized')
         
         serializer = self.get_serializer(leaderboard)
         return Response(serializer.data)
     
+    @action(detail=True, methods=['get'], url_path='history')
+    @extend_schema(
+        summary="Leaderboard history",
+        description="Get the standings as they were at a point in time, or a team's position over time",
+        parameters=[
+            OpenApiParameter(name="at", description="Timestamp to return the standings at (ISO 8601, defaults to now)", required=False, type=str),
+            OpenApiParameter(name="team", description="Team ID to return the position series for", required=False, type=str)
+        ],
+        responses={
+            200: LeaderboardHistorySerializer,
+            400: OpenApiResponse(description="Bad request - invalid timestamp"),
+            404: OpenApiResponse(description="Not found - no standings at that time")
+        }
+    )
+    def history(self, request, pk=None):
+        """
+        Get historical standings of a leaderboard.
+        
+        Served from the snapshots stored whenever the standings changed,
+        without recalculating anything.
+        """
+        leaderboard = self.get_object()
+
+        team_id = request.query_params.get('team')
+        if team_id:
+            series = position_series(leaderboard, team_id)
+            return Response(PositionHistorySerializer(series, many=True).data)
+
+        at = timezone.now()
+        if 'at' in request.query_params:
+            try:
+                at = parse_datetime(request.query_params['at'])
+            except ValueError:
+                at = None
+            if at is None:
+                return Response(
+                    {"at": "Enter a valid ISO 8601 timestamp."},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            if timezone.is_naive(at):
+                at = timezone.make_aware(at)
+
+        found = standings_at(leaderboard, at)
+        if found is None:
+            return Response(
+                {"detail": "No standings were recorded at that time."},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        snapshot, rows = found
+        serializer = LeaderboardHistorySerializer({
+            'version': snapshot.version,
+            'taken_at': snapshot.taken_at,
+            'reason': snapshot.reason,
+            'entries': rows,
+        })
+        return Response(serializer.data)
+    
+    @action(detail=True, methods=['get'], url_path='simulation')
+    @extend_schema(
+        summary="Simulate remaining fixtures",
+        description="Get each team's chance of finishing in every position, simulated over the remaining games",
+        parameters=[
+            OpenApiParameter(name="top", description="Positions counted as qualifying (default 2)", required=False, type=int),
+            OpenApiParameter(name="seasons", description="Number of simulated seasons", required=False, type=int)
+        ],
+        responses={
+            200: LeaderboardSimulationSerializer,
+            202: OpenApiResponse(description="Accepted - the simulation is still running, retry later"),
+            400: OpenApiResponse(description="Bad request - invalid parameters")
+        }
+    )
+    def simulation(self, request, pk=None):
+        """
+        Simulate the rest of the season.
+        
+        Results are cached per leaderboard version. A simulation that does
+        not finish within the latency budget keeps running in the background
+        and a 202 response asks the client to retry.
+        """
+        leaderboard = self.get_object()
+
+        try:
+            top = int(request.query_params.get('top', 2))
+            seasons = int(request.query_params.get('seasons', settings.LEADERBOARD_SIMULATION_SEASONS))
+        except ValueError:
+            return Response(
+                {"detail": "top and seasons must be integers."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if top < 1 or not 1 <= seasons <= settings.LEADERBOARD_SIMULATION_MAX_SEASONS:
+            return Response(
+                {"detail": f"top must be positive and seasons between 1 and {settings.LEADERBOARD_SIMULATION_MAX_SEASONS}."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        summary = get_cached_simulation(leaderboard, seasons)
+        if summary is None:
+            future = start_simulation(leaderboard, seasons)
+            try:
+                summary = future.result(timeout=settings.LEADERBOARD_SIMULATION_BUDGET_SECONDS)
+            except TimeoutError:
+                return Response(
+                    {"status": "pending", "version": leaderboard.version, "seasons": seasons},
+                    status=status.HTTP_202_ACCEPTED,
+                    headers={'Retry-After': str(max(1, round(settings.LEADERBOARD_SIMULATION_BUDGET_SECONDS)))}
+                )
+
+        serializer = LeaderboardSimulationSerializer({
+            **summary,
+            'version': leaderboard.version,
+            'top': top,
+            'teams': [
+                {**team, 'top_probability': round(sum(team['positions'][:top]), 4)}
+                for team in summary['teams']
+            ],
+        })
+        return Response(serializer.data)
+    
+    @action(detail=True, methods=['get'], url_path='players')
+    @extend_schema(
+        summary="Player leaderboard",
+        description="Get the top scorers, assists or points table of the leaderboard's sport event",
+        parameters=[
+            OpenApiParameter(name="order", description="Rank by goals, assists or points (default goals)", required=False, type=str),
+            OpenApiParameter(name="start", description="First rank of the window (default 1)", required=False, type=int),
+            OpenApiParameter(name="size", description="Number of ranks in the window (default 20, max 100)", required=False, type=int)
+        ],
+        responses={
+            200: PlayerLeaderboardEntrySerializer(many=True),
+            400: OpenApiResponse(description="Bad request - invalid parameters")
+        }
+    )
+    def players(self, request, pk=None):
+        """
+        Get the player leaderboard of a sport event.
+        
+        Pages are windows of ranks rather than offsets: players tied on a
+        rank are always returned together, and ``next_start`` is the first
+        rank of the following window.
+        """
+        leaderboard = self.get_object()
+
+        order = request.query_params.get('order', 'goals')
+        if order not in PLAYER_ORDERINGS:
+            return Response(
+                {"order": f"Choose from: {', '.join(PLAYER_ORDERINGS)}."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            start = max(int(request.query_params.get('start', 1)), 1)
+            size = min(max(int(request.query_params.get('size', 20)), 1), 100)
+        except ValueError:
+            return Response(
+                {"detail": "start and size must be integers."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        ranking = [F(field).desc() for field in PLAYER_ORDERINGS[order]]
+        entries = PlayerLeaderboardEntry.objects.filter(
+            sport_event_id=leaderboard.sport_event_id
+        ).annotate(
+            rank=Window(Rank(), order_by=ranking)
+        )
+        window = list(entries.filter(
+            rank__gte=start,
+            rank__lt=start + size
+        ).select_related('player__team').order_by('rank', 'player__last_name', 'player__first_name'))
+        has_more = entries.filter(rank__gte=start + size).exists()
+
+        return Response({
+            'order': order,
+            'start': start,
+            'size': size,
+            'next_start': start + size if has_more else None,
+            'results': PlayerLeaderboardEntrySerializer(window, many=True).data,
+        })
+    
     @action(detail=False, methods=['get'], url_path='team/(?P<team_id>[^/.]+)')
     @extend_schema(
         summary="Team leaderboards",
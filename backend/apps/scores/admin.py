@@ -1,3 +1,4 @@
+from django import forms
 from django.contrib import admin
 from django.utils.translation import gettext_lazy as _
 from django.db.models import Count
@@ -7,17 +8,45 @@ from django.utils.html import format_html
 from .models import Score, ScoreDetail
 
 
+class VersionCheckedForm(forms.ModelForm):
+    """
+    Admin form carrying the version a record had when the form was opened,
+    so changes made by someone else in the meantime are not overwritten.
+    """
+    class Meta:
+        widgets = {'version': forms.HiddenInput}
+    
+    def clean(self):
+        cleaned_data = super().clean()
+        version = cleaned_data.get('version')
+        if self.instance.pk and version is not None and version != self.instance.version:
+            raise forms.ValidationError(
+                _('This record was changed by someone else after you opened it. Reload the page and apply your changes again.')
+            )
+        return cleaned_data
+
+
+def expect_submitted_version(obj, change=True):
+    """
+    Make saving an edited record a compare-and-swap on the version it was
+    submitted with.
+    """
+    if change and not obj._state.adding:
+        obj.expect_version(obj.version)
+
+
 class ScoreDetailInline(admin.TabularInline):
     """
     Inline admin for ScoreDetails to show scoring events within a Score.
     """
     model = ScoreDetail
+    form = VersionCheckedForm
     extra = 0
     readonly_fields = ['created_at', 'created_by']
     autocomplete_fields = ['player', 'assisted_by']
     fieldsets = (
         (None, {
-            'fields': ('team', 'player', 'assisted_by', 'points', 'event_type')
+            'fields': ('team', 'player', 'assisted_by', 'points', 'event_type', 'version')
         }),
         (_('Time Information'), {
             'fields': ('time_occurred', 'minute', 'period')
@@ -53,10 +82,11 @@ class ScoreAdmin(admin.ModelAdmin):
     date_hierarchy = 'created_at'
     inlines = [ScoreDetailInline]
     actions = ['mark_as_verified', 'mark_as_pending_verification']
+    form = VersionCheckedForm
     
     fieldsets = (
         (None, {
-            'fields': ('game', 'status', 'scorekeeper')
+            'fields': ('game', 'status', 'scorekeeper', 'version')
         }),
         (_('Score Information'), {
             'fields': (
@@ -128,16 +158,12 @@ class ScoreAdmin(admin.ModelAdmin):
     
     def mark_as_verified(self, request, queryset):
         """Mark selected scores as verified"""
-        for score in queryset:
-            if score.status == 'completed':
-                score.verification_status = 'verified'
-                score.verified_by = request.user
-                score.save(update_fields=['verification_status', 'verified_by'])
+        Score.verify_batch(list(queryset.values_list('pk', flat=True)), request.user)
     mark_as_verified.short_description = _("Mark selected scores as verified")
     
     def mark_as_pending_verification(self, request, queryset):
         """Mark selected scores as pending verification"""
-        queryset.update(verification_status='pending_verification')
+        Score.unverify_batch(list(queryset.values_list('pk', flat=True)))
     mark_as_pending_verification.short_description = _("Mark selected scores as pending verification")
     
     def get_queryset(self, request):
@@ -159,7 +185,8 @@ class ScoreAdmin(admin.ModelAdmin):
             else:
                 obj.winner = None
                 obj.is_draw = True
-                
+        
+        expect_submitted_version(obj, change)
         super().save_model(request, obj, form, change)
     
     def save_formset(self, request, form, formset, change):
@@ -168,6 +195,7 @@ class ScoreAdmin(admin.ModelAdmin):
         for instance in instances:
             if isinstance(instance, ScoreDetail) and not instance.pk:
                 instance.created_by = request.user
+            expect_submitted_version(instance)
             instance.save()
         formset.save_m2m()
 
@@ -191,10 +219,11 @@ class ScoreDetailAdmin(admin.ModelAdmin):
     readonly_fields = ['created_at', 'created_by']
     autocomplete_fields = ['score', 'team', 'player', 'assisted_by']
     date_hierarchy = 'created_at'
+    form = VersionCheckedForm
     
     fieldsets = (
         (None, {
-            'fields': ('score', 'team', 'player', 'assisted_by')
+            'fields': ('score', 'team', 'player', 'assisted_by', 'version')
         }),
         (_('Scoring Information'), {
             'fields': ('points', 'event_type', 'time_occurred', 'minute', 'period')
@@ -225,4 +254,5 @@ class ScoreDetailAdmin(admin.ModelAdmin):
         """Set created_by for new score details"""
         if not obj.pk:  # New record
             obj.created_by = request.user
+        expect_submitted_version(obj, change)
         super().save_model(request, obj, form, change)
\ No newline at end of file
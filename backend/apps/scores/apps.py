@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class ScoresConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "scores"
+    
+    def ready(self):
+        """
+        Import signal handlers when the app is ready.
+        """
+        import scores.signals
@@ -0,0 +1,113 @@
+"""
+Tag-invalidated caching of public score responses.
+
+Cached responses are keyed on the request URL and on the current token of
+every tag they depend on: ``all``, ``sport_event:<id>``, ``game:<id>`` and
+``score:<id>``. Writes replace the tokens of the tags they touch once their
+transaction commits, so stale entries are never read again and simply
+expire. The cache must be shared by all processes (see CACHES).
+"""
+import hashlib
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+# Tag every cached score response depends on when not narrowed further
+ALL_SCORES = 'all'
+
+
+def tag_key(tag):
+    """
+    Return the cache key holding the current token of a tag.
+    """
+    return f'scores:tag:{tag}'
+
+
+def new_token():
+    return uuid.uuid4().hex
+
+
+def tag_tokens(tags):
+    """
+    Return the current token of each tag, creating missing ones.
+    """
+    keys = {tag_key(tag): tag for tag in tags}
+    tokens = cache.get_many(list(keys))
+    missing = {key: new_token() for key in keys if key not in tokens}
+    if missing:
+        # add() keeps a token set concurrently by another request
+        for key, token in missing.items():
+            cache.add(key, token, None)
+        tokens.update(cache.get_many(list(missing)))
+    return [tokens.get(key, '') for key in keys]
+
+
+def invalidate(*tags):
+    """
+    Make every cached response depending on one of ``tags`` stale once the
+    current transaction commits. Invalidating earlier would let a request
+    still reading the old state cache it under the new tokens.
+    """
+    tokens = {tag_key(tag): new_token() for tag in tags}
+    transaction.on_commit(lambda: cache.set_many(tokens, None))
+
+
+def score_tags(score_id=None, game_id=None, sport_event_id=None):
+    """
+    Return the tags touched by a write to a score, its game or its sport event.
+    """
+    tags = [ALL_SCORES]
+    if sport_event_id:
+        tags.append(f'sport_event:{sport_event_id}')
+    if game_id:
+        tags.append(f'game:{game_id}')
+    if score_id:
+        tags.append(f'score:{score_id}')
+    return tags
+
+
+def read_tags(sport_event_id=None):
+    """
+    Return the tags a list of scores depends on, narrowed to a sport event
+    when the list is filtered by one.
+    """
+    return [f'sport_event:{sport_event_id}'] if sport_event_id else [ALL_SCORES]
+
+
+def response_key(request, tags):
+    """
+    Return the cache key of a response for the request's URL and the
+    current tokens of ``tags``.
+    """
+    tokens = tag_tokens(tags)
+    digest = hashlib.sha256('|'.join([request.build_absolute_uri(), *tokens]).encode()).hexdigest()
+    return f'scores:response:{digest}'
+
+
+def get_cached_data(request, tags, build):
+    """
+    Return the cached response data for the request, calling ``build`` to
+    produce and cache it on a miss.
+    """
+    key = response_key(request, tags)
+    data = cache.get(key)
+    if data is None:
+        data = build()
+        cache.set(key, data, settings.SCORE_CACHE_TIMEOUT)
+    return data
+
+
+def get_versioned_data(name, score, build):
+    """
+    Return data derived from a score, calling ``build`` to produce and cache
+    it on a miss. The entry is keyed on the score version, so any change to
+    the score or its scoring events makes it stale.
+    """
+    key = f'scores:{name}:{score.pk}:{score.version}'
+    data = cache.get(key)
+    if data is None:
+        data = build()
+        cache.set(key, data, settings.SCORE_CACHE_TIMEOUT)
+    return data
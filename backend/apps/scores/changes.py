@@ -0,0 +1,282 @@
+"""
+Recording of score changes for live and syncing clients.
+
+Every write to a score or one of its scoring events appends a compact
+ScoreChange row. Live score streams read this log instead of serializing
+the scores again for every connected client, and syncing clients use the
+id of the last change they saw as a cursor.
+
+Changes are inserted when the transaction that made them commits, never
+inside it, so the log only holds committed writes and ids follow commit
+order. Concurrent inserts can still commit slightly out of id order,
+readers therefore only see changes older than SCORE_CHANGE_SETTLE_SECONDS,
+which only has to cover a single insert rather than a whole transaction.
+
+Changes keep the ids of their score, game and sport event rather than
+foreign keys, so they outlive deleted rows: deleting a score appends a
+tombstone that tells syncing clients to drop it.
+"""
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Score, ScoreChange, ScoreDetail
+
+# Score fields sent to syncing clients
+SYNC_SCORE_FIELDS = (
+    'id', 'game', 'status', 'time_elapsed', 'final_score_team1', 'final_score_team2',
+    'winner', 'is_draw', 'verification_status', 'version'
+)
+
+# Scoring event fields sent to syncing clients
+SYNC_DETAIL_FIELDS = (
+    'id', 'score', 'team', 'player', 'assisted_by', 'event_type', 'points',
+    'minute', 'period', 'time_occurred'
+)
+
+
+def _jsonable(data):
+    """
+    Return data with UUIDs, times and dates converted for a JSONField.
+    """
+    return json.loads(json.dumps(data, cls=DjangoJSONEncoder))
+
+
+def score_payload(score):
+    """
+    Return the compact representation of a score sent to live clients.
+    """
+    return _jsonable({
+        'id': score.pk,
+        'game': score.game_id,
+        'status': score.status,
+        'time_elapsed': score.time_elapsed,
+        'final_score_team1': score.final_score_team1,
+        'final_score_team2': score.final_score_team2,
+        'winner': score.winner_id,
+        'is_draw': score.is_draw,
+        'version': score.version,
+    })
+
+
+def detail_payload(detail):
+    """
+    Return the compact representation of a scoring event, together with the
+    totals of its score after the event was applied.
+    """
+    score = detail.score
+    return _jsonable({
+        'id': detail.pk,
+        'score': detail.score_id,
+        'team': detail.team_id,
+        'player': detail.player_id,
+        'assisted_by': detail.assisted_by_id,
+        'event_type': detail.event_type,
+        'points': detail.points,
+        'minute': detail.minute,
+        'period': detail.period,
+        'time_occurred': detail.time_occurred,
+        'final_score_team1': score.final_score_team1,
+        'final_score_team2': score.final_score_team2,
+        'version': score.version,
+    })
+
+
+def append(changes):
+    """
+    Insert changes once the current transaction commits, or at once outside
+    a transaction. Changes of a rolled back transaction are never logged.
+    """
+    changes = list(changes)
+    if changes:
+        transaction.on_commit(lambda: ScoreChange.objects.bulk_create(changes))
+
+
+def score_change(score):
+    """
+    Return an unsaved change for a saved score.
+    """
+    return ScoreChange(
+        score_id=score.pk,
+        game_id=score.game_id,
+        sport_event_id=score.game.sport_event_id,
+        kind='score',
+        payload=score_payload(score)
+    )
+
+
+def record_score_change(score):
+    """
+    Log a change for a saved score.
+    """
+    append([score_change(score)])
+
+
+def record_score_batch(scores):
+    """
+    Log the changes for several scores updated together in one query.
+    """
+    append(score_change(score) for score in scores)
+
+
+def record_score_deletion(score, score_id):
+    """
+    Log a tombstone for a deleted score. ``score_id`` is the id the score
+    had, since deleting an instance clears its primary key.
+    """
+    append([ScoreChange(
+        score_id=score_id,
+        game_id=score.game_id,
+        sport_event_id=score.game.sport_event_id,
+        kind='score_deleted',
+        payload=_jsonable({'id': score_id, 'game': score.game_id})
+    )])
+
+
+def detail_change(detail):
+    """
+    Return an unsaved change for a saved scoring event.
+    """
+    game = detail.score.game
+    return ScoreChange(
+        score_id=detail.score_id,
+        detail_id=detail.pk,
+        game_id=game.pk,
+        sport_event_id=game.sport_event_id,
+        kind='detail',
+        payload=detail_payload(detail)
+    )
+
+
+def record_detail_change(detail):
+    """
+    Log a change for a saved scoring event.
+    """
+    append([detail_change(detail)])
+
+
+def record_detail_deletion(detail, detail_id):
+    """
+    Log a change for a deleted scoring event. ``detail_id`` is the id the
+    event had, since deleting an instance clears its primary key.
+    """
+    score = detail.score
+    append([ScoreChange(
+        score_id=detail.score_id,
+        detail_id=detail_id,
+        game_id=score.game_id,
+        sport_event_id=score.game.sport_event_id,
+        kind='detail_deleted',
+        payload=_jsonable({
+            'id': detail_id,
+            'score': detail.score_id,
+            'final_score_team1': score.final_score_team1,
+            'final_score_team2': score.final_score_team2,
+            'version': score.version,
+        })
+    )])
+
+
+def record_detail_batch(details):
+    """
+    Log the changes for a batch of inserted scoring events in one query.
+    """
+    append(detail_change(detail) for detail in details)
+
+
+def settled_changes():
+    """
+    Return the logged changes old enough that every change with a lower id
+    has been inserted.
+    """
+    horizon = timezone.now() - timedelta(seconds=settings.SCORE_CHANGE_SETTLE_SECONDS)
+    return ScoreChange.objects.filter(created_at__lte=horizon)
+
+
+def latest_settled_id():
+    """
+    Return the id of the most recent settled change, or 0 if there is none.
+    """
+    return settled_changes().order_by('-id').values_list('id', flat=True).first() or 0
+
+
+def changes_after(last_id, sport_event_id=None, limit=None, fields=('id', 'kind', 'payload')):
+    """
+    Return settled changes after ``last_id`` in order, as dicts that include
+    the sport event of each change.
+    """
+    changes = settled_changes().filter(id__gt=last_id)
+    if sport_event_id:
+        changes = changes.filter(sport_event_id=sport_event_id)
+    changes = changes.order_by('id').values(*fields, 'sport_event_id')
+    if limit:
+        changes = changes[:limit]
+    return list(changes)
+
+
+def snapshot(sport_event_id=None):
+    """
+    Return the state of every score and scoring event, with the cursor of
+    the latest change to continue from.
+    """
+    # Read the cursor first: changes made while reading are sent again later
+    cursor = latest_settled_id()
+    scores = Score.objects.all()
+    details = ScoreDetail.objects.all()
+    if sport_event_id:
+        scores = scores.filter(game__sport_event_id=sport_event_id)
+        details = details.filter(score__game__sport_event_id=sport_event_id)
+    return {
+        'cursor': cursor,
+        'more': False,
+        'scores': list(scores.order_by().values(*SYNC_SCORE_FIELDS)),
+        'details': list(details.order_by().values(*SYNC_DETAIL_FIELDS)),
+        'deleted_scores': [],
+        'deleted_details': [],
+    }
+
+
+def changes_since(cursor, sport_event_id=None, limit=1000):
+    """
+    Return the current state of the scores and scoring events changed after
+    ``cursor``, reading at most ``limit`` log entries. Without a cursor a
+    full snapshot is returned.
+
+    Each score or event appears once however often it changed. The returned
+    ``cursor`` is the id of the last change read; ``more`` tells whether
+    further changes remain.
+    """
+    if not cursor:
+        return snapshot(sport_event_id)
+
+    changes = changes_after(cursor, sport_event_id, limit, fields=('id', 'score_id', 'detail_id'))
+    score_ids = {change['score_id'] for change in changes}
+    detail_ids = {change['detail_id'] for change in changes if change['detail_id']}
+
+    scores = list(Score.objects.filter(id__in=score_ids).values(*SYNC_SCORE_FIELDS)) if score_ids else []
+    details = list(ScoreDetail.objects.filter(id__in=detail_ids).values(*SYNC_DETAIL_FIELDS)) if detail_ids else []
+    found = {detail['id'] for detail in details} | {score['id'] for score in scores}
+
+    return {
+        'cursor': changes[-1]['id'] if changes else cursor,
+        'more': len(changes) == limit,
+        'scores': scores,
+        'details': details,
+        'deleted_scores': sorted(str(pk) for pk in score_ids - found),
+        'deleted_details': sorted(str(pk) for pk in detail_ids - found),
+    }
+
+
+def cursor_expired(cursor):
+    """
+    Return True if changes after ``cursor`` were already pruned from the log,
+    so a client holding it has to download the scores again.
+    """
+    if not cursor:
+        return False
+    oldest = ScoreChange.objects.order_by('id').values_list('id', flat=True).first()
+    return oldest is not None and oldest > cursor + 1
@@ -0,0 +1,103 @@
+"""
+Optimistic concurrency control for score and scoring event updates.
+
+Responses carry the record's version as an ``ETag``. Clients send it back
+in ``If-Match`` and the update is then only applied if nobody changed the
+record in between; otherwise 412 is returned with the current state. The
+save itself is a compare-and-swap on the version column, so no row lock is
+held while the request is handled.
+"""
+from django.db import transaction
+from drf_spectacular.utils import OpenApiParameter
+from rest_framework import status
+from rest_framework.response import Response
+
+from .models import VersionConflict
+
+# Documents the If-Match header accepted by version-checked updates
+IF_MATCH_PARAMETER = OpenApiParameter(
+    name='If-Match',
+    location=OpenApiParameter.HEADER,
+    description='ETag of the version the change is based on; the update fails with 412 if the record changed since',
+    required=False,
+    type=str
+)
+
+
+def etag(version):
+    """
+    Return the ETag of a record at ``version``.
+    """
+    return f'"{version}"'
+
+
+def if_match_versions(request):
+    """
+    Return the versions listed in the request's If-Match header, or None
+    when the header is absent or ``*``. Values that are not versions are
+    ignored, so an If-Match with none matches no version.
+    """
+    header = request.headers.get('If-Match', '').strip()
+    if not header or header == '*':
+        return None
+    versions = set()
+    for value in header.split(','):
+        value = value.strip()
+        if value.startswith('W/'):
+            value = value[2:]
+        try:
+            versions.add(int(value.strip('"')))
+        except ValueError:
+            continue
+    return versions
+
+
+class VersionCheckedUpdateMixin:
+    """
+    Viewset mixin making updates compare-and-swap on the record version.
+
+    The version checked is the one in If-Match, or without it the version
+    read by this request, so a write landing between reading and saving the
+    record is never silently overwritten.
+    """
+    # Serializer of the current state returned with a conflict
+    conflict_serializer_class = None
+
+    def with_etag(self, response, version):
+        response['ETag'] = etag(version)
+        return response
+
+    def version_conflict(self, instance):
+        """
+        Return a 412 response carrying the current state of the record.
+        """
+        current = self.get_queryset().get(pk=instance.pk)
+        serializer = self.conflict_serializer_class(current, context=self.get_serializer_context())
+        response = Response(
+            {
+                'detail': 'The record was changed by another request. Apply your changes to the current version.',
+                'current': serializer.data
+            },
+            status=status.HTTP_412_PRECONDITION_FAILED
+        )
+        return self.with_etag(response, current.version)
+
+    def update(self, request, *args, **kwargs):
+        partial = kwargs.pop('partial', False)
+        instance = self.get_object()
+        versions = if_match_versions(request)
+        if versions is not None and instance.version not in versions:
+            return self.version_conflict(instance)
+
+        serializer = self.get_serializer(instance, data=request.data, partial=partial)
+        serializer.is_valid(raise_exception=True)
+        instance.expect_version(instance.version)
+        try:
+            with transaction.atomic():
+                self.perform_update(serializer)
+        except VersionConflict:
+            return self.version_conflict(instance)
+
+        if getattr(instance, '_prefetched_objects_cache', None):
+            instance._prefetched_objects_cache = {}
+        return self.with_etag(Response(serializer.data), instance.version)
@@ -0,0 +1,177 @@
+"""
+Server-Sent Events stream of live score changes.
+
+A single ChangeFeed per process polls the ScoreChange log and hands new
+changes to every connected stream, so the database is queried once per poll
+interval however many scoreboards are listening. Streams resume from the
+``Last-Event-ID`` header by replaying the log after that id. Like every
+reader of the log, the feed only reads settled changes, so it never moves
+past a change whose insert has not finished yet.
+"""
+import json
+import queue
+import threading
+import time
+
+from django.conf import settings
+from django.db import close_old_connections
+from rest_framework.renderers import BaseRenderer
+
+from .changes import changes_after, latest_settled_id
+
+
+class ChangeFeed:
+    """
+    Fan-out of new score changes to subscribed streams.
+
+    The polling thread only runs while there are subscribers. ``poll`` can
+    also be called directly to deliver pending changes synchronously.
+    """
+
+    def __init__(self, poll_interval=None, autostart=True):
+        self.poll_interval = poll_interval
+        self.autostart = autostart
+        self.last_id = None
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def subscribe(self):
+        """
+        Register a new subscriber and return its queue of change batches.
+        The queue's ``start_id`` is the last change read before subscribing;
+        every later change is delivered through the queue.
+        """
+        subscriber = queue.Queue()
+        with self._lock:
+            if self.last_id is None:
+                self.last_id = latest_settled_id()
+            subscriber.start_id = self.last_id
+            self._subscribers.add(subscriber)
+            if self.autostart and self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='score-change-feed', daemon=True)
+                self._thread.start()
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def poll(self):
+        """
+        Read the changes logged since the last poll, at most
+        LIVE_SCORE_POLL_LIMIT of them, and hand them to every subscriber.
+        Returns the number of changes read.
+        """
+        if self.last_id is None:
+            self.last_id = latest_settled_id()
+        changes = changes_after(self.last_id, limit=settings.LIVE_SCORE_POLL_LIMIT)
+        if changes:
+            with self._lock:
+                self.last_id = changes[-1]['id']
+                subscribers = list(self._subscribers)
+            for subscriber in subscribers:
+                subscriber.put(changes)
+        return len(changes)
+
+    def _run(self):
+        try:
+            while True:
+                with self._lock:
+                    if not self._subscribers:
+                        # Cleared under the lock so a new subscriber starts a
+                        # fresh thread instead of relying on this exiting one
+                        self.last_id = None
+                        self._thread = None
+                        return
+                # A full batch means more are waiting; read them without pausing
+                if self.poll() < settings.LIVE_SCORE_POLL_LIMIT:
+                    time.sleep(self.poll_interval or settings.LIVE_SCORE_POLL_SECONDS)
+        finally:
+            close_old_connections()
+
+
+_feed = None
+_feed_lock = threading.Lock()
+
+
+def get_feed():
+    """
+    Return the change feed shared by the streams of this process.
+    """
+    global _feed
+    with _feed_lock:
+        if _feed is None:
+            _feed = ChangeFeed()
+        return _feed
+
+
+class EventStreamRenderer(BaseRenderer):
+    """
+    Renderer accepting ``text/event-stream`` requests. Streams bypass it;
+    only error responses are rendered, as JSON.
+    """
+    media_type = 'text/event-stream'
+    format = 'event-stream'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return json.dumps(data).encode(self.charset)
+
+
+def format_event(change):
+    """
+    Return one change as a Server-Sent Events message.
+    """
+    data = json.dumps(change['payload'], separators=(',', ':'))
+    return f"id: {change['id']}\nevent: {change['kind']}\ndata: {data}\n\n"
+
+
+def stream_changes(feed, last_event_id=None, sport_event_id=None, duration=None):
+    """
+    Yield Server-Sent Events for score changes.
+
+    Changes after ``last_event_id`` are replayed first; new changes follow
+    as the feed delivers them, with a comment line sent as heartbeat when
+    nothing happened. The stream ends after ``duration`` seconds so that
+    clients reconnect, and resume, through a fresh request.
+    """
+    if duration is None:
+        duration = settings.LIVE_SCORE_STREAM_SECONDS
+    heartbeat = settings.LIVE_SCORE_HEARTBEAT_SECONDS
+    deadline = time.monotonic() + duration
+
+    # Subscribe before replaying so no change falls between the two
+    subscriber = feed.subscribe()
+    try:
+        yield f"retry: {int(settings.LIVE_SCORE_POLL_SECONDS * 1000)}\n\n"
+
+        sent_id = subscriber.start_id
+        if last_event_id is not None:
+            sent_id = last_event_id
+            replay = changes_after(last_event_id, sport_event_id, settings.LIVE_SCORE_REPLAY_LIMIT)
+            for change in replay:
+                sent_id = change['id']
+                yield format_event(change)
+            if len(replay) == settings.LIVE_SCORE_REPLAY_LIMIT:
+                # More to catch up on; the client resumes after the last event sent
+                return
+
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            try:
+                changes = subscriber.get(timeout=min(heartbeat, remaining))
+            except queue.Empty:
+                yield ": heartbeat\n\n"
+                continue
+            for change in changes:
+                if change['id'] <= sent_id:
+                    continue
+                if sport_event_id and str(change['sport_event_id']) != str(sport_event_id):
+                    continue
+                sent_id = change['id']
+                yield format_event(change)
+    finally:
+        feed.unsubscribe(subscriber)
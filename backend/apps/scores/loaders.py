@@ -0,0 +1,152 @@
+"""
+Batch loaders for data shown alongside many scores at once.
+
+Each loader answers for a whole page of scores with a single query, so
+serializers can stay free of per-row lookups.
+"""
+from django.db.models import (
+    Case, Exists, F, IntegerField, OuterRef, Prefetch, Q, RowRange, Subquery, Sum, Value, When, Window
+)
+from django.db.models.functions import Coalesce, RowNumber
+
+from .models import Score, ScoreDetail
+
+# Number of recent scoring events shown with a live score
+LATEST_DETAILS_LIMIT = 5
+
+
+def score_details_prefetch():
+    """
+    Return the prefetch of the scoring events listed by ScoreSerializer.
+    """
+    return Prefetch(
+        'score_details',
+        queryset=ScoreDetail.objects.select_related(
+            'team', 'player', 'assisted_by'
+        ).order_by('time_occurred')
+    )
+
+
+def full_name(first_name, last_name):
+    """
+    Return a player's display name, or None without a player.
+    """
+    if first_name is None:
+        return None
+    return f"{first_name} {last_name}"
+
+
+def score_update(row):
+    """
+    Return the live representation of one scoring event loaded by
+    ``latest_score_details``.
+    """
+    return {
+        'team': row['team__name'],
+        'player': full_name(row['player__first_name'], row['player__last_name']),
+        'assisted_by': full_name(row['assisted_by__first_name'], row['assisted_by__last_name']),
+        'points': row['points'],
+        'event_type': row['event_type'],
+        'time': row['time_occurred'].strftime('%H:%M:%S'),
+        'minute': row['minute'],
+        'period': row['period'],
+        'description': row['description']
+    }
+
+
+def latest_score_details(score_ids, limit=LATEST_DETAILS_LIMIT):
+    """
+    Return ``{score_id: [update, ...]}`` with the latest ``limit`` scoring
+    events of each score, newest first, loaded in one query.
+
+    A ROW_NUMBER window partitioned by score ranks the events, and team and
+    player names are joined in, so the cost does not grow with the number
+    of scores.
+    """
+    score_ids = list(score_ids)
+    if not score_ids:
+        return {}
+
+    rows = ScoreDetail.objects.filter(score_id__in=score_ids).annotate(
+        row_number=Window(
+            RowNumber(),
+            partition_by=F('score_id'),
+            order_by=[F('time_occurred').desc(), F('created_at').desc()]
+        )
+    ).filter(row_number__lte=limit).order_by('score_id', 'row_number').values(
+        'score_id', 'points', 'event_type', 'time_occurred', 'minute', 'period', 'description',
+        'team__name', 'player__first_name', 'player__last_name',
+        'assisted_by__first_name', 'assisted_by__last_name'
+    )
+
+    updates = {score_id: [] for score_id in score_ids}
+    for row in rows:
+        updates[row['score_id']].append(score_update(row))
+    return updates
+
+
+def running_total(team_id, order_by):
+    """
+    Return a window summing the points of one team over every scoring
+    event up to and including the current one.
+    """
+    return Window(
+        Sum(Case(When(team_id=team_id, then=F('points')), default=Value(0), output_field=IntegerField())),
+        order_by=order_by,
+        frame=RowRange(start=None, end=0)
+    )
+
+
+def score_progression(score):
+    """
+    Return the running scoreline of a score after each of its scoring
+    events, in the order they occurred.
+
+    Running SUM windows compute both teams' totals in the database, so the
+    series is read in one query without folding the events in Python.
+    """
+    order_by = [F('time_occurred').asc(), F('created_at').asc(), F('id').asc()]
+    rows = score.score_details.annotate(
+        team1_score=running_total(score.team1_id, order_by),
+        team2_score=running_total(score.team2_id, order_by)
+    ).order_by(*order_by).values(
+        'id', 'team', 'points', 'event_type', 'minute', 'period', 'time_occurred',
+        'team1_score', 'team2_score'
+    )
+    return [
+        {**row, 'time_occurred': row['time_occurred'].strftime('%H:%M:%S')}
+        for row in rows
+    ]
+
+
+def detail_total(side):
+    """
+    Return a subquery summing the points scored by one side (``'team1'`` or
+    ``'team2'``) of the outer score, 0 without scoring events.
+    """
+    totals = ScoreDetail.objects.filter(
+        score=OuterRef('pk'), team=OuterRef(side)
+    ).order_by().values('score').annotate(total=Sum('points')).values('total')
+    return Coalesce(Subquery(totals, output_field=IntegerField()), Value(0))
+
+
+def drifted_scores(sport_event_ids=None):
+    """
+    Return the scores whose final scores differ from the points of their
+    scoring events, annotated with ``expected_team1`` and ``expected_team2``.
+
+    The comparison is a single query over all scores. Scores without any
+    scoring events are left out, since their final scores were entered
+    directly, as are games whose sides are not both assigned.
+    """
+    queryset = Score.objects.filter(team1__isnull=False, team2__isnull=False)
+    if sport_event_ids:
+        queryset = queryset.filter(game__sport_event_id__in=sport_event_ids)
+    return queryset.filter(
+        Exists(ScoreDetail.objects.filter(score=OuterRef('pk')))
+    ).annotate(
+        expected_team1=detail_total('team1'),
+        expected_team2=detail_total('team2')
+    ).filter(
+        ~Q(final_score_team1=F('expected_team1')) | ~Q(final_score_team2=F('expected_team2'))
+    )
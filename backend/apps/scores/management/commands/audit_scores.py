@@ -0,0 +1,71 @@
+from django.core.management.base import BaseCommand
+
+from scores.loaders import drifted_scores
+from scores.models import Score
+
+
+class Command(BaseCommand):
+    """
+    Find scores whose final scores drifted from their scoring events.
+
+    Final scores are kept in step with the scoring events on every write
+    made through the models, but ``update`` calls, raw SQL and restored
+    backups bypass that. The mismatches are read in chunks ordered by id, so
+    memory stays bounded however many scores there are, and with ``--fix``
+    each chunk is recalculated with one set of bulk updates. The leaderboards
+    of the affected sport events are refreshed once per chunk, or queued for
+    recalculation in deferred mode.
+    """
+    help = 'Report scores whose final scores do not match their scoring events, and optionally fix them'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--fix',
+            action='store_true',
+            help='Recalculate the mismatched scores from their scoring events'
+        )
+        parser.add_argument(
+            '--sport-event',
+            action='append',
+            dest='sport_events',
+            help='ID of a sport event to audit (repeatable); all sport events by default'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=1000,
+            help='Number of scores read and fixed at a time (default 1000)'
+        )
+
+    def handle(self, *args, **options):
+        queryset = drifted_scores(options['sport_events']).order_by('pk').values(
+            'pk', 'game__sport_event_id', 'final_score_team1', 'final_score_team2',
+            'expected_team1', 'expected_team2'
+        )
+        found = fixed = 0
+        sport_event_ids = set()
+        last_pk = None
+
+        while True:
+            chunk = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+            rows = list(chunk[:options['chunk_size']])
+            if not rows:
+                break
+            last_pk = rows[-1]['pk']
+            found += len(rows)
+
+            for row in rows:
+                self.stdout.write(
+                    f"Score {row['pk']}: stored {row['final_score_team1']}-{row['final_score_team2']}, "
+                    f"scoring events {row['expected_team1']}-{row['expected_team2']}"
+                )
+            if options['fix']:
+                scores = Score.recalculate_batch([row['pk'] for row in rows])
+                fixed += len(scores)
+                sport_event_ids.update(score.game.sport_event_id for score in scores)
+
+        self.stdout.write(f"Found {found} mismatched score(s)")
+        if options['fix']:
+            self.stdout.write(
+                f"Fixed {fixed} score(s) in {len(sport_event_ids)} sport event(s)"
+            )
@@ -0,0 +1,29 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from scores.models import ScoreChange
+
+
+class Command(BaseCommand):
+    """
+    Remove old entries from the score change log.
+
+    Live score streams only replay recent changes to reconnecting clients,
+    so entries older than any client could resume from can be dropped.
+    """
+    help = 'Delete score changes older than the given number of hours'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--hours',
+            type=float,
+            default=48,
+            help='Keep changes from the last HOURS hours (default 48)'
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(hours=options['hours'])
+        deleted, _ = ScoreChange.objects.filter(created_at__lt=cutoff).delete()
+        self.stdout.write(f"Deleted {deleted} score change(s)")
@@ -0,0 +1,68 @@
+# Generated by Django 5.1.6 on 2026-10-17 02:03
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("games", "0001_initial"),
+        ("scores", "0002_score_goals_against_team1_score_goals_against_team2_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ScoreChange",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                ("score_id", models.UUIDField(db_index=True, verbose_name="Score")),
+                (
+                    "detail_id",
+                    models.UUIDField(
+                        blank=True, null=True, verbose_name="Scoring Event"
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("score", "Score"),
+                            ("detail", "Scoring Event"),
+                            ("detail_deleted", "Scoring Event Deleted"),
+                        ],
+                        max_length=20,
+                        verbose_name="Kind",
+                    ),
+                ),
+                (
+                    "payload",
+                    models.JSONField(
+                        default=dict,
+                        help_text="Compact representation of the changed score or scoring event",
+                        verbose_name="Payload",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True, db_index=True, verbose_name="Created At"
+                    ),
+                ),
+                (
+                    "game",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="score_changes",
+                        to="games.game",
+                        verbose_name="Game",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Score Change",
+                "verbose_name_plural": "Score Changes",
+                "ordering": ["id"],
+            },
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.1.6 on 2026-10-17 02:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("scores", "0003_score_change"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="score",
+            name="version",
+            field=models.PositiveIntegerField(
+                default=0,
+                help_text="Increases with every change to the score or its scoring events",
+                verbose_name="Version",
+            ),
+        ),
+    ]
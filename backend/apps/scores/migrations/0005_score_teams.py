@@ -0,0 +1,69 @@
+# Generated by Django 5.1.6 on 2026-10-17 02:06
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+TEAM1_DESIGNATIONS = ("team_a", "home")
+TEAM2_DESIGNATIONS = ("team_b", "away")
+
+
+def backfill_score_teams(apps, schema_editor):
+    """
+    Copy the sides of each game from its GameTeam designations to its score.
+    """
+    Score = apps.get_model("scores", "Score")
+    GameTeam = apps.get_model("games", "GameTeam")
+
+    sides = {}
+    game_teams = GameTeam.objects.filter(
+        designation__in=TEAM1_DESIGNATIONS + TEAM2_DESIGNATIONS
+    ).order_by("game_id", "designation").values_list("game_id", "team_id", "designation")
+    for game_id, team_id, designation in game_teams:
+        slot = "team1_id" if designation in TEAM1_DESIGNATIONS else "team2_id"
+        sides.setdefault(game_id, {}).setdefault(slot, team_id)
+
+    scores = list(Score.objects.filter(game_id__in=sides).only("id", "game_id"))
+    for score in scores:
+        score.team1_id = sides[score.game_id].get("team1_id")
+        score.team2_id = sides[score.game_id].get("team2_id")
+    Score.objects.bulk_update(scores, ["team1", "team2"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("games", "0001_initial"),
+        ("scores", "0004_score_version"),
+        ("teams", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="score",
+            name="team1",
+            field=models.ForeignKey(
+                blank=True,
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="scores_as_team1",
+                to="teams.team",
+                verbose_name="Team 1",
+            ),
+        ),
+        migrations.AddField(
+            model_name="score",
+            name="team2",
+            field=models.ForeignKey(
+                blank=True,
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="scores_as_team2",
+                to="teams.team",
+                verbose_name="Team 2",
+            ),
+        ),
+        migrations.RunPython(backfill_score_teams, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,83 @@
+# Generated by Django 5.1.6 on 2026-10-17 02:10
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("scores", "0005_score_teams"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="scoredetail",
+            name="client_id",
+            field=models.UUIDField(
+                blank=True,
+                help_text="Identifier assigned by the recording client, used to ignore duplicate submissions",
+                null=True,
+                unique=True,
+                verbose_name="Client ID",
+            ),
+        ),
+        migrations.CreateModel(
+            name="SyncOperation",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                (
+                    "type",
+                    models.CharField(
+                        choices=[
+                            ("create_detail", "Create Scoring Event"),
+                            ("update_detail", "Update Scoring Event"),
+                            ("delete_detail", "Delete Scoring Event"),
+                            ("update_score", "Update Score"),
+                        ],
+                        max_length=20,
+                        verbose_name="Type",
+                    ),
+                ),
+                (
+                    "applied_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="Applied At"),
+                ),
+                (
+                    "applied_by",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="sync_operations",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Applied By",
+                    ),
+                ),
+                (
+                    "score",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="sync_operations",
+                        to="scores.score",
+                        verbose_name="Score",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Sync Operation",
+                "verbose_name_plural": "Sync Operations",
+                "ordering": ["applied_at"],
+            },
+        ),
+    ]
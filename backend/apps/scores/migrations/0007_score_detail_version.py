@@ -0,0 +1,22 @@
+# Generated by Django 5.1.6 on 2026-10-17 02:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("scores", "0006_offline_sync"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="scoredetail",
+            name="version",
+            field=models.PositiveIntegerField(
+                default=0,
+                help_text="Increases with every change to the scoring event",
+                verbose_name="Version",
+            ),
+        ),
+    ]
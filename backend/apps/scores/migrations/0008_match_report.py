@@ -0,0 +1,46 @@
+# Generated by Django 5.1.6 on 2026-10-17 02:17
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("scores", "0007_score_detail_version"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MatchReport",
+            fields=[
+                (
+                    "score",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="match_report",
+                        serialize=False,
+                        to="scores.score",
+                        verbose_name="Score",
+                    ),
+                ),
+                (
+                    "score_version",
+                    models.PositiveIntegerField(
+                        help_text="Version of the score the report was generated from",
+                        verbose_name="Score Version",
+                    ),
+                ),
+                ("data", models.JSONField(verbose_name="Data")),
+                (
+                    "generated_at",
+                    models.DateTimeField(auto_now=True, verbose_name="Generated At"),
+                ),
+            ],
+            options={
+                "verbose_name": "Match Report",
+                "verbose_name_plural": "Match Reports",
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.1.6 on 2026-10-17 02:48
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("scores", "0008_match_report"),
+        ("teams", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="scoredetail",
+            name="client_id",
+            field=models.UUIDField(
+                blank=True,
+                help_text="Identifier assigned by the recording client, used to ignore duplicate submissions",
+                null=True,
+                verbose_name="Client ID",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="scoredetail",
+            constraint=models.UniqueConstraint(
+                fields=("score", "created_by", "client_id"),
+                name="unique_score_detail_client_id",
+            ),
+        ),
+    ]
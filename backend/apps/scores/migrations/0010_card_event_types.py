@@ -0,0 +1,35 @@
+# Generated by Django 5.1.6 on 2026-10-17 02:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("scores", "0009_score_detail_client_id_scope"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="scoredetail",
+            name="event_type",
+            field=models.CharField(
+                choices=[
+                    ("goal", "Goal"),
+                    ("assist", "Assist"),
+                    ("own_goal", "Own Goal"),
+                    ("penalty", "Penalty"),
+                    ("free_kick", "Free Kick"),
+                    ("basket", "Basket"),
+                    ("point", "Point"),
+                    ("yellow_card", "Yellow Card"),
+                    ("red_card", "Red Card"),
+                    ("other", "Other"),
+                ],
+                default="goal",
+                help_text="Type of scoring event",
+                max_length=20,
+                verbose_name="Event Type",
+            ),
+        ),
+    ]
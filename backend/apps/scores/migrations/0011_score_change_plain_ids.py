@@ -0,0 +1,76 @@
+# Generated by Django 5.1.6 on 2026-10-17 02:58
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_sport_events(apps, schema_editor):
+    """
+    Copy the sport event of each logged change's game to the change.
+    """
+    ScoreChange = apps.get_model("scores", "ScoreChange")
+    Game = apps.get_model("games", "Game")
+
+    sport_events = dict(Game.objects.values_list("pk", "sport_event_id"))
+    for game_id, sport_event_id in sport_events.items():
+        ScoreChange.objects.filter(game_id=game_id).update(sport_event_id=sport_event_id)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("games", "0001_initial"),
+        ("scores", "0010_card_event_types"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="scorechange",
+            name="sport_event_id",
+            field=models.UUIDField(
+                blank=True, db_index=True, null=True, verbose_name="Sport Event"
+            ),
+        ),
+        migrations.RunPython(backfill_sport_events, migrations.RunPython.noop),
+        # Keep the game_id column and its index, dropping only the constraint
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.AlterField(
+                    model_name="scorechange",
+                    name="game",
+                    field=models.ForeignKey(
+                        db_constraint=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="score_changes",
+                        to="games.game",
+                        verbose_name="Game",
+                    ),
+                ),
+            ],
+            state_operations=[
+                migrations.RemoveField(
+                    model_name="scorechange",
+                    name="game",
+                ),
+                migrations.AddField(
+                    model_name="scorechange",
+                    name="game_id",
+                    field=models.UUIDField(db_index=True, verbose_name="Game"),
+                ),
+            ],
+        ),
+        migrations.AlterField(
+            model_name="scorechange",
+            name="kind",
+            field=models.CharField(
+                choices=[
+                    ("score", "Score"),
+                    ("detail", "Scoring Event"),
+                    ("detail_deleted", "Scoring Event Deleted"),
+                    ("score_deleted", "Score Deleted"),
+                ],
+                max_length=20,
+                verbose_name="Kind",
+            ),
+        ),
+    ]
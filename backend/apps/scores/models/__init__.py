@@ -1,4 +1,8 @@
 from .score import Score
 from .score_detail import ScoreDetail
+from .score_change import ScoreChange
+from .sync_operation import SyncOperation
+from .match_report import MatchReport
+from .versioned import VersionConflict
 
-__all__ = ['Score', 'ScoreDetail']
\ No newline at end of file
+__all__ = ['Score', 'ScoreDetail', 'ScoreChange', 'SyncOperation', 'MatchReport', 'VersionConflict']
@@ -0,0 +1,38 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class MatchReport(models.Model):
+    """
+    Frozen report of a verified score: the full score representation with
+    the timeline of scoring events, the scorers, the assists and the totals.
+    
+    Generated when the score is verified and served as is until the score
+    changes again, which gives it a new version.
+    """
+    score = models.OneToOneField(
+        'scores.Score',
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='match_report',
+        verbose_name=_('Score')
+    )
+    score_version = models.PositiveIntegerField(
+        _('Score Version'),
+        help_text=_('Version of the score the report was generated from')
+    )
+    data = models.JSONField(_('Data'))
+    generated_at = models.DateTimeField(_('Generated At'), auto_now=True)
+    
+    class Meta:
+        verbose_name = _('Match Report')
+        verbose_name_plural = _('Match Reports')
+    
+    def __str__(self):
+        return f"Match report for score {self.score_id}"
+    
+    def is_current(self, score):
+        """
+        Return True if the report still describes ``score``.
+        """
+        return self.score_version == score.version
@@ -1,10 +1,15 @@
 import uuid
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Case, F, Value, When
+from django.db.models.signals import post_save
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from users.models import User
 
+from .versioned import VersionedModel
 
-class Score(models.Model):
+
+class Score(VersionedModel):
     """
     Model for tracking scores for a specific game.
     Each Score object represents the overall scoring record for a game.
@@ -23,6 +28,13 @@ class Score(models.Model):
         ('disputed', _('Disputed')),
     )
 
+    # GameTeam designations of the sides scored as team 1 and team 2
+    TEAM1_DESIGNATIONS = ('team_a', 'home')
+    TEAM2_DESIGNATIONS = ('team_b', 'away')
+    
+    # Fields written when the totals are recalculated from the score details
+    RECALCULATED_FIELDS = ('final_score_team1', 'final_score_team2', 'winner', 'is_draw', 'updated_at', 'version')
+
     id = models.UUIDField(
         primary_key=True,
         default=uuid.uuid4,
@@ -74,6 +86,25 @@ class Score(models.Model):
         blank=True,
         help_text=_('Current time elapsed in the game (e.g., "45+2", "90")')
     )
+    # Sides of the game, kept in sync with its GameTeam designations
+    team1 = models.ForeignKey(
+        'teams.Team',
+        on_delete=models.SET_NULL,
+        related_name='scores_as_team1',
+        verbose_name=_('Team 1'),
+        null=True,
+        blank=True,
+        editable=False
+    )
+    team2 = models.ForeignKey(
+        'teams.Team',
+        on_delete=models.SET_NULL,
+        related_name='scores_as_team2',
+        verbose_name=_('Team 2'),
+        null=True,
+        blank=True,
+        editable=False
+    )
     winner = models.ForeignKey(
         'teams.Team',
         on_delete=models.SET_NULL,
@@ -116,6 +147,12 @@ class Score(models.Model):
         limit_choices_to={'role': 'admin'}
     )
     verified_at = models.DateTimeField(_('Verified At'), null=True, blank=True)
+    # Incremented by every save, including recalculations from score details
+    version = models.PositiveIntegerField(
+        _('Version'),
+        default=0,
+        help_text=_('Increases with every change to the score or its scoring events')
+    )
 
     class Meta:
         verbose_name = _('Score')
@@ -124,38 +161,266 @@ class Score(models.Model):
         
     def __str__(self):
         return f"Score for {self.game}"
+    
+    def save(self, *args, **kwargs):
+        """
+        Override save to look up the sides of the game when the score is
+        created. VersionedModel moves the score to a new version.
+        """
+        if self._state.adding and self.game_id and (self.team1_id is None or self.team2_id is None):
+            self.team1_id, self.team2_id = self.teams_for_game(self.game_id)
+        super().save(*args, **kwargs)
+    
+    @classmethod
+    def teams_for_game(cls, game_id):
+        """
+        Return the ids of the teams playing as team 1 and team 2 in a game,
+        None for a side not assigned yet.
+        """
+        from games.models import GameTeam
+
+        team1_id = team2_id = None
+        game_teams = GameTeam.objects.filter(
+            game_id=game_id,
+            designation__in=cls.TEAM1_DESIGNATIONS + cls.TEAM2_DESIGNATIONS
+        ).order_by('designation').values_list('team_id', 'designation')
+        for team_id, designation in game_teams:
+            if designation in cls.TEAM1_DESIGNATIONS:
+                team1_id = team1_id or team_id
+            else:
+                team2_id = team2_id or team_id
+        return team1_id, team2_id
+    
+    @classmethod
+    def sync_teams(cls, game_id):
+        """
+        Copy the current sides of a game to its score and return the score,
+        or None if nothing changed.
+        
+        The score is saved normally, so the change is versioned, logged and
+        applied to the leaderboards like any other correction. Final scores
+        stay with their teams: when the sides are swapped the scores swap
+        too, and a side taken over by another team keeps the score of the
+        team it replaced.
+        """
+        team1_id, team2_id = cls.teams_for_game(game_id)
+        score = cls.objects.select_related('game').filter(game_id=game_id).first()
+        if score is None or (score.team1_id, score.team2_id) == (team1_id, team2_id):
+            return None
+        
+        remaining = [(score.team1_id, score.final_score_team1), (score.team2_id, score.final_score_team2)]
+        finals = {}
+        for side, team_id in (('team1', team1_id), ('team2', team2_id)):
+            for previous in remaining:
+                if team_id is not None and previous[0] == team_id:
+                    finals[side] = previous[1]
+                    remaining.remove(previous)
+                    break
+        for side in ('team1', 'team2'):
+            if side not in finals:
+                finals[side] = remaining.pop(0)[1]
+        
+        score.team1_id, score.team2_id = team1_id, team2_id
+        score.final_score_team1, score.final_score_team2 = finals['team1'], finals['team2']
+        if score.final_score_team1 is not None and score.final_score_team2 is not None:
+            score.winner_id, score.is_draw = score.resolve_winner(team1_id, team2_id)
+        score.save()
+        return score
+    
+    @classmethod
+    def verify_batch(cls, score_ids, user):
+        """
+        Verify the completed, not yet verified scores among ``score_ids`` in
+        a single transaction and return them.
+        
+        ``update`` does not send the per-instance save signals, so
+        ``scores_verified`` is sent for the whole batch instead, letting each
+        affected leaderboard be refreshed once.
+        """
+        from scores.changes import record_score_batch
+        from scores.signals import scores_verified
+
+        now = timezone.now()
+        with transaction.atomic():
+            eligible = list(
+                cls.objects.select_for_update().filter(pk__in=score_ids, status='completed').exclude(
+                    verification_status='verified'
+                ).values_list('pk', flat=True)
+            )
+            if not eligible:
+                return []
+            cls.objects.filter(pk__in=eligible).update(
+                verification_status='verified',
+                verified_by=user,
+                verified_at=now,
+                updated_at=now,
+                version=F('version') + 1
+            )
+            scores = list(cls.objects.filter(pk__in=eligible).select_related('game'))
+            record_score_batch(scores)
+            scores_verified.send(sender=cls, scores=scores)
+        return scores
+        
+    @classmethod
+    def unverify_batch(cls, score_ids, verification_status='pending_verification'):
+        """
+        Move the scores among ``score_ids`` that are not in
+        ``verification_status`` yet back to it in a single transaction,
+        clearing their verification, and return them.
+        
+        Like ``verify_batch``, ``scores_unverified`` is sent for the whole
+        batch, so each affected leaderboard drops the results once.
+        """
+        from scores.changes import record_score_batch
+        from scores.signals import scores_unverified
+
+        now = timezone.now()
+        with transaction.atomic():
+            eligible = list(
+                cls.objects.select_for_update().filter(pk__in=score_ids).exclude(
+                    verification_status=verification_status
+                ).values_list('pk', flat=True)
+            )
+            if not eligible:
+                return []
+            cls.objects.filter(pk__in=eligible).update(
+                verification_status=verification_status,
+                verified_by=None,
+                verified_at=None,
+                updated_at=now,
+                version=F('version') + 1
+            )
+            scores = list(cls.objects.filter(pk__in=eligible).select_related('game'))
+            record_score_batch(scores)
+            scores_unverified.send(sender=cls, scores=scores)
+        return scores
+        
+    @classmethod
+    def recalculate_batch(cls, score_ids):
+        """
+        Recompute the final scores, winner and draw flag of the scores among
+        ``score_ids`` from their scoring events in a single transaction and
+        return them.
+        
+        The totals are summed by the database in the ``update`` itself, so
+        events recorded meanwhile are never overwritten with stale totals.
+        ``scores_recalculated`` is sent for the whole batch, since ``update``
+        does not send the per-instance save signals.
+        """
+        from scores.changes import record_score_batch
+        from scores.loaders import detail_total
+        from scores.signals import scores_recalculated
+
+        with transaction.atomic():
+            eligible = list(
+                cls.objects.select_for_update().filter(
+                    pk__in=score_ids, team1__isnull=False, team2__isnull=False
+                ).values_list('pk', flat=True)
+            )
+            if not eligible:
+                return []
+            queryset = cls.objects.filter(pk__in=eligible)
+            queryset.update(
+                final_score_team1=detail_total('team1'),
+                final_score_team2=detail_total('team2'),
+                updated_at=timezone.now(),
+                version=F('version') + 1
+            )
+            # A second statement, as SET expressions see the old totals
+            queryset.update(
+                winner=Case(
+                    When(final_score_team1__gt=F('final_score_team2'), then=F('team1')),
+                    When(final_score_team2__gt=F('final_score_team1'), then=F('team2')),
+                    default=None
+                ),
+                is_draw=Case(
+                    When(final_score_team1=F('final_score_team2'), then=Value(True)),
+                    default=Value(False)
+                )
+            )
+            scores = list(queryset.select_related('game'))
+            record_score_batch(scores)
+            scores_recalculated.send(sender=cls, scores=scores)
+        return scores
         
     def determine_winner(self):
         """
         Determine the winner based on final scores.
         Returns the winning team or None if it's a draw or incomplete.
-        
-        This implementation handles GameTeam relationships properly.
         """
         if self.final_score_team1 is None or self.final_score_team2 is None:
             return None
-            
-        # Get teams from GameTeam relations
-        team1 = None
-        team2 = None
-        
-        if hasattr(self.game, 'game_teams') and self.game.game_teams.exists():
-            team1_relation = self.game.game_teams.filter(designation__in=['team_a', 'home']).first()
-            team2_relation = self.game.game_teams.filter(designation__in=['team_b', 'away']).first()
-            
-            if team1_relation:
-                team1 = team1_relation.team
-            if team2_relation:
-                team2 = team2_relation.team
         
         if self.final_score_team1 > self.final_score_team2:
-            return team1
+            return self.team1
         elif self.final_score_team2 > self.final_score_team1:
-            return team2
+            return self.team2
         else:
             # It's a draw
             return None
     
+    def resolve_winner(self, team1_id, team2_id):
+        """
+        Return ``(winner_id, is_draw)`` from the final scores and the ids of
+        the two sides, without querying.
+        """
+        if self.final_score_team1 > self.final_score_team2:
+            return team1_id, False
+        if self.final_score_team2 > self.final_score_team1:
+            return team2_id, False
+        return None, True
+    
+    def recalculate_from_details(self):
+        """
+        Recompute the final scores, winner and draw flag from the score details.
+        
+        One query reads the stored version with the points summed per side;
+        one conditional UPDATE writes the new totals only if the version and
+        both sums are still the ones read. If another writer got in between,
+        nothing is written and the totals are read again. No row is locked.
+        ``post_save`` is sent as a save of RECALCULATED_FIELDS would send it.
+        Returns False if the game does not have both sides assigned.
+        """
+        from scores.loaders import detail_total
+
+        if self.team1_id is None or self.team2_id is None:
+            return False
+        
+        queryset = type(self).objects.filter(pk=self.pk)
+        while True:
+            state = queryset.order_by().values(
+                'version', team1_total=detail_total('team1'), team2_total=detail_total('team2')
+            ).first()
+            if state is None:
+                return False
+            self.final_score_team1 = state['team1_total']
+            self.final_score_team2 = state['team2_total']
+            self.winner_id, self.is_draw = self.resolve_winner(self.team1_id, self.team2_id)
+            self.updated_at = timezone.now()
+            updated = queryset.alias(
+                team1_total=detail_total('team1'), team2_total=detail_total('team2')
+            ).filter(
+                version=state['version'],
+                team1_total=self.final_score_team1,
+                team2_total=self.final_score_team2
+            ).update(
+                final_score_team1=self.final_score_team1,
+                final_score_team2=self.final_score_team2,
+                winner_id=self.winner_id,
+                is_draw=self.is_draw,
+                updated_at=self.updated_at,
+                version=state['version'] + 1
+            )
+            if updated:
+                break
+        
+        self.version = state['version'] + 1
+        post_save.send(
+            sender=type(self), instance=self, created=False,
+            update_fields=frozenset(self.RECALCULATED_FIELDS), raw=False, using=self._state.db
+        )
+        return True
+    
     def calculate_goal_difference(self, team_number):
         """
         Calculate the goal difference for a team.
@@ -176,4 +441,5 @@ class Score(models.Model):
         """
         # Implementation would depend on business logic
         # This is a placeholder for the actual implementation
-        pass
\ No newline at end of file
+        pass
+
@@ -0,0 +1,40 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class ScoreChange(models.Model):
+    """
+    Append-only log of changes to scores and their scoring events.
+    
+    The auto-incrementing id orders changes, so it serves as the event id of
+    the live score stream: clients resume by asking for changes after the
+    last id they received. Rows are inserted when the change commits.
+    """
+    KIND_CHOICES = (
+        ('score', _('Score')),
+        ('detail', _('Scoring Event')),
+        ('detail_deleted', _('Scoring Event Deleted')),
+        ('score_deleted', _('Score Deleted')),
+    )
+    
+    id = models.BigAutoField(primary_key=True)
+    # Plain ids rather than foreign keys so changes outlive deleted rows
+    score_id = models.UUIDField(_('Score'), db_index=True)
+    detail_id = models.UUIDField(_('Scoring Event'), null=True, blank=True)
+    game_id = models.UUIDField(_('Game'), db_index=True)
+    sport_event_id = models.UUIDField(_('Sport Event'), null=True, blank=True, db_index=True)
+    kind = models.CharField(_('Kind'), max_length=20, choices=KIND_CHOICES)
+    payload = models.JSONField(
+        _('Payload'),
+        default=dict,
+        help_text=_('Compact representation of the changed score or scoring event')
+    )
+    created_at = models.DateTimeField(_('Created At'), auto_now_add=True, db_index=True)
+    
+    class Meta:
+        verbose_name = _('Score Change')
+        verbose_name_plural = _('Score Changes')
+        ordering = ['id']
+    
+    def __str__(self):
+        return f"{self.get_kind_display()} change {self.id} for score {self.score_id}"
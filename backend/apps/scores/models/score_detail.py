@@ -1,10 +1,12 @@
 import uuid
-from django.db import models
+from django.db import models, transaction
 from django.utils.translation import gettext_lazy as _
 from users.models import User
 
+from .versioned import VersionedModel
 
-class ScoreDetail(models.Model):
+
+class ScoreDetail(VersionedModel):
     """
     Model for tracking detailed scoring events within a game.
     Each ScoreDetail represents one scoring event (e.g., a goal, point, etc.).
@@ -18,8 +20,12 @@ class ScoreDetail(models.Model):
         ('free_kick', _('Free Kick')),
         ('basket', _('Basket')),
         ('point', _('Point')),
+        ('yellow_card', _('Yellow Card')),
+        ('red_card', _('Red Card')),
         ('other', _('Other')),
     )
+    # Disciplinary events: recorded for fair play, never worth points
+    CARD_EVENT_TYPES = ('yellow_card', 'red_card')
     
     id = models.UUIDField(
         primary_key=True,
@@ -100,6 +106,20 @@ class ScoreDetail(models.Model):
         null=True,
         help_text=_('URL to video clip of the scoring event')
     )
+    # Generated by offline clients so retried submissions are recorded once;
+    # unique per score and recording user
+    client_id = models.UUIDField(
+        _('Client ID'),
+        null=True,
+        blank=True,
+        help_text=_('Identifier assigned by the recording client, used to ignore duplicate submissions')
+    )
+    # Incremented by every save, used to detect concurrent edits
+    version = models.PositiveIntegerField(
+        _('Version'),
+        default=0,
+        help_text=_('Increases with every change to the scoring event')
+    )
     created_at = models.DateTimeField(_('Created At'), auto_now_add=True)
     created_by = models.ForeignKey(
         User,
@@ -115,57 +135,69 @@ class ScoreDetail(models.Model):
         verbose_name = _('Score Detail')
         verbose_name_plural = _('Score Details')
         ordering = ['score', 'time_occurred']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['score', 'created_by', 'client_id'],
+                name='unique_score_detail_client_id'
+            )
+        ]
         
     def __str__(self):
         return f"{self.team.name} - {self.points} points at {self.time_occurred}"
     
-    def save(self, *args, **kwargs):
+    def save(self, *args, update_parent=True, **kwargs):
         """
         Override save to update the overall score when a scoring event is created or modified.
+        
+        With ``update_parent=False`` the caller recalculates the score and
+        records the change itself, e.g. once for several events.
         """
+        from scores.changes import record_detail_change
+
         super().save(*args, **kwargs)
         
-        # Update the parent score's statistics
-        self.update_parent_score()
+        if update_parent:
+            # Update the parent score's statistics
+            self.update_parent_score()
+            record_detail_change(self)
+    
+    def delete(self, *args, update_parent=True, **kwargs):
+        """
+        Override delete to let the caller take over updating the overall score.
+        
+        The score is recalculated by a ``post_delete`` handler, which also
+        covers queryset deletes. With ``update_parent=False`` the caller
+        recalculates the score and records the deletion itself.
+        """
+        self._update_parent = update_parent
+        return super().delete(*args, **kwargs)
+    
+    @classmethod
+    def record_batch(cls, score, details):
+        """
+        Insert several scoring events of one score in a single transaction and
+        update the parent score once, instead of once per event.
+        
+        ``bulk_create`` does not send the per-instance save signals, so
+        ``score_details_recorded`` is sent for the whole batch instead.
+        """
+        from scores.changes import record_detail_batch
+        from scores.signals import score_details_recorded
+
+        with transaction.atomic():
+            for detail in details:
+                detail.score = score
+                detail.version += 1
+            details = cls.objects.bulk_create(details)
+            score.recalculate_from_details()
+            record_detail_batch(details)
+            score_details_recorded.send(sender=cls, score=score, details=details)
+        return details
     
     def update_parent_score(self):
         """
-        Update the parent score based on this score detail.
+        Update the parent score based on its score details.
         This ensures that the overall score stays in sync with individual events.
         """
-        # This would be implemented based on business logic
-        # Get all score details for this score and recalculate
-        if self.score:
-            # Get game_teams to determine which team is team1 and which is team2
-            if hasattr(self.score.game, 'game_teams') and self.score.game.game_teams.exists():
-                team1_relation = self.score.game.game_teams.filter(designation__in=['team_a', 'home']).first()
-                team2_relation = self.score.game.game_teams.filter(designation__in=['team_b', 'away']).first()
-                
-                if team1_relation and team2_relation:
-                    team1 = team1_relation.team
-                    team2 = team2_relation.team
-                    
-                    # Calculate scores by summing points for each team
-                    team1_score = self.score.score_details.filter(team=team1).aggregate(
-                        models.Sum('points'))['points__sum'] or 0
-                    team2_score = self.score.score_details.filter(team=team2).aggregate(
-                        models.Sum('points'))['points__sum'] or 0
-                    
-                    # Update the score
-                    self.score.final_score_team1 = team1_score
-                    self.score.final_score_team2 = team2_score
-                    
-                    # Determine winner based on updated scores
-                    winner = self.score.determine_winner()
-                    if winner:
-                        self.score.winner = winner
-                        self.score.is_draw = False
-                    else:
-                        self.score.winner = None
-                        self.score.is_draw = True
-                    
-                    # Save the score
-                    self.score.save(update_fields=[
-                        'final_score_team1', 'final_score_team2', 
-                        'winner', 'is_draw', 'updated_at'
-                    ])
\ No newline at end of file
+        if self.score_id:
+            self.score.recalculate_from_details()
@@ -0,0 +1,48 @@
+import uuid
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+from users.models import User
+
+
+class SyncOperation(models.Model):
+    """
+    Record of an operation replayed by an offline scorekeeper client.
+    
+    The id is generated by the client, so an operation submitted again after
+    a lost connection is recognised and not applied twice.
+    """
+    TYPE_CHOICES = (
+        ('create_detail', _('Create Scoring Event')),
+        ('update_detail', _('Update Scoring Event')),
+        ('delete_detail', _('Delete Scoring Event')),
+        ('update_score', _('Update Score')),
+    )
+    
+    id = models.UUIDField(
+        primary_key=True,
+        default=uuid.uuid4,
+        editable=False
+    )
+    score = models.ForeignKey(
+        'scores.Score',
+        on_delete=models.CASCADE,
+        related_name='sync_operations',
+        verbose_name=_('Score')
+    )
+    type = models.CharField(_('Type'), max_length=20, choices=TYPE_CHOICES)
+    applied_at = models.DateTimeField(_('Applied At'), auto_now_add=True)
+    applied_by = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        related_name='sync_operations',
+        verbose_name=_('Applied By'),
+        null=True
+    )
+    
+    class Meta:
+        verbose_name = _('Sync Operation')
+        verbose_name_plural = _('Sync Operations')
+        ordering = ['applied_at']
+    
+    def __str__(self):
+        return f"{self.get_type_display()} {self.id} for score {self.score_id}"
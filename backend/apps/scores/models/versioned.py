@@ -0,0 +1,77 @@
+from django.db import models, transaction
+from django.db.models import F
+
+
+class VersionConflict(Exception):
+    """
+    Raised when a version-checked save finds that the record was changed
+    since the expected version was read.
+    """
+    def __init__(self, instance, expected_version):
+        super().__init__(
+            f"{type(instance).__name__} {instance.pk} is no longer at version {expected_version}"
+        )
+        self.instance = instance
+        self.expected_version = expected_version
+
+
+class VersionedModel(models.Model):
+    """
+    Abstract model whose ``version`` increases with every save.
+
+    After ``expect_version()`` the next save is a compare-and-swap: the row
+    is only updated if its stored version still matches, otherwise
+    VersionConflict is raised and nothing is written. No lock is held
+    between reading the record and saving it.
+
+    Other updates increment the stored version in SQL, so a save from a
+    stale instance never writes a version that was already given to a
+    different state; such an instance then lags behind the stored version
+    until it is reloaded.
+    """
+    _expected_version = None
+
+    class Meta:
+        abstract = True
+
+    def expect_version(self, version):
+        """
+        Make the next save fail with VersionConflict unless the stored
+        version is still ``version``.
+        """
+        self._expected_version = version
+
+    def save(self, *args, **kwargs):
+        previous = self.version
+        expected = self._expected_version
+        self.version = (previous if expected is None else expected) + 1
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'version' not in update_fields:
+            kwargs['update_fields'] = [*update_fields, 'version']
+        try:
+            if expected is None:
+                super().save(*args, **kwargs)
+            else:
+                # A savepoint keeps an enclosing transaction usable after a conflict
+                with transaction.atomic():
+                    super().save(*args, **kwargs)
+        except VersionConflict:
+            self.version = previous
+            raise
+        finally:
+            self._expected_version = None
+
+    def _do_update(self, base_qs, using, pk_val, values, update_fields, forced_update):
+        expected = self._expected_version
+        if expected is None:
+            values = [
+                (field, model, F('version') + 1 if field.attname == 'version' else value)
+                for field, model, value in values
+            ]
+            return super()._do_update(base_qs, using, pk_val, values, update_fields, forced_update)
+        updated = super()._do_update(
+            base_qs.filter(version=expected), using, pk_val, values, update_fields, forced_update
+        )
+        if not updated:
+            raise VersionConflict(self, expected)
+        return updated
@@ -0,0 +1,122 @@
+"""
+Frozen match reports of verified scores.
+
+A verified score no longer changes in normal operation, so its full
+representation is built once and stored as a MatchReport instead of being
+serialized again for every request. A correction moves the score to a new
+version, after which the report is generated again.
+"""
+from .changes import _jsonable
+from .loaders import score_details_prefetch
+from .models import MatchReport, Score
+from .serializers import ScoreSerializer
+
+# Scoring events that do not credit the player who recorded them as a scorer
+NON_SCORING_EVENTS = ('assist', 'own_goal', 'yellow_card', 'red_card')
+
+
+def is_reportable(score):
+    """
+    Return True if a match report is kept for the score.
+    """
+    return score.status == 'completed' and score.verification_status == 'verified'
+
+
+def player_row(detail, player_field='player'):
+    """
+    Return a scorer or assist row for the player of a serialized scoring event.
+    """
+    return {
+        'player': detail[player_field],
+        'player_name': detail[f'{player_field}_name'],
+        'team': detail['team'],
+        'team_name': detail['team_name'],
+    }
+
+
+def summarise(data):
+    """
+    Return the scorers, assists and per-team totals of a serialized score.
+    """
+    scorers, assists = {}, {}
+    totals = {
+        side: {'team': data[side], 'team_name': data[f'{side}_name'], 'points': 0, 'events': {}}
+        for side in ('team1', 'team2')
+    }
+    sides = {str(totals[side]['team']): totals[side] for side in totals if totals[side]['team']}
+
+    for detail in data['score_details']:
+        team_totals = sides.get(str(detail['team']))
+        if team_totals is not None:
+            team_totals['points'] += detail['points']
+            team_totals['events'][detail['event_type']] = team_totals['events'].get(detail['event_type'], 0) + 1
+
+        if detail['player'] and detail['event_type'] not in NON_SCORING_EVENTS:
+            row = scorers.setdefault(detail['player'], {**player_row(detail), 'points': 0, 'events': 0})
+            row['points'] += detail['points']
+            row['events'] += 1
+
+        if detail['event_type'] == 'assist' and detail['player']:
+            assistant = player_row(detail)
+        elif detail['assisted_by']:
+            assistant = player_row(detail, 'assisted_by')
+        else:
+            continue
+        row = assists.setdefault(assistant['player'], {**assistant, 'assists': 0})
+        row['assists'] += 1
+
+    return {
+        'scorers': sorted(scorers.values(), key=lambda row: (-row['points'], -row['events'], row['player_name'])),
+        'assists': sorted(assists.values(), key=lambda row: (-row['assists'], row['player_name'])),
+        'totals': [totals['team1'], totals['team2']],
+    }
+
+
+def build_report(score):
+    """
+    Return the report document of a score: its usual representation, whose
+    ``score_details`` form the timeline, with the scorers, assists and totals.
+    """
+    data = ScoreSerializer(score).data
+    return _jsonable({**data, **summarise(data)})
+
+
+def generate_reports(score_ids):
+    """
+    Generate and store the match reports of the verified scores among
+    ``score_ids``, replacing older reports. Returns the new reports.
+    """
+    scores = Score.objects.filter(
+        pk__in=score_ids, status='completed', verification_status='verified'
+    ).select_related(
+        'game', 'team1', 'team2', 'winner', 'scorekeeper'
+    ).prefetch_related(score_details_prefetch())
+    reports = [
+        MatchReport(score=score, score_version=score.version, data=build_report(score))
+        for score in scores
+    ]
+    return MatchReport.objects.bulk_create(
+        reports,
+        update_conflicts=True,
+        unique_fields=['score'],
+        update_fields=['score_version', 'data', 'generated_at']
+    )
+
+
+def report_data(score):
+    """
+    Return the match report document of a verified score, generating it if
+    it is missing or out of date, or None if the score is not verified.
+    """
+    if not is_reportable(score):
+        return None
+    try:
+        report = score.match_report
+    except MatchReport.DoesNotExist:
+        report = None
+    if report is None or not report.is_current(score):
+        reports = generate_reports([score.pk])
+        if not reports:
+            return None
+        report = reports[0]
+    return report.data
@@ -2,8 +2,11 @@ from .score_serializers import (
     ScoreSerializer,
     ScoreUpdateSerializer,
     ScoreVerificationSerializer,
+    ScoreBulkVerificationSerializer,
     ScoreDetailSerializer,
     ScoreDetailCreateSerializer,
+    ScoreDetailBatchSerializer,
+    ScoreSyncSerializer,
     ScoreCreateSerializer,
     TeamScoreboardSerializer
 )
@@ -17,8 +20,11 @@ __all__ = [
     'ScoreSerializer',
     'ScoreUpdateSerializer',
     'ScoreVerificationSerializer',
+    'ScoreBulkVerificationSerializer',
     'ScoreDetailSerializer',
     'ScoreDetailCreateSerializer',
+    'ScoreDetailBatchSerializer',
+    'ScoreSyncSerializer',
     'ScoreCreateSerializer',
     'PublicScoreSerializer',
     'PublicLiveScoreSerializer',
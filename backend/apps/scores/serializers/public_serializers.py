@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from ..loaders import latest_score_details
 from ..models import Score
 
 
@@ -11,7 +12,7 @@ class PublicScoreSerializer(serializers.ModelSerializer):
     sport_type = serializers.CharField(source='game.sport_event.sport_type', read_only=True)
     sport_name = serializers.CharField(source='game.sport_event.get_sport_type_display', read_only=True)
     event_name = serializers.CharField(source='game.sport_event.event.name', read_only=True)
-    # Use SerializerMethodField to properly handle game_teams
+    # Sides are read from the score's team1/team2, select_related by the views
     team1_name = serializers.SerializerMethodField()
     team2_name = serializers.SerializerMethodField()
     winner_name = serializers.CharField(source='winner.name', read_only=True, allow_null=True)
@@ -33,16 +34,10 @@ class PublicScoreSerializer(serializers.ModelSerializer):
         read_only_fields = fields
     
     def get_team1_name(self, obj):
-        team1_relation = obj.game.game_teams.filter(designation__in=['team_a', 'home']).first()
-        if team1_relation:
-            return team1_relation.team.name
-        return None
+        return obj.team1.name if obj.team1_id else None
     
     def get_team2_name(self, obj):
-        team2_relation = obj.game.game_teams.filter(designation__in=['team_b', 'away']).first()
-        if team2_relation:
-            return team2_relation.team.name
-        return None
+        return obj.team2.name if obj.team2_id else None
     
     def get_goal_difference_team1(self, obj):
         return obj.calculate_goal_difference(1)
@@ -51,13 +46,24 @@ class PublicScoreSerializer(serializers.ModelSerializer):
         return obj.calculate_goal_difference(2)
 
 
+class LiveScoreListSerializer(serializers.ListSerializer):
+    """
+    List serializer loading the latest scoring events of all listed scores
+    in one query before serializing them.
+    """
+    def to_representation(self, data):
+        scores = list(data.all() if hasattr(data, 'all') else data)
+        self.context['score_updates'] = latest_score_details(score.pk for score in scores)
+        return super().to_representation(scores)
+
+
 class PublicLiveScoreSerializer(serializers.ModelSerializer):
     """
     Serializer for live score updates for public viewing.
     Includes current score and game status.
     """
     game_name = serializers.CharField(source='game.name', read_only=True)
-    # Use SerializerMethodField to properly handle game_teams
+    # Sides are read from the score's team1/team2, select_related by the views
     team1_name = serializers.SerializerMethodField()
     team2_name = serializers.SerializerMethodField()
     location = serializers.CharField(source='game.location', read_only=True)
@@ -69,6 +75,7 @@ class PublicLiveScoreSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Score
+        list_serializer_class = LiveScoreListSerializer
         fields = [
             'id', 'game_name', 'match_day', 'team1_name', 'team2_name', 'location',
             'scheduled_start', 'status', 'status_display', 'time_elapsed',
@@ -77,42 +84,17 @@ class PublicLiveScoreSerializer(serializers.ModelSerializer):
         read_only_fields = fields
     
     def get_team1_name(self, obj):
-        team1_relation = obj.game.game_teams.filter(designation__in=['team_a', 'home']).first()
-        if team1_relation:
-            return team1_relation.team.name
-        return None
+        return obj.team1.name if obj.team1_id else None
     
     def get_team2_name(self, obj):
-        team2_relation = obj.game.game_teams.filter(designation__in=['team_b', 'away']).first()
-        if team2_relation:
-            return team2_relation.team.name
-        return None
+        return obj.team2.name if obj.team2_id else None
     
     def get_score_updates(self, obj):
-        # Return the latest 5 scoring events with enhanced details
-        score_details = obj.score_details.all().order_by('-time_occurred')[:5]
-        result = []
-        for detail in score_details:
-            player_name = None
-            if detail.player:
-                player_name = f"{detail.player.first_name} {detail.player.last_name}"
-            
-            assisted_by_name = None
-            if detail.assisted_by:
-                assisted_by_name = f"{detail.assisted_by.first_name} {detail.assisted_by.last_name}"
-            
-            result.append({
-                'team': detail.team.name,
-                'player': player_name,
-                'assisted_by': assisted_by_name,
-                'points': detail.points,
-                'event_type': detail.event_type,
-                'time': detail.time_occurred.strftime('%H:%M:%S'),
-                'minute': detail.minute,
-                'period': detail.period,
-                'description': detail.description
-            })
-        return result
+        # Return the latest scoring events, loaded for the whole list when possible
+        updates = self.context.get('score_updates')
+        if updates is None or obj.pk not in updates:
+            updates = latest_score_details([obj.pk])
+        return updates[obj.pk]
 
 
 class LeaderboardScoreSerializer(serializers.ModelSerializer):
@@ -2,9 +2,12 @@ from rest_framework import serializers
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from drf_spectacular.utils import extend_schema_serializer, OpenApiExample
-from ..models import Score, ScoreDetail
+from ..models import Score, ScoreDetail, SyncOperation
 from users.serializers import UserSerializer
 
+# Maximum number of scores verified by one bulk verification request
+MAX_BULK_VERIFICATION = 500
+
 
 @extend_schema_serializer(
     examples=[
@@ -59,7 +62,7 @@ class ScoreSerializer(serializers.ModelSerializer):
     """
     Serializer for the Score model with detailed information.
     """
-    # Get team information from game_teams instead of direct game properties
+    # Team information comes from the score's denormalized team1/team2
     game_name = serializers.CharField(source='game.name', read_only=True)
     team1 = serializers.SerializerMethodField()
     team1_name = serializers.SerializerMethodField()
@@ -81,40 +84,28 @@ class ScoreSerializer(serializers.ModelSerializer):
             'goals_for_team2', 'goals_against_team2', 'goal_difference_team2',
             'time_elapsed', 'winner', 'winner_name',
             'is_draw', 'notes', 'verification_status', 'scorekeeper', 
-            'created_at', 'updated_at', 'score_details'
+            'version', 'created_at', 'updated_at', 'score_details'
         ]
         read_only_fields = [
-            'id', 'game', 'winner', 'is_draw', 'created_at', 'updated_at',
+            'id', 'game', 'winner', 'is_draw', 'version', 'created_at', 'updated_at',
             'goal_difference_team1', 'goal_difference_team2'
         ]
     
     def get_team1(self, obj):
-        # Get team1 from game_team with designation team_a or home
-        team1_relation = obj.game.game_teams.filter(designation__in=['team_a', 'home']).first()
-        if team1_relation:
-            return str(team1_relation.team.id)
-        return None
+        return str(obj.team1_id) if obj.team1_id else None
     
     def get_team1_name(self, obj):
-        team1_relation = obj.game.game_teams.filter(designation__in=['team_a', 'home']).first()
-        if team1_relation:
-            return team1_relation.team.name
-        return None
+        return obj.team1.name if obj.team1_id else None
     
     def get_team2(self, obj):
-        team2_relation = obj.game.game_teams.filter(designation__in=['team_b', 'away']).first()
-        if team2_relation:
-            return str(team2_relation.team.id)
-        return None
+        return str(obj.team2_id) if obj.team2_id else None
     
     def get_team2_name(self, obj):
-        team2_relation = obj.game.game_teams.filter(designation__in=['team_b', 'away']).first()
-        if team2_relation:
-            return team2_relation.team.name
-        return None
+        return obj.team2.name if obj.team2_id else None
     
     def get_score_details(self, obj):
-        score_details = obj.score_details.all().order_by('time_occurred')
+        # Ordered by time_occurred, and possibly prefetched by the view
+        score_details = obj.score_details.all()
         return ScoreDetailSerializer(score_details, many=True).data
     
     def get_goal_difference_team1(self, obj):
@@ -301,6 +292,32 @@ class ScoreVerificationSerializer(serializers.Serializer):
         return instance
 
 
+@extend_schema_serializer(
+    examples=[
+        OpenApiExample(
+            'Bulk Score Verification Example',
+            value={
+                'scores': [
+                    '3fa85f64-5717-4562-b3fc-2c963f66afa6',
+                    '16fd2706-8baf-433b-82eb-8c7fada847da'
+                ]
+            },
+            request_only=True,
+        )
+    ]
+)
+class ScoreBulkVerificationSerializer(serializers.Serializer):
+    """
+    Serializer for verifying many scores at once by an administrator.
+    """
+    scores = serializers.ListField(
+        child=serializers.UUIDField(),
+        allow_empty=False,
+        max_length=MAX_BULK_VERIFICATION,
+        help_text=_('IDs of the completed scores to verify')
+    )
+
+
 @extend_schema_serializer(
     examples=[
         OpenApiExample(
@@ -338,9 +355,19 @@ class ScoreDetailSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'score', 'team', 'team_name', 'player', 'player_name',
             'assisted_by', 'assisted_by_name', 'points', 'event_type',
-            'time_occurred', 'minute', 'period', 'description', 'video_url'
+            'time_occurred', 'minute', 'period', 'description', 'video_url',
+            'client_id', 'version'
         ]
-        read_only_fields = ['id']
+        read_only_fields = ['id', 'client_id', 'version']
+    
+    def validate(self, attrs):
+        # Cards carry no points
+        event_type = attrs.get('event_type', self.instance.event_type if self.instance else None)
+        if event_type in ScoreDetail.CARD_EVENT_TYPES:
+            if attrs.get('points'):
+                raise serializers.ValidationError({'points': _('Cards cannot carry points')})
+            attrs['points'] = 0
+        return attrs
     
     def get_player_name(self, obj):
         if obj.player:
@@ -398,9 +425,16 @@ class ScoreDetailCreateSerializer(serializers.ModelSerializer):
         model = ScoreDetail
         fields = [
             'score', 'team', 'player', 'assisted_by', 'points', 'event_type',
-            'time_occurred', 'minute', 'period', 'description', 'video_url'
+            'time_occurred', 'minute', 'period', 'description', 'video_url',
+            'client_id'
         ]
     
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # In nested URLs the score comes from the context instead of the body
+        if 'score' in self.context:
+            self.fields['score'].required = False
+    
     def validate(self, attrs):
         # Ensure score is provided when not in nested URL context
         if 'score' not in attrs and 'score' not in self.context:
@@ -411,8 +445,13 @@ class ScoreDetailCreateSerializer(serializers.ModelSerializer):
             if attrs['minute'] < 0:
                 raise serializers.ValidationError({'minute': _('Minute cannot be negative')})
         
-        # Ensure points are positive
-        if 'points' in attrs and attrs['points'] <= 0:
+        # Cards carry no points; every other event must score
+        event_type = attrs.get('event_type', self.instance.event_type if self.instance else 'goal')
+        if event_type in ScoreDetail.CARD_EVENT_TYPES:
+            if attrs.get('points'):
+                raise serializers.ValidationError({'points': _('Cards cannot carry points')})
+            attrs['points'] = 0
+        elif 'points' in attrs and attrs['points'] <= 0:
             raise serializers.ValidationError({'points': _('Points must be positive')})
         
         # Get the score either from attrs or context
@@ -421,11 +460,8 @@ class ScoreDetailCreateSerializer(serializers.ModelSerializer):
         # Ensure team is part of the game
         team = attrs.get('team')
         if score and team:
-            # Get teams from game_teams relations
-            game_teams = score.game.game_teams.all()
-            team_ids = [gt.team.id for gt in game_teams]
-            
-            if team.id not in team_ids:
+            # The sides of the game are kept on the score
+            if team.id not in (score.team1_id, score.team2_id):
                 raise serializers.ValidationError(
                     {'team': _('This team is not participating in the game.')}
                 )
@@ -459,6 +495,71 @@ class ScoreDetailCreateSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
+class ScoreDetailBatchSerializer(serializers.Serializer):
+    """
+    Serializer for the result of recording a batch of scoring events.
+    """
+    score = serializers.UUIDField(source='id')
+    final_score_team1 = serializers.IntegerField()
+    final_score_team2 = serializers.IntegerField()
+    winner = serializers.UUIDField(source='winner_id', allow_null=True)
+    is_draw = serializers.BooleanField()
+    details = ScoreDetailSerializer(many=True)
+
+
+class SyncOperationSerializer(serializers.Serializer):
+    """
+    Serializer for one operation replayed by an offline scorekeeper client.
+    """
+    id = serializers.UUIDField(help_text=_('Identifier generated by the client for this operation'))
+    type = serializers.ChoiceField(choices=SyncOperation.TYPE_CHOICES)
+    detail = serializers.UUIDField(
+        required=False,
+        help_text=_('Client ID or ID of the scoring event to update or delete')
+    )
+    data = serializers.DictField(required=False, default=dict)
+    
+    def validate(self, attrs):
+        if attrs['type'] in ('update_detail', 'delete_detail') and 'detail' not in attrs:
+            raise serializers.ValidationError({'detail': _('This field is required for this operation.')})
+        return attrs
+
+
+@extend_schema_serializer(
+    examples=[
+        OpenApiExample(
+            'Score Sync Example',
+            value={
+                'operations': [
+                    {
+                        'id': '7c9e6679-7425-40de-944b-e07fc1f90ae7',
+                        'type': 'create_detail',
+                        'data': {
+                            'client_id': '9b2f5c1e-4b7a-4f0e-8d55-2f1c9a6e1d01',
+                            'team': '3fa85f64-5717-4562-b3fc-2c963f66afa8',
+                            'event_type': 'goal',
+                            'time_occurred': '00:15:30',
+                            'minute': 15
+                        }
+                    },
+                    {
+                        'id': '16fd2706-8baf-433b-82eb-8c7fada847da',
+                        'type': 'update_score',
+                        'data': {'time_elapsed': '17'}
+                    }
+                ]
+            },
+            request_only=True,
+        )
+    ]
+)
+class ScoreSyncSerializer(serializers.Serializer):
+    """
+    Serializer for an ordered batch of operations replayed by an offline client.
+    """
+    operations = SyncOperationSerializer(many=True, allow_empty=False)
+
+
 class ScoreCreateSerializer(serializers.ModelSerializer):
     """
     Serializer for creating a score record.
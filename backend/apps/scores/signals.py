@@ -0,0 +1,175 @@
+from django.db.models import Q, QuerySet
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import Signal, receiver
+
+from games.models import Game, GameTeam
+from teams.models import Player, Team
+
+from .caching import invalidate, score_tags
+from .changes import record_detail_deletion, record_score_change, record_score_deletion
+from .models import Score, ScoreDetail
+from .reports import generate_reports, is_reportable
+
+# Fields of the names shown in score responses
+DISPLAY_NAME_FIELDS = {Team: ('name',), Player: ('first_name', 'last_name')}
+
+# Sent after several scoring events were inserted with ``bulk_create``, which
+# bypasses the per-instance save signals. Arguments: ``score``, ``details``.
+score_details_recorded = Signal()
+
+# Sent after several scores were verified with ``update``, which bypasses the
+# per-instance save signals. Arguments: ``scores``.
+scores_verified = Signal()
+
+# Sent after several scores were moved back from verified, or another
+# verification status, with ``update``. Arguments: ``scores``.
+scores_unverified = Signal()
+
+# Sent after the totals of several scores were recalculated with ``update``,
+# which bypasses the per-instance save signals. Arguments: ``scores``.
+scores_recalculated = Signal()
+
+
+@receiver(post_save, sender=Score)
+def record_score_change_on_save(sender, instance, raw=False, update_fields=None, **kwargs):
+    """
+    Signal handler to log a saved score for live clients.
+    
+    Recalculating the totals from the scoring events is not logged
+    separately: the scoring event change already carries the new totals.
+    """
+    if raw:
+        return
+    if update_fields and set(update_fields) <= set(Score.RECALCULATED_FIELDS):
+        return
+    record_score_change(instance)
+
+
+@receiver(post_delete, sender=Score)
+def record_score_deletion_on_delete(sender, instance, **kwargs):
+    """
+    Signal handler to log a tombstone for a deleted score, whether it was
+    deleted itself or along with its game, so syncing clients drop it.
+    """
+    record_score_deletion(instance, instance.pk)
+
+
+@receiver(post_delete, sender=ScoreDetail)
+def update_score_on_detail_delete(sender, instance, origin=None, **kwargs):
+    """
+    Signal handler to recalculate the score of a deleted scoring event and
+    log the deletion, for single and queryset deletes alike.
+    
+    Scoring events removed along with their score, or any other record they
+    depend on, are left alone: the deletion did not start from them.
+    """
+    origin_model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    if origin_model is not ScoreDetail or not getattr(instance, '_update_parent', True):
+        return
+    instance.update_parent_score()
+    record_detail_deletion(instance, instance.pk)
+
+
+@receiver(post_save, sender=GameTeam)
+@receiver(post_delete, sender=GameTeam)
+def sync_score_teams(sender, instance, raw=False, **kwargs):
+    """
+    Signal handler to keep a score's team 1 and team 2 in line with the
+    designations of its game's teams.
+    """
+    if raw:
+        return
+    Score.sync_teams(instance.game_id)
+    invalidate(*score_tags(game_id=instance.game_id, sport_event_id=instance.game.sport_event_id))
+
+
+@receiver(post_save, sender=Score)
+@receiver(post_delete, sender=Score)
+def invalidate_cached_score(sender, instance, raw=False, **kwargs):
+    """
+    Signal handler to make cached responses showing a score stale. Scoring
+    event writes reach it through the recalculated parent score.
+    """
+    if raw:
+        return
+    invalidate(*score_tags(instance.pk, instance.game_id, instance.game.sport_event_id))
+
+
+@receiver(post_save, sender=Game)
+def invalidate_cached_game_scores(sender, instance, raw=False, **kwargs):
+    """
+    Signal handler to make cached score responses showing a game stale.
+    """
+    if raw:
+        return
+    invalidate(*score_tags(game_id=instance.pk, sport_event_id=instance.sport_event_id))
+
+
+@receiver([scores_verified, scores_unverified, scores_recalculated], sender=Score)
+def invalidate_cached_verified_scores(sender, scores, **kwargs):
+    """
+    Signal handler to make cached responses showing bulk verified,
+    unverified or recalculated scores stale.
+    """
+    tags = set()
+    for score in scores:
+        tags.update(score_tags(score.pk, score.game_id, score.game.sport_event_id))
+    invalidate(*tags)
+
+
+@receiver(pre_save, sender=Team)
+@receiver(pre_save, sender=Player)
+def remember_display_name(sender, instance, raw=False, **kwargs):
+    """
+    Signal handler to remember the name a team or player had before saving.
+    """
+    if raw:
+        return
+    instance._previous_display_name = sender.objects.filter(
+        pk=instance.pk
+    ).values_list(*DISPLAY_NAME_FIELDS[sender]).first()
+
+
+@receiver(post_save, sender=Team)
+@receiver(post_save, sender=Player)
+def invalidate_cached_scores_on_rename(sender, instance, created, raw=False, **kwargs):
+    """
+    Signal handler to make cached responses showing a renamed team or
+    player stale: those of the games the team played or the player scored
+    or assisted in.
+    """
+    previous = getattr(instance, '_previous_display_name', None)
+    current = tuple(getattr(instance, field) for field in DISPLAY_NAME_FIELDS[sender])
+    if created or raw or previous is None or previous == current:
+        return
+    if sender is Team:
+        scores = Score.objects.filter(game__game_teams__team=instance)
+    else:
+        scores = Score.objects.filter(Q(score_details__player=instance) | Q(score_details__assisted_by=instance))
+    tags = set()
+    for score_id, game_id, sport_event_id in scores.values_list(
+        'pk', 'game_id', 'game__sport_event_id'
+    ).distinct():
+        tags.update(score_tags(score_id, game_id, sport_event_id))
+    if tags:
+        invalidate(*tags)
+
+
+@receiver(post_save, sender=Score)
+def generate_match_report(sender, instance, raw=False, **kwargs):
+    """
+    Signal handler to freeze the match report of a score when it is
+    verified, and again whenever a verified score is corrected.
+    """
+    if raw or not is_reportable(instance):
+        return
+    generate_reports([instance.pk])
+
+
+@receiver([scores_verified, scores_recalculated], sender=Score)
+def generate_verified_match_reports(sender, scores, **kwargs):
+    """
+    Signal handler to freeze the match reports of bulk verified scores, and
+    again after verified scores were recalculated.
+    """
+    generate_reports([score.pk for score in scores])
@@ -0,0 +1,162 @@
+"""
+Replay of operations recorded by offline scorekeeper clients.
+
+Clients queue operations while disconnected and send them in order once
+they reconnect. Every operation carries a client-generated id and new
+scoring events a client-generated ``client_id``, so a batch sent again
+after a lost response is recognised and nothing is applied twice.
+"""
+from django.db import transaction
+from django.db.models import Q
+from rest_framework import serializers
+
+from .changes import record_detail_batch, record_detail_deletion
+from .models import Score, ScoreDetail, SyncOperation
+from .serializers import ScoreDetailCreateSerializer, ScoreUpdateSerializer
+
+# Score fields an offline client may change
+SYNC_SCORE_FIELDS = ('status', 'time_elapsed')
+
+
+class SyncError(Exception):
+    """
+    Raised when an operation of a batch is invalid; nothing is applied.
+    """
+    def __init__(self, index, errors):
+        super().__init__(f"Operation {index} is invalid")
+        self.index = index
+        self.errors = errors
+
+
+def find_detail(score, user, key):
+    """
+    Return the scoring event of a score with the given ID, or recorded by
+    the user under the given client ID.
+    """
+    return score.score_details.filter(Q(client_id=key, created_by=user) | Q(pk=key)).first()
+
+
+def detail_serializer(score, context, instance=None, data=None):
+    """
+    Return a serializer validating scoring event data for a score.
+    """
+    return ScoreDetailCreateSerializer(
+        instance,
+        data=data,
+        partial=instance is not None,
+        context={**context, 'score': score}
+    )
+
+
+class Replay:
+    """
+    Application of one batch of operations to a score.
+
+    Scoring events are saved without updating the parent score; the score
+    is recalculated, and the changes recorded, once the batch is applied.
+    """
+
+    def __init__(self, score, user, context):
+        self.score = score
+        self.user = user
+        self.context = context
+        self.saved = {}
+        self.deleted = []
+
+    def create_detail(self, operation):
+        data = dict(operation['data'])
+        client_id = data.get('client_id')
+        if client_id and self.score.score_details.filter(client_id=client_id, created_by=self.user).exists():
+            # Already recorded, e.g. through the create or batch endpoint
+            return
+        serializer = detail_serializer(self.score, self.context, data=data)
+        serializer.is_valid(raise_exception=True)
+        fields = dict(serializer.validated_data)
+        if fields.pop('score', self.score).pk != self.score.pk:
+            raise serializers.ValidationError({'score': ['Must match the score being synced.']})
+        detail = ScoreDetail(score=self.score, created_by=self.user, **fields)
+        detail.save(update_parent=False)
+        self.saved[detail.pk] = detail
+
+    def update_detail(self, operation):
+        detail = find_detail(self.score, self.user, operation['detail'])
+        if detail is None:
+            raise serializers.ValidationError({'detail': ['Scoring event not found.']})
+        serializer = detail_serializer(self.score, self.context, instance=detail, data=operation['data'])
+        serializer.is_valid(raise_exception=True)
+        for field, value in serializer.validated_data.items():
+            if field not in ('score', 'client_id'):
+                setattr(detail, field, value)
+        detail.save(update_parent=False)
+        self.saved[detail.pk] = detail
+
+    def delete_detail(self, operation):
+        detail = find_detail(self.score, self.user, operation['detail'])
+        if detail is None:
+            # Deleting is idempotent: the event is already gone
+            return
+        detail_id = detail.pk
+        detail.delete(update_parent=False)
+        self.saved.pop(detail_id, None)
+        self.deleted.append((detail, detail_id))
+
+    def update_score(self, operation):
+        unknown = set(operation['data']) - set(SYNC_SCORE_FIELDS)
+        if unknown:
+            raise serializers.ValidationError({
+                field: ['This field cannot be changed through sync.'] for field in sorted(unknown)
+            })
+        serializer = ScoreUpdateSerializer(self.score, data=operation['data'], partial=True)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+
+    def apply(self, operation):
+        getattr(self, operation['type'])(operation)
+
+    def finish(self):
+        """
+        Recalculate the score once and record the scoring event changes.
+        """
+        if not self.saved and not self.deleted:
+            return
+        self.score.recalculate_from_details()
+        record_detail_batch(list(self.saved.values()))
+        for detail, detail_id in self.deleted:
+            record_detail_deletion(detail, detail_id)
+
+
+def apply_operations(score, operations, user, context=None):
+    """
+    Apply an ordered batch of operations to a score in one transaction.
+
+    Operations applied before, in an earlier or the same batch, are skipped.
+    Returns ``(score, applied_ids, skipped_ids)``; raises SyncError, leaving
+    the score untouched, if any operation is invalid.
+    """
+    context = context or {}
+    with transaction.atomic():
+        # Serialise replays of the same score
+        score = Score.objects.select_for_update().select_related('game').get(pk=score.pk)
+        done = set(SyncOperation.objects.filter(
+            id__in=[operation['id'] for operation in operations]
+        ).values_list('id', flat=True))
+
+        replay = Replay(score, user, context)
+        applied, skipped = [], []
+        for index, operation in enumerate(operations):
+            if operation['id'] in done:
+                skipped.append(operation['id'])
+                continue
+            try:
+                replay.apply(operation)
+            except serializers.ValidationError as exc:
+                raise SyncError(index, exc.detail)
+            done.add(operation['id'])
+            applied.append(operation)
+
+        replay.finish()
+        SyncOperation.objects.bulk_create([
+            SyncOperation(id=operation['id'], score=score, type=operation['type'], applied_by=user)
+            for operation in applied
+        ])
+    return score, [operation['id'] for operation in applied], skipped
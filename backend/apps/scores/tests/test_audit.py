@@ -0,0 +1,116 @@
+from datetime import time
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from leaderboards.models import DirtyLeaderboard, Leaderboard, LeaderboardEntry
+from leaderboards.standings import recalculate_leaderboard
+from scores.models import Score, ScoreChange, ScoreDetail
+
+pytestmark = pytest.mark.scores  # Mark all tests in this file as scores tests
+
+
+def drift(score, **totals):
+    """
+    Overwrite stored totals without going through the models
+    """
+    Score.objects.filter(pk=score.pk).update(**totals)
+
+
+def audit(**options):
+    """
+    Run the audit command and return its output
+    """
+    out = StringIO()
+    call_command('audit_scores', stdout=out, **options)
+    return out.getvalue()
+
+
+@pytest.mark.django_db
+class TestScoreAudit:
+    """
+    Score consistency audit tests
+    """
+
+    def test_reports_mismatches_without_changing_them(self, make_team, make_game):
+        """
+        Test that drifted scores are reported and left alone without --fix
+        """
+        eagles, falcons = make_team('Eagles'), make_team('Falcons')
+        score = make_game(eagles, falcons)
+        ScoreDetail.objects.create(score=score, team=eagles, points=2, minute=5, time_occurred=time(15, 5))
+        consistent = make_game(make_team('Hawks'), make_team('Owls'))
+        ScoreDetail.objects.create(
+            score=consistent, team=consistent.team1, points=1, minute=5, time_occurred=time(15, 5)
+        )
+        # Scores entered directly, without scoring events, are not audited
+        make_game(make_team('Bears'), make_team('Wolves'), 3, 1)
+        drift(score, final_score_team1=7)
+
+        output = audit()
+
+        assert f"Score {score.pk}: stored 7-0, scoring events 2-0" in output
+        assert str(consistent.pk) not in output
+        assert "Found 1 mismatched score(s)" in output
+        score.refresh_from_db()
+        assert score.final_score_team1 == 7
+
+    def test_fix_recalculates_in_chunks(
+        self, sport_event, make_team, make_game, django_capture_on_commit_callbacks
+    ):
+        """
+        Test that --fix repairs every chunk and logs the changes
+        """
+        scores = []
+        for index in range(3):
+            home, away = make_team(f'Home {index}'), make_team(f'Away {index}')
+            score = make_game(home, away, 0, 0)
+            ScoreDetail.objects.create(score=score, team=away, points=1, minute=5, time_occurred=time(15, 5))
+            drift(score, final_score_team1=2, final_score_team2=0, winner=home, is_draw=False)
+            scores.append(score)
+        versions = {score.pk: Score.objects.get(pk=score.pk).version for score in scores}
+        ScoreChange.objects.all().delete()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            output = audit(fix=True, chunk_size=2)
+
+        assert "Fixed 3 score(s) in 1 sport event(s)" in output
+        for score in Score.objects.filter(pk__in=versions):
+            assert (score.final_score_team1, score.final_score_team2) == (0, 1)
+            assert score.winner_id == score.team2_id and not score.is_draw
+            assert score.version == versions[score.pk] + 1
+        assert ScoreChange.objects.filter(kind='score').count() == 3
+        assert "Found 0 mismatched score(s)" in audit()
+
+    def test_fix_refreshes_leaderboard(self, sport_event, make_team, make_game):
+        """
+        Test that the stored leaderboard follows the repaired totals
+        """
+        eagles, falcons = make_team('Eagles'), make_team('Falcons')
+        score = make_game(eagles, falcons, 0, 0)
+        ScoreDetail.objects.create(score=score, team=falcons, points=1, minute=5, time_occurred=time(15, 5))
+        drift(score, final_score_team1=2, final_score_team2=0, winner=eagles, is_draw=False)
+        recalculate_leaderboard(Leaderboard.objects.get(sport_event=sport_event))
+        assert LeaderboardEntry.objects.get(leaderboard__sport_event=sport_event, team=falcons).lost == 1
+
+        audit(fix=True)
+
+        entry = LeaderboardEntry.objects.get(leaderboard__sport_event=sport_event, team=falcons)
+        assert (entry.won, entry.goals_for) == (1, 1)
+        assert LeaderboardEntry.objects.get(leaderboard__sport_event=sport_event, team=eagles).lost == 1
+        assert not DirtyLeaderboard.objects.exists()
+
+    def test_fix_queues_leaderboard_when_deferred(self, settings, sport_event, make_team, make_game):
+        """
+        Test that in deferred mode the leaderboard is queued for recalculation instead
+        """
+        eagles, falcons = make_team('Eagles'), make_team('Falcons')
+        score = make_game(eagles, falcons, 0, 0)
+        ScoreDetail.objects.create(score=score, team=falcons, points=1, minute=5, time_occurred=time(15, 5))
+        drift(score, final_score_team1=2, final_score_team2=0)
+        settings.LEADERBOARD_UPDATE_MODE = 'deferred'
+
+        audit(fix=True)
+
+        assert DirtyLeaderboard.objects.filter(sport_event=sport_event).exists()
@@ -0,0 +1,142 @@
+from datetime import time
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from games.models import GameTeam
+from scores.models import ScoreDetail
+
+pytestmark = pytest.mark.scores  # Mark all tests in this file as scores tests
+
+
+def start_game(make_team, make_game, home, away, event=None):
+    """
+    Create an in-progress game between two new teams
+    """
+    score = make_game(make_team(home), make_team(away), event=event)
+    score.status = 'in_progress'
+    score.save()
+    return score
+
+
+@pytest.mark.django_db
+class TestScoreResponseCache:
+    """
+    Tag-invalidated public score cache tests
+    """
+
+    def test_repeated_reads_are_served_from_cache(
+        self, api_client, locmem_cache, make_team, make_game, django_assert_num_queries
+    ):
+        """
+        Test that an unchanged live list is served without queries
+        """
+        start_game(make_team, make_game, 'Eagles', 'Falcons')
+        url = reverse('scores:score-live-scores')
+
+        first = api_client.get(url)
+        with django_assert_num_queries(0):
+            second = api_client.get(url)
+
+        assert second.status_code == status.HTTP_200_OK
+        assert second.data == first.data
+
+    def test_writes_invalidate_dependent_responses(
+        self, api_client, locmem_cache, make_team, make_game, django_capture_on_commit_callbacks
+    ):
+        """
+        Test that scoring events, score edits and team changes refresh cached responses
+        """
+        score = start_game(make_team, make_game, 'Eagles', 'Falcons')
+        live_url = reverse('scores:score-live-scores')
+        detail_url = reverse('scores:score-detail', args=[score.id])
+        api_client.get(live_url)
+        api_client.get(detail_url)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            ScoreDetail.objects.create(score=score, team=score.team1, points=1, minute=3, time_occurred=time(15, 3))
+        assert api_client.get(live_url).data[0]['final_score_team1'] == 1
+        assert len(api_client.get(detail_url).data['score_details']) == 1
+
+        with django_capture_on_commit_callbacks(execute=True):
+            score.time_elapsed = '45+2'
+            score.save()
+        assert api_client.get(live_url).data[0]['time_elapsed'] == '45+2'
+
+        with django_capture_on_commit_callbacks(execute=True):
+            GameTeam.objects.filter(game=score.game, designation='home').update(designation='team_a')
+            GameTeam.objects.get(game=score.game, designation='team_a').save()
+        assert api_client.get(detail_url).data['team1_name'] == 'Eagles'
+
+    def test_invalidation_waits_for_commit(
+        self, api_client, locmem_cache, make_team, make_game, django_capture_on_commit_callbacks
+    ):
+        """
+        Test that cached responses stay valid until the write commits
+        """
+        score = start_game(make_team, make_game, 'Eagles', 'Falcons')
+        url = reverse('scores:score-live-scores')
+        api_client.get(url)
+
+        with django_capture_on_commit_callbacks() as callbacks:
+            ScoreDetail.objects.create(score=score, team=score.team1, points=1, minute=3, time_occurred=time(15, 3))
+            assert api_client.get(url).data[0]['final_score_team1'] == 0
+
+        for callback in callbacks:
+            callback()
+        assert api_client.get(url).data[0]['final_score_team1'] == 1
+
+    def test_renames_invalidate_dependent_responses(
+        self, api_client, locmem_cache, make_team, make_game, make_player, make_score_event,
+        django_capture_on_commit_callbacks
+    ):
+        """
+        Test that renaming a team or a scoring player refreshes cached responses
+        """
+        score = start_game(make_team, make_game, 'Eagles', 'Falcons')
+        player = make_player(score.team1, 'John')
+        make_score_event(score, score.team1, player=player)
+        url = reverse('scores:score-detail', args=[score.id])
+        api_client.get(url)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            team = score.team1
+            team.name = 'Golden Eagles'
+            team.save()
+        assert api_client.get(url).data['team1_name'] == 'Golden Eagles'
+
+        with django_capture_on_commit_callbacks(execute=True):
+            player.first_name = 'Jonathan'
+            player.save()
+        assert api_client.get(url).data['score_details'][0]['player_name'].startswith('Jonathan')
+
+    def test_sport_event_lists_are_invalidated_precisely(
+        self, api_client, locmem_cache, sport_event, make_team, make_game, django_assert_num_queries,
+        django_capture_on_commit_callbacks
+    ):
+        """
+        Test that a write only invalidates lists of its own sport event
+        """
+        from events.models import SportEvent
+
+        other_event = SportEvent.objects.create(
+            event=sport_event.event,
+            sport_type='basketball',
+            name='Basketball Cup',
+            start_date=sport_event.start_date,
+            end_date=sport_event.end_date,
+            registration_deadline=sport_event.registration_deadline,
+            created_by=sport_event.created_by
+        )
+        start_game(make_team, make_game, 'Eagles', 'Falcons')
+        other = start_game(make_team, make_game, 'Hawks', 'Owls', event=other_event)
+        url = reverse('scores:score-live-scores')
+        api_client.get(url, {'sport_event': sport_event.id})
+
+        with django_capture_on_commit_callbacks(execute=True):
+            ScoreDetail.objects.create(score=other, team=other.team1, points=1, minute=3, time_occurred=time(15, 3))
+
+        with django_assert_num_queries(0):
+            assert api_client.get(url, {'sport_event': sport_event.id}).status_code == status.HTTP_200_OK
+        assert api_client.get(url, {'sport_event': other_event.id}).data[0]['final_score_team1'] == 1
@@ -0,0 +1,157 @@
+from datetime import timedelta
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from scores.models import ScoreChange
+
+pytestmark = pytest.mark.scores  # Mark all tests in this file as scores tests
+
+
+@pytest.mark.django_db
+class TestScoreSync:
+    """
+    Score version and delta sync tests
+    """
+
+    def test_version_follows_score_and_detail_writes(self, make_team, make_game, make_score_event):
+        """
+        Test that score saves and scoring event writes each bump the version
+        """
+        eagles, falcons = make_team('Eagles'), make_team('Falcons')
+        score = make_game(eagles, falcons)
+        created = score.version
+
+        goal = make_score_event(score, eagles)
+        score.refresh_from_db()
+        after_goal = score.version
+        goal.delete()
+        score.refresh_from_db()
+
+        assert 0 < created < after_goal < score.version
+
+    def test_changes_since_cursor_are_compact(
+        self, api_client, make_team, make_game, make_score_event, django_capture_on_commit_callbacks
+    ):
+        """
+        Test that only scores and events changed after the cursor are returned, once each
+        """
+        eagles, falcons = make_team('Eagles'), make_team('Falcons')
+        with django_capture_on_commit_callbacks(execute=True):
+            quiet = make_game(make_team('Hawks'), make_team('Owls'))
+            score = make_game(eagles, falcons)
+        url = reverse('scores:score-changes')
+
+        full = api_client.get(url).data
+        assert {row['id'] for row in full['scores']} == {quiet.id, score.id}
+        cursor = full['cursor']
+
+        with django_capture_on_commit_callbacks(execute=True):
+            first = make_score_event(score, eagles, minute=5)
+            second = make_score_event(score, falcons, minute=20)
+            first_id = first.id
+            first.delete()
+
+        response = api_client.get(url, {'since': cursor})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [row['id'] for row in response.data['scores']] == [score.id]
+        assert response.data['scores'][0]['final_score_team2'] == 1
+        assert [row['id'] for row in response.data['details']] == [second.id]
+        assert response.data['deleted_details'] == [str(first_id)]
+        assert response.data['cursor'] > cursor and not response.data['more']
+
+        unchanged = api_client.get(url, {'since': response.data['cursor']}).data
+        assert unchanged['scores'] == [] and unchanged['cursor'] == response.data['cursor']
+
+    def test_paging_and_expired_cursors(
+        self, api_client, make_team, make_game, make_score_event, django_capture_on_commit_callbacks
+    ):
+        """
+        Test that limits page through the log and pruned cursors return 410
+        """
+        eagles, falcons = make_team('Eagles'), make_team('Falcons')
+        with django_capture_on_commit_callbacks(execute=True):
+            score = make_game(eagles, falcons)
+        cursor = ScoreChange.objects.order_by('-id').first().id
+        with django_capture_on_commit_callbacks(execute=True):
+            for minute in range(3):
+                make_score_event(score, eagles, minute=minute)
+        url = reverse('scores:score-changes')
+
+        page = api_client.get(url, {'since': cursor, 'limit': 2}).data
+        assert page['more'] and len(page['details']) == 2
+        page = api_client.get(url, {'since': page['cursor'], 'limit': 2}).data
+        assert not page['more'] and len(page['details']) == 1
+
+        ScoreChange.objects.filter(id__lte=cursor + 2).delete()
+        assert api_client.get(url, {'since': cursor}).status_code == status.HTTP_410_GONE
+        assert api_client.get(url, {'since': 'x'}).status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_cursor_waits_for_changes_to_settle(
+        self, api_client, settings, make_team, make_game, make_score_event, django_capture_on_commit_callbacks
+    ):
+        """
+        Test that recent changes, whose lower ids may still be uninserted, are held back
+        """
+        eagles, falcons = make_team('Eagles'), make_team('Falcons')
+        with django_capture_on_commit_callbacks(execute=True):
+            score = make_game(eagles, falcons)
+        url = reverse('scores:score-changes')
+        settings.SCORE_CHANGE_SETTLE_SECONDS = 60
+        ScoreChange.objects.update(created_at=timezone.now() - timedelta(minutes=1))
+        cursor = api_client.get(url).data['cursor']
+        assert cursor == ScoreChange.objects.order_by('-id').first().id
+
+        with django_capture_on_commit_callbacks(execute=True):
+            goal = make_score_event(score, eagles)
+        pending = api_client.get(url, {'since': cursor}).data
+        assert pending['details'] == [] and pending['cursor'] == cursor
+        assert api_client.get(url).data['cursor'] == cursor
+
+        ScoreChange.objects.filter(id__gt=cursor).update(created_at=timezone.now() - timedelta(minutes=1))
+        settled = api_client.get(url, {'since': cursor}).data
+        assert [row['id'] for row in settled['details']] == [goal.id]
+        assert settled['cursor'] > cursor
+
+    def test_changes_are_logged_on_commit(self, make_team, make_game, django_capture_on_commit_callbacks):
+        """
+        Test that changes are only logged once their transaction commits
+        """
+        eagles, falcons = make_team('Eagles'), make_team('Falcons')
+        score = make_game(eagles, falcons)
+        changes = ScoreChange.objects.count()
+
+        with django_capture_on_commit_callbacks() as callbacks:
+            score.time_elapsed = '10'
+            score.save()
+            assert ScoreChange.objects.count() == changes
+
+        for callback in callbacks:
+            callback()
+        assert ScoreChange.objects.filter(kind='score').last().payload['time_elapsed'] == '10'
+
+    def test_deleted_scores_are_tombstoned(
+        self, api_client, make_team, make_game, make_score_event, django_capture_on_commit_callbacks
+    ):
+        """
+        Test that deleting a game logs a tombstone for its score that outlives the game
+        """
+        eagles, falcons = make_team('Eagles'), make_team('Falcons')
+        with django_capture_on_commit_callbacks(execute=True):
+            score = make_game(eagles, falcons)
+            make_score_event(score, eagles)
+        url = reverse('scores:score-changes')
+        cursor = api_client.get(url).data['cursor']
+        score_id, game_id, sport_event_id = score.pk, score.game_id, score.game.sport_event_id
+
+        with django_capture_on_commit_callbacks(execute=True):
+            score.game.delete()
+
+        tombstone = ScoreChange.objects.get(kind='score_deleted')
+        assert (tombstone.score_id, tombstone.game_id, tombstone.sport_event_id) == (score_id, game_id, sport_event_id)
+        assert ScoreChange.objects.filter(score_id=score_id).count() > 1
+        response = api_client.get(url, {'since': cursor, 'sport_event': sport_event_id}).data
+        assert response['deleted_scores'] == [str(score_id)] and response['scores'] == []
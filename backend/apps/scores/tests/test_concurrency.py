@@ -0,0 +1,121 @@
+from datetime import time
+
+import pytest
+from django.db import connection
+from django.db.models import F
+from django.urls import reverse
+from rest_framework import status
+
+from scores.models import Score, ScoreDetail, VersionConflict
+
+pytestmark = pytest.mark.scores  # Mark all tests in this file as scores tests
+
+
+@pytest.mark.django_db
+class TestOptimisticConcurrency:
+    """
+    Version-checked score and scoring event update tests
+    """
+
+    def test_if_match_guards_score_updates(self, admin_client, make_team, make_game):
+        """
+        Test that a PATCH based on an old version returns 412 with the current state
+        """
+        score = make_game(make_team('Eagles'), make_team('Falcons'))
+        url = reverse('scores:score-detail', args=[score.id])
+        seen = admin_client.get(url)['ETag']
+        assert seen == f'"{score.version}"'
+
+        first = admin_client.patch(url, {'time_elapsed': '10'}, format='json', HTTP_IF_MATCH=seen)
+        second = admin_client.patch(url, {'time_elapsed': '12'}, format='json', HTTP_IF_MATCH=seen)
+
+        assert first.status_code == status.HTTP_200_OK
+        assert first['ETag'] == f'"{score.version + 1}"'
+        assert second.status_code == status.HTTP_412_PRECONDITION_FAILED
+        assert second.data['current']['time_elapsed'] == '10'
+        assert second['ETag'] == first['ETag']
+        assert admin_client.patch(
+            url, {'time_elapsed': '12'}, format='json', HTTP_IF_MATCH=first['ETag']
+        ).status_code == status.HTTP_200_OK
+
+    def test_save_is_a_compare_and_swap(self, make_team, make_game):
+        """
+        Test that a write landing after a record was read makes the version-checked save fail
+        """
+        eagles, falcons = make_team('Eagles'), make_team('Falcons')
+        score = make_game(eagles, falcons)
+        stale = Score.objects.get(pk=score.pk)
+
+        ScoreDetail.objects.create(score=score, team=eagles, points=1, minute=3, time_occurred=time(15, 3))
+        stale.final_score_team1 = 5
+        stale.expect_version(stale.version)
+
+        with pytest.raises(VersionConflict):
+            stale.save()
+        score.refresh_from_db()
+        assert score.final_score_team1 == 1
+
+    def test_if_match_guards_score_detail_updates(self, admin_client, make_team, make_game):
+        """
+        Test that scoring event updates are version-checked as well
+        """
+        eagles, falcons = make_team('Eagles'), make_team('Falcons')
+        score = make_game(eagles, falcons)
+        detail = ScoreDetail.objects.create(score=score, team=eagles, points=1, minute=3, time_occurred=time(15, 3))
+        url = reverse('scores:score-detail-detail', args=[detail.id])
+        seen = admin_client.get(url)['ETag']
+
+        ScoreDetail.objects.get(pk=detail.pk).save()
+        response = admin_client.patch(url, {'minute': 4}, format='json', HTTP_IF_MATCH=seen)
+
+        assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
+        assert response.data['current']['version'] == detail.version + 1
+        detail.refresh_from_db()
+        assert detail.minute == 3
+
+    def test_stale_saves_never_reuse_a_version(self, make_team, make_game):
+        """
+        Test that saves from an instance read before a version-checked save move past its version
+        """
+        eagles, falcons = make_team('Eagles'), make_team('Falcons')
+        score = make_game(eagles, falcons)
+        stale = Score.objects.get(pk=score.pk)
+
+        fresh = Score.objects.get(pk=score.pk)
+        fresh.time_elapsed = '10'
+        fresh.expect_version(fresh.version)
+        fresh.save()
+
+        ScoreDetail.objects.create(score=stale, team=eagles, points=1, minute=3, time_occurred=time(15, 3))
+        stored = Score.objects.get(pk=score.pk)
+        assert stored.version == fresh.version + 1
+        assert stored.time_elapsed == '10'
+
+        stale.save()
+        assert stale.version == Score.objects.get(pk=score.pk).version == fresh.version + 2
+
+    def test_recalculation_retries_after_a_concurrent_write(self, make_team, make_game, make_score_event):
+        """
+        Test that totals read before another writer moved the score on are read again, not written
+        """
+        eagles, falcons = make_team('Eagles'), make_team('Falcons')
+        score = make_game(eagles, falcons)
+        detail = make_score_event(score, eagles)
+        version = Score.objects.get(pk=score.pk).version
+        reads = []
+
+        def concurrent_writer(execute, sql, params, many, context):
+            result = execute(sql, params, many, context)
+            if sql.startswith('SELECT') and 'team1_total' in sql and not reads:
+                # Another scoring event is recorded right after the totals were read
+                reads.append(sql)
+                ScoreDetail.objects.filter(pk=detail.pk).update(points=2)
+                Score.objects.filter(pk=score.pk).update(version=F('version') + 1)
+            return result
+
+        with connection.execute_wrapper(concurrent_writer):
+            detail.update_parent_score()
+
+        stored = Score.objects.get(pk=score.pk)
+        assert stored.final_score_team1 == 2
+        assert stored.version == version + 2 == detail.score.version
@@ -0,0 +1,195 @@
+import json
+import threading
+from datetime import timedelta
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from scores.live import ChangeFeed, stream_changes
+from scores.models import ScoreChange
+
+pytestmark = pytest.mark.scores  # Mark all tests in this file as scores tests
+
+
+def parse_event(message):
+    """
+    Return the id, kind and payload of a Server-Sent Events message
+    """
+    lines = dict(line.split(': ', 1) for line in message.strip().split('\n'))
+    return int(lines['id']), lines['event'], json.loads(lines['data'])
+
+
+@pytest.fixture
+def other_sport_event(sport_event, make_sport_event):
+    """
+    A second sport event of the same event
+    """
+    return make_sport_event('Basketball Cup', 'basketball', event=sport_event.event)
+
+
+@pytest.fixture
+def live_settings(settings):
+    """
+    Short stream timings for tests
+    """
+    settings.LIVE_SCORE_STREAM_SECONDS = 0.2
+    settings.LIVE_SCORE_HEARTBEAT_SECONDS = 0.05
+    return settings
+
+
+@pytest.mark.django_db
+class TestScoreChangeLog:
+    """
+    Score change log tests
+    """
+
+    def test_detail_writes_are_logged_with_new_totals(
+        self, make_team, make_game, make_score_event, django_capture_on_commit_callbacks
+    ):
+        """
+        Test that scoring events are logged once each, carrying the score totals
+        """
+        eagles, falcons = make_team('Eagles'), make_team('Falcons')
+        with django_capture_on_commit_callbacks(execute=True):
+            score = make_game(eagles, falcons)
+        start = ScoreChange.objects.order_by('-id').first().id
+
+        with django_capture_on_commit_callbacks(execute=True):
+            goal = make_score_event(score, eagles)
+            goal.delete()
+
+        changes = list(ScoreChange.objects.filter(id__gt=start))
+        assert [change.kind for change in changes] == ['detail', 'detail_deleted']
+        assert changes[0].payload['final_score_team1'] == 1
+        assert changes[1].payload['final_score_team1'] == 0
+        assert changes[0].detail_id == changes[1].detail_id
+
+
+@pytest.mark.django_db
+class TestLiveStream:
+    """
+    Live score stream tests
+    """
+
+    def test_feed_polls_once_for_all_subscribers(
+        self, make_team, make_game, django_assert_num_queries, make_score_event,
+        django_capture_on_commit_callbacks
+    ):
+        """
+        Test that one poll delivers new changes to every subscriber
+        """
+        feed = ChangeFeed(autostart=False)
+        subscribers = [feed.subscribe() for _ in range(3)]
+        with django_capture_on_commit_callbacks(execute=True):
+            make_score_event(make_game(make_team('Eagles'), make_team('Falcons')), make_team('Hawks'))
+
+        with django_assert_num_queries(1):
+            assert feed.poll() > 0
+
+        batches = [subscriber.get_nowait() for subscriber in subscribers]
+        assert all(batch == batches[0] for batch in batches)
+
+    def test_stream_resumes_after_last_event_id(
+        self, live_settings, sport_event, other_sport_event, make_team, make_game, make_score_event,
+        django_capture_on_commit_callbacks
+    ):
+        """
+        Test that missed changes of the sport event are replayed, then new ones follow
+        """
+        eagles, falcons = make_team('Eagles'), make_team('Falcons')
+        with django_capture_on_commit_callbacks(execute=True):
+            score = make_game(eagles, falcons)
+            other = make_game(make_team('Hawks'), make_team('Owls'), event=other_sport_event)
+        last_seen = ScoreChange.objects.order_by('-id').first().id
+        with django_capture_on_commit_callbacks(execute=True):
+            make_score_event(score, eagles, minute=5)
+            make_score_event(other, other.game.game_teams.first().team, minute=6)
+
+        feed = ChangeFeed(autostart=False)
+        stream = stream_changes(feed, last_seen, str(sport_event.id))
+        assert next(stream).startswith('retry:')
+
+        change_id, kind, payload = parse_event(next(stream))
+        assert change_id > last_seen and kind == 'detail'
+        assert payload['final_score_team1'] == 1
+
+        with django_capture_on_commit_callbacks(execute=True):
+            make_score_event(score, falcons, minute=7)
+        feed.poll()
+        change_id, kind, payload = parse_event(next(stream))
+        assert payload['final_score_team2'] == 1
+
+        rest = list(stream)
+        assert rest and all(message == ': heartbeat\n\n' for message in rest)
+
+    def test_endpoint_streams_events(self, api_client):
+        """
+        Test that the endpoint answers with an event stream and validates the event id
+        """
+        url = reverse('scores:score-live-stream')
+
+        response = api_client.get(url, HTTP_ACCEPT='text/event-stream')
+        assert response.status_code == status.HTTP_200_OK
+        assert response['Content-Type'] == 'text/event-stream'
+        assert response.streaming
+        response.close()
+
+        response = api_client.get(url, HTTP_LAST_EVENT_ID='abc')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_feed_reads_settled_changes_in_bounded_batches(
+        self, settings, make_team, make_game, make_score_event, django_capture_on_commit_callbacks
+    ):
+        """
+        Test that polls skip changes that may not be settled yet and read at most the poll limit
+        """
+        eagles, falcons = make_team('Eagles'), make_team('Falcons')
+        score = make_game(eagles, falcons)
+        feed = ChangeFeed(autostart=False)
+        subscriber = feed.subscribe()
+        with django_capture_on_commit_callbacks(execute=True):
+            for minute in range(3):
+                make_score_event(score, eagles, minute=minute)
+
+        settings.SCORE_CHANGE_SETTLE_SECONDS = 60
+        assert feed.poll() == 0
+        assert feed.last_id == subscriber.start_id
+
+        ScoreChange.objects.filter(id__gt=feed.last_id).update(created_at=timezone.now() - timedelta(minutes=1))
+        settings.LIVE_SCORE_POLL_LIMIT = 2
+        assert feed.poll() == 2
+        assert feed.poll() == 1
+        batches = [subscriber.get_nowait(), subscriber.get_nowait()]
+        assert [len(batch) for batch in batches] == [2, 1]
+
+    def test_subscribing_while_the_thread_exits_starts_a_new_one(self, monkeypatch):
+        """
+        Test that a stream subscribing while the polling thread is shutting down gets a new thread
+        """
+        exiting, release = threading.Event(), threading.Event()
+
+        def close_old_connections():
+            exiting.set()
+            release.wait(5)
+
+        monkeypatch.setattr('scores.live.close_old_connections', close_old_connections)
+        feed = ChangeFeed(poll_interval=0.01)
+        monkeypatch.setattr(feed, 'poll', lambda: 0)
+
+        subscriber = feed.subscribe()
+        first = feed._thread
+        feed.unsubscribe(subscriber)
+        assert exiting.wait(5)
+        assert feed._thread is None and first.is_alive()
+
+        subscriber = feed.subscribe()
+        second = feed._thread
+        assert second is not first and second.is_alive()
+
+        feed.unsubscribe(subscriber)
+        release.set()
+        first.join(5)
+        second.join(5)
+        assert feed._thread is None
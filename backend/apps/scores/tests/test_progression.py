@@ -0,0 +1,50 @@
+from datetime import time
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from scores.models import ScoreDetail
+
+pytestmark = pytest.mark.scores  # Mark all tests in this file as scores tests
+
+
+@pytest.mark.django_db
+class TestScoreProgression:
+    """
+    Running scoreline tests
+    """
+
+    def test_series_accumulates_in_order(self, api_client, make_team, make_game, django_assert_num_queries):
+        """
+        Test that each scoring event carries both running totals, read in one query
+        """
+        eagles, falcons = make_team('Eagles'), make_team('Falcons')
+        score = make_game(eagles, falcons)
+        ScoreDetail.objects.create(score=score, team=falcons, points=3, minute=40, time_occurred=time(15, 40))
+        ScoreDetail.objects.create(score=score, team=eagles, points=2, minute=5, time_occurred=time(15, 5))
+        ScoreDetail.objects.create(score=score, team=eagles, points=1, minute=40, time_occurred=time(15, 40))
+
+        with django_assert_num_queries(2):
+            response = api_client.get(reverse('scores:score-progression', args=[score.id]))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['team1_name'] == 'Eagles'
+        assert [
+            (row['minute'], row['team1_score'], row['team2_score']) for row in response.data['series']
+        ] == [(5, 2, 0), (40, 2, 3), (40, 3, 3)]
+
+    def test_series_is_cached_per_version(self, api_client, locmem_cache, make_team, make_game, django_assert_num_queries):
+        """
+        Test that the series is served from cache until the score changes
+        """
+        eagles, falcons = make_team('Eagles'), make_team('Falcons')
+        score = make_game(eagles, falcons)
+        url = reverse('scores:score-progression', args=[score.id])
+        api_client.get(url)
+
+        with django_assert_num_queries(1):
+            assert api_client.get(url).data['series'] == []
+
+        ScoreDetail.objects.create(score=score, team=falcons, points=1, minute=12, time_occurred=time(15, 12))
+        assert api_client.get(url).data['series'][0]['team2_score'] == 1
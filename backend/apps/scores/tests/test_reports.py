@@ -0,0 +1,91 @@
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from scores.models import MatchReport, Score
+
+pytestmark = pytest.mark.scores  # Mark all tests in this file as scores tests
+
+
+@pytest.mark.django_db
+class TestMatchReport:
+    """
+    Frozen match report tests
+    """
+
+    def test_report_is_frozen_at_verification(
+        self, api_client, make_team, make_game, make_player, django_assert_max_num_queries, make_score_event
+    ):
+        """
+        Test that verifying a score freezes its report, which the detail endpoint serves
+        """
+        eagles, falcons = make_team('Eagles'), make_team('Falcons')
+        striker, winger = make_player(eagles, 'Sam'), make_player(eagles, 'Alex')
+        keeper = make_player(falcons, 'Jo')
+        score = make_game(eagles, falcons)
+        make_score_event(score, eagles, striker, minute=10, assisted_by=winger)
+        make_score_event(score, falcons, keeper, minute=20)
+        make_score_event(score, eagles, striker, minute=30)
+        Score.objects.filter(pk=score.pk).update(status='completed')
+        assert not MatchReport.objects.exists()
+
+        score.refresh_from_db()
+        score.verification_status = 'verified'
+        score.save()
+        report = MatchReport.objects.get(score=score)
+
+        assert report.score_version == score.version
+        assert [row['player_name'] for row in report.data['scorers']] == ['Sam Player', 'Jo Player']
+        assert report.data['scorers'][0]['points'] == 2
+        assert report.data['assists'] == [{
+            'player': str(winger.id), 'player_name': 'Alex Player',
+            'team': str(eagles.id), 'team_name': 'Eagles', 'assists': 1
+        }]
+        assert [(row['team_name'], row['points'], row['events']) for row in report.data['totals']] == [
+            ('Eagles', 2, {'goal': 2}), ('Falcons', 1, {'goal': 1})
+        ]
+
+        with django_assert_max_num_queries(1):
+            response = api_client.get(reverse('scores:score-detail', args=[score.id]))
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == report.data
+        assert [row['minute'] for row in response.data['score_details']] == [10, 20, 30]
+
+    def test_report_follows_corrections_and_reopening(
+        self, api_client, make_team, make_game, make_player, make_score_event
+    ):
+        """
+        Test that a corrected score gets a new report and a reopened one is served live
+        """
+        eagles, falcons = make_team('Eagles'), make_team('Falcons')
+        score = make_game(eagles, falcons, 0, 0)
+        url = reverse('scores:score-detail', args=[score.id])
+        assert api_client.get(url).data['totals'][0]['points'] == 0
+
+        make_score_event(score, eagles, make_player(eagles, 'Sam'), minute=15)
+        report = MatchReport.objects.get(score=score)
+        score.refresh_from_db()
+        assert report.score_version == score.version
+        assert api_client.get(url).data['scorers'][0]['player_name'] == 'Sam Player'
+
+        score.verification_status = 'disputed'
+        score.save()
+        response = api_client.get(url)
+        assert response.data['verification_status'] == 'disputed'
+        assert 'scorers' not in response.data
+
+    def test_bulk_verification_generates_reports(self, admin_client, make_team, make_game):
+        """
+        Test that scores verified in bulk get their reports
+        """
+        scores = [make_game(make_team(f'Home {index}'), make_team(f'Away {index}'), 1, 0) for index in range(3)]
+        Score.objects.filter(pk__in=[score.pk for score in scores]).update(verification_status='pending_verification')
+        MatchReport.objects.all().delete()
+
+        admin_client.post(
+            reverse('scores:score-verify-bulk'), {'scores': [str(score.id) for score in scores]}, format='json'
+        )
+
+        reports = MatchReport.objects.select_related('score')
+        assert len(reports) == 3
+        assert all(report.is_current(report.score) for report in reports)
@@ -0,0 +1,296 @@
+import uuid
+from datetime import time
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from leaderboards.models import PlayerLeaderboardEntry
+from scores.models import Score, ScoreChange, ScoreDetail
+from utils.pagination import encode_cursor
+
+pytestmark = pytest.mark.scores  # Mark all tests in this file as scores tests
+
+
+@pytest.mark.django_db
+class TestParentScoreRecalculation:
+    """
+    Score detail to parent score synchronisation tests
+    """
+
+    def test_totals_and_winner_follow_details(self, make_team, make_game, make_score_event):
+        """
+        Test that creating, editing and deleting details keeps totals and winner in sync
+        """
+        eagles, falcons = make_team('Eagles'), make_team('Falcons')
+        score = make_game(eagles, falcons)
+
+        make_score_event(score, eagles, minute=5)
+        late = make_score_event(score, falcons, minute=80)
+        score.refresh_from_db()
+        assert (score.final_score_team1, score.final_score_team2, score.is_draw) == (1, 1, True)
+        assert score.winner is None
+
+        late.points = 2
+        late.save()
+        score.refresh_from_db()
+        assert (score.final_score_team1, score.final_score_team2) == (1, 2)
+        assert score.winner == falcons and not score.is_draw
+
+        late.delete()
+        score.refresh_from_db()
+        assert (score.final_score_team1, score.final_score_team2) == (1, 0)
+        assert score.winner == eagles
+
+    def test_cards_carry_no_points(self, admin_client, make_team, make_game):
+        """
+        Test that cards are recorded without points and cannot be given any
+        """
+        eagles, falcons = make_team('Eagles'), make_team('Falcons')
+        score = make_game(eagles, falcons)
+        url = reverse('scores:score-detail-list')
+        card = {'score': str(score.id), 'team': str(eagles.id), 'event_type': 'yellow_card', 'time_occurred': '00:12:00'}
+
+        recorded = admin_client.post(url, card, format='json')
+        rejected = admin_client.post(url, {**card, 'points': 2}, format='json')
+
+        assert recorded.status_code == status.HTTP_201_CREATED and recorded.data['points'] == 0
+        assert rejected.status_code == status.HTTP_400_BAD_REQUEST and 'points' in rejected.data
+        score.refresh_from_db()
+        assert (score.final_score_team1, score.final_score_team2) == (0, 0)
+
+    def test_queryset_deletes_update_the_score(
+        self, make_team, make_game, make_score_event, django_capture_on_commit_callbacks
+    ):
+        """
+        Test that bulk deleting details recalculates the score and logs each deletion
+        """
+        eagles, falcons = make_team('Eagles'), make_team('Falcons')
+        score = make_game(eagles, falcons)
+        make_score_event(score, eagles, minute=5)
+        goals = [make_score_event(score, falcons, minute=minute).pk for minute in (20, 30)]
+
+        with django_capture_on_commit_callbacks(execute=True):
+            ScoreDetail.objects.filter(pk__in=goals).delete()
+
+        score.refresh_from_db()
+        assert (score.final_score_team1, score.final_score_team2) == (1, 0)
+        assert score.winner == eagles
+        assert set(ScoreChange.objects.filter(kind='detail_deleted').values_list('detail_id', flat=True)) == set(goals)
+
+    def test_deleting_a_score_does_not_log_its_details(
+        self, make_team, make_game, make_score_event, django_capture_on_commit_callbacks
+    ):
+        """
+        Test that details removed along with their score are not recalculated or logged, the score is
+        """
+        eagles, falcons = make_team('Eagles'), make_team('Falcons')
+        score = make_game(eagles, falcons)
+        make_score_event(score, eagles)
+
+        score_id = score.pk
+
+        with django_capture_on_commit_callbacks(execute=True):
+            score.delete()
+
+        assert not ScoreChange.objects.filter(kind='detail_deleted').exists()
+        assert ScoreChange.objects.get(kind='score_deleted').score_id == score_id
+
+    def test_recalculation_takes_two_queries(self, make_team, make_game, django_assert_num_queries, make_score_event):
+        """
+        Test that updating the parent score aggregates and saves in two queries
+        """
+        eagles, falcons = make_team('Eagles'), make_team('Falcons')
+        score = make_game(eagles, falcons)
+        detail = make_score_event(score, eagles)
+        make_score_event(score, falcons, points=3)
+        detail = ScoreDetail.objects.select_related('score__game').get(pk=detail.pk)
+
+        with django_assert_num_queries(2):
+            detail.update_parent_score()
+
+        stored = Score.objects.get(pk=score.pk)
+        assert (stored.final_score_team1, stored.final_score_team2) == (1, 3)
+        assert stored.winner == falcons
+        assert stored.version == detail.score.version
+
+
+@pytest.mark.django_db
+class TestScoreDetailBatch:
+    """
+    Batch scoring event ingest tests
+    """
+
+    def test_batch_is_recorded_with_one_recalculation(self, admin_client, make_team, make_game, make_player):
+        """
+        Test that a batch inserts every event, returns the totals and credits players
+        """
+        eagles, falcons = make_team('Eagles'), make_team('Falcons')
+        ann = make_player(eagles, 'Ann')
+        score = make_game(eagles, falcons)
+        url = reverse('scores:score-score-detail-batch', kwargs={'score_pk': score.id})
+        events = [
+            {'team': str(eagles.id), 'player': str(ann.id), 'time_occurred': '00:05:00', 'minute': 5},
+            {'team': str(eagles.id), 'player': str(ann.id), 'time_occurred': '00:30:00', 'event_type': 'penalty'},
+            {'team': str(falcons.id), 'time_occurred': '00:50:00', 'points': 2},
+        ]
+
+        response = admin_client.post(url, events, format='json')
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert (response.data['final_score_team1'], response.data['final_score_team2']) == (2, 2)
+        assert response.data['is_draw'] and response.data['winner'] is None
+        assert len(response.data['details']) == 3
+        assert ScoreDetail.objects.filter(score=score).count() == 3
+        entry = PlayerLeaderboardEntry.objects.get(player=ann)
+        assert (entry.goals, entry.penalties, entry.points) == (2, 1, 2)
+
+    def test_invalid_items_reject_the_whole_batch(self, admin_client, make_team, make_game):
+        """
+        Test that errors are reported per item and nothing is recorded
+        """
+        eagles, falcons = make_team('Eagles'), make_team('Falcons')
+        score = make_game(eagles, falcons)
+        url = reverse('scores:score-score-detail-batch', kwargs={'score_pk': score.id})
+        events = [
+            {'team': str(eagles.id), 'time_occurred': '00:05:00'},
+            {'team': str(make_team('Hawks').id), 'time_occurred': '00:10:00'},
+            {'team': str(falcons.id), 'time_occurred': '00:15:00', 'points': 0},
+        ]
+
+        response = admin_client.post(url, events, format='json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert [error['index'] for error in response.data['errors']] == [1, 2]
+        assert 'team' in response.data['errors'][0]['errors']
+        assert not ScoreDetail.objects.filter(score=score).exists()
+        assert admin_client.post(url, [], format='json').status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_only_the_assigned_scorekeeper_may_post(self, scorekeeper_client, make_team, make_game):
+        """
+        Test that scorekeepers cannot record events for scores assigned to others
+        """
+        eagles, falcons = make_team('Eagles'), make_team('Falcons')
+        score = make_game(eagles, falcons)
+        url = reverse('scores:score-score-detail-batch', kwargs={'score_pk': score.id})
+
+        response = scorekeeper_client.post(url, [{'team': str(eagles.id), 'time_occurred': '00:05:00'}], format='json')
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.django_db
+class TestLatestScoreDetails:
+    """
+    Latest scoring events loader tests
+    """
+
+    def test_live_scores_take_two_queries(
+        self, api_client, make_team, make_game, make_player, django_assert_num_queries
+    ):
+        """
+        Test that live scores load the latest events of every game in one query
+        """
+        for index in range(3):
+            home, away = make_team(f'Home {index}'), make_team(f'Away {index}')
+            scorer = make_player(home, f'Scorer{index}')
+            score = make_game(home, away)
+            score.status = 'in_progress'
+            score.save()
+            for minute in range(7):
+                ScoreDetail.objects.create(
+                    score=score, team=home, player=scorer, points=1,
+                    minute=minute, time_occurred=time(15, minute)
+                )
+
+        with django_assert_num_queries(2):
+            response = api_client.get(reverse('scores:score-live-scores'))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data) == 3
+        for row in response.data:
+            assert [update['minute'] for update in row['score_updates']] == [6, 5, 4, 3, 2]
+            assert row['score_updates'][0]['player'].startswith('Scorer')
+            assert row['final_score_team1'] == 7
+
+
+@pytest.mark.django_db
+class TestScoreDetailTimeline:
+    """
+    Keyset pagination of scoring event timelines
+    """
+
+    def test_pages_are_stable_while_events_are_added(
+        self, admin_client, make_team, make_game, django_assert_num_queries, make_score_event
+    ):
+        """
+        Test that pages follow the event order without counting and newer links pick up new events
+        """
+        eagles, falcons = make_team('Eagles'), make_team('Falcons')
+        score = make_game(eagles, falcons)
+        other = make_game(make_team('Hawks'), make_team('Owls'))
+        make_score_event(other, other.team1, minute=1)
+        for minute in (30, 10, 20):
+            make_score_event(score, eagles, minute=minute)
+        url = reverse('scores:score-score-detail-list', kwargs={'score_pk': score.id})
+
+        first = admin_client.get(url, {'page_size': 2})
+        make_score_event(score, falcons, minute=5)
+        # The user, the score in the URL and the page: no COUNT(*)
+        with django_assert_num_queries(3):
+            second = admin_client.get(first.data['next'])
+
+        assert [row['minute'] for row in first.data['results']] == [10, 20]
+        assert [row['minute'] for row in second.data['results']] == [30]
+        assert second.data['next'] is None
+
+        make_score_event(score, falcons, minute=40)
+        newer = admin_client.get(second.data['newer'])
+        assert [row['minute'] for row in newer.data['results']] == [40]
+
+        by_score = admin_client.get(reverse('scores:score-detail-by-score', args=[score.id]))
+        assert [row['minute'] for row in by_score.data['results']] == [5, 10, 20, 30, 40]
+
+    def test_invalid_cursor_is_not_found(self, admin_client):
+        """
+        Test that a malformed cursor is rejected
+        """
+        url = reverse('scores:score-detail-list')
+
+        assert admin_client.get(url, {'cursor': 'x'}).status_code == status.HTTP_404_NOT_FOUND
+        assert admin_client.get(url, {'cursor': 'WyJ4IiwgInkiXQ=='}).status_code == status.HTTP_404_NOT_FOUND
+        mistyped = encode_cursor([1, timezone.now(), uuid.uuid4()])
+        assert admin_client.get(url, {'cursor': mistyped}).status_code == status.HTTP_404_NOT_FOUND
+
+    def test_ordering_falls_back_to_page_numbers(self, admin_client, make_team, make_game, make_score_event):
+        """
+        Test that clients choosing an ordering are paged by page number in that order
+        """
+        eagles, falcons = make_team('Eagles'), make_team('Falcons')
+        score = make_game(eagles, falcons)
+        for minute in (30, 10, 20):
+            make_score_event(score, eagles, minute=minute)
+        url = reverse('scores:score-detail-list')
+
+        response = admin_client.get(url, {'ordering': '-minute'})
+
+        assert response.data['count'] == 3
+        assert response.data['previous'] is None
+        assert [row['minute'] for row in response.data['results']] == [30, 20, 10]
+
+    def test_events_at_the_same_time_follow_recording_order(self, admin_client, make_team, make_game, make_score_event):
+        """
+        Test that events occurring at the same time are listed in the order they were recorded
+        """
+        eagles, falcons = make_team('Eagles'), make_team('Falcons')
+        score = make_game(eagles, falcons)
+        events = [make_score_event(score, eagles, minute=minute) for minute in (1, 2, 3, 4)]
+        ScoreDetail.objects.update(time_occurred=events[0].time_occurred)
+        url = reverse('scores:score-detail-list')
+
+        first = admin_client.get(url, {'page_size': 2})
+        second = admin_client.get(first.data['next'])
+
+        listed = [row['id'] for row in first.data['results'] + second.data['results']]
+        assert listed == [str(event.id) for event in events]
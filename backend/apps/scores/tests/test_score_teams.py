@@ -0,0 +1,99 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from games.models import GameTeam
+from leaderboards.models import LeaderboardEntry, LeaderboardResult
+from scores.models import Score, ScoreChange
+
+pytestmark = pytest.mark.scores  # Mark all tests in this file as scores tests
+
+
+@pytest.mark.django_db
+class TestScoreTeams:
+    """
+    Denormalized score sides tests
+    """
+
+    def test_sides_follow_game_team_writes(self, make_team, make_game):
+        """
+        Test that team1/team2 are set on creation and follow designation changes
+        """
+        eagles, falcons, hawks = make_team('Eagles'), make_team('Falcons'), make_team('Hawks')
+        score = make_game(eagles, falcons)
+        assert (score.team1, score.team2) == (eagles, falcons)
+
+        home = GameTeam.objects.get(game=score.game, team=eagles)
+        home.delete()
+        score.refresh_from_db()
+        assert score.team1 is None and score.team2 == falcons
+
+        GameTeam.objects.create(game=score.game, team=hawks, designation='team_a')
+        score.refresh_from_db()
+        assert score.team1 == hawks
+
+    def test_swapping_sides_is_a_versioned_correction(
+        self, sport_event, make_team, make_game, django_capture_on_commit_callbacks
+    ):
+        """
+        Test that swapping the designations moves the final scores with their teams, logs and keeps the table
+        """
+        eagles, falcons = make_team('Eagles'), make_team('Falcons')
+        score = make_game(eagles, falcons, 2, 1)
+        version = score.version
+        changes = ScoreChange.objects.count()
+        entries = LeaderboardEntry.objects.filter(leaderboard__sport_event=sport_event)
+
+        home = GameTeam.objects.get(game=score.game, team=eagles)
+        away = GameTeam.objects.get(game=score.game, team=falcons)
+        # Designations are unique per game, so the swap takes two writes
+        with django_capture_on_commit_callbacks(execute=True):
+            home.designation = 'team_b'
+            home.save()
+            away.designation = 'team_a'
+            away.save()
+
+        score.refresh_from_db()
+        assert (score.team1, score.team2) == (falcons, eagles)
+        assert (score.final_score_team1, score.final_score_team2) == (1, 2)
+        assert score.winner == eagles and not score.is_draw
+        assert score.version == version + 2
+        assert ScoreChange.objects.count() == changes + 2
+        assert dict(entries.values_list('team__name', 'points')) == {'Eagles': 3, 'Falcons': 0}
+        assert LeaderboardResult.objects.get(score=score).contribution[str(eagles.id)]['goals_for'] == 2
+
+    def test_winner_uses_the_stored_sides(self, make_team, make_game, django_assert_num_queries):
+        """
+        Test that determining the winner needs no queries once the sides are loaded
+        """
+        eagles, falcons = make_team('Eagles'), make_team('Falcons')
+        score = Score.objects.select_related('team1', 'team2').get(pk=make_game(eagles, falcons, 1, 2).pk)
+
+        with django_assert_num_queries(0):
+            assert score.determine_winner() == falcons
+
+    def test_score_pages_do_not_query_per_row(self, admin_client, make_team, make_game):
+        """
+        Test that listing scores costs the same queries for one or many games
+        """
+        url = reverse('scores:score-list')
+
+        def count_queries(path):
+            with CaptureQueriesContext(connection) as context:
+                response = admin_client.get(path)
+            assert response.status_code == status.HTTP_200_OK
+            return len(context.captured_queries)
+
+        make_game(make_team('Eagles'), make_team('Falcons'), 1, 0)
+        single = (count_queries(url), count_queries(reverse('scores:score-public-scores')))
+
+        for index in range(4):
+            make_game(make_team(f'Home {index}'), make_team(f'Away {index}'), 2, 2)
+        many = (count_queries(url), count_queries(reverse('scores:score-public-scores')))
+
+        assert many == single
+        rows = admin_client.get(url).json()
+        rows = rows.get('results', rows)
+        assert {row['team1_name'] for row in rows} >= {'Eagles', 'Home 0'}
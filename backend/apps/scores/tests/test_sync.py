@@ -0,0 +1,187 @@
+import uuid
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from scores.models import ScoreDetail, SyncOperation
+from scores.views import ScoreDetailViewSet
+
+pytestmark = pytest.mark.scores  # Mark all tests in this file as scores tests
+
+
+def create_goal(team, minute, client_id=None):
+    """
+    Return an operation recording a goal for a team
+    """
+    return {
+        'id': str(uuid.uuid4()),
+        'type': 'create_detail',
+        'data': {
+            'client_id': str(client_id or uuid.uuid4()),
+            'team': str(team.id),
+            'time_occurred': f'00:{minute:02d}:00',
+            'minute': minute
+        }
+    }
+
+
+@pytest.mark.django_db
+class TestScoreSyncReplay:
+    """
+    Offline scorekeeper sync tests
+    """
+
+    def test_replayed_batch_is_applied_once(self, admin_client, make_team, make_game):
+        """
+        Test that sending a batch again after a lost response changes nothing
+        """
+        eagles, falcons = make_team('Eagles'), make_team('Falcons')
+        score = make_game(eagles, falcons)
+        first = create_goal(eagles, 5)
+        operations = [
+            first,
+            create_goal(falcons, 12),
+            {'id': str(uuid.uuid4()), 'type': 'delete_detail', 'detail': first['data']['client_id']},
+            create_goal(eagles, 30),
+            {'id': str(uuid.uuid4()), 'type': 'update_score', 'data': {'time_elapsed': '31'}}
+        ]
+        url = reverse('scores:score-sync', args=[score.id])
+
+        response = admin_client.post(url, {'operations': operations}, format='json')
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data['applied']) == 5 and response.data['skipped'] == []
+        assert (response.data['score']['final_score_team1'], response.data['score']['final_score_team2']) == (1, 1)
+        assert response.data['score']['time_elapsed'] == '31'
+        version = response.data['score']['version']
+
+        replay = admin_client.post(url, {'operations': operations}, format='json')
+        assert replay.status_code == status.HTTP_200_OK
+        assert replay.data['applied'] == [] and len(replay.data['skipped']) == 5
+        assert replay.data['score']['version'] == version
+        assert ScoreDetail.objects.filter(score=score).count() == 2
+        assert SyncOperation.objects.filter(score=score).count() == 5
+
+    def test_score_is_recalculated_once_per_batch(self, admin_client, make_team, make_game):
+        """
+        Test that many scoring events bump the score version a bounded number of times
+        """
+        eagles, falcons = make_team('Eagles'), make_team('Falcons')
+        score = make_game(eagles, falcons)
+        before = score.version
+        operations = [create_goal(eagles, minute) for minute in range(10)]
+
+        response = admin_client.post(
+            reverse('scores:score-sync', args=[score.id]), {'operations': operations}, format='json'
+        )
+
+        assert response.data['score']['final_score_team1'] == 10
+        assert response.data['score']['version'] == before + 1
+
+    def test_invalid_operation_rolls_back_the_batch(self, admin_client, make_team, make_game):
+        """
+        Test that an invalid operation is reported by index and nothing is applied
+        """
+        eagles, falcons = make_team('Eagles'), make_team('Falcons')
+        score = make_game(eagles, falcons)
+        operations = [
+            create_goal(eagles, 5),
+            create_goal(make_team('Hawks'), 8),
+            {'id': str(uuid.uuid4()), 'type': 'update_score', 'data': {'final_score_team1': 9}}
+        ]
+
+        response = admin_client.post(
+            reverse('scores:score-sync', args=[score.id]), {'operations': operations}, format='json'
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data['errors'][0]['index'] == 1
+        assert not ScoreDetail.objects.filter(score=score).exists()
+        assert not SyncOperation.objects.exists()
+
+    def test_detail_create_is_idempotent_by_client_id(self, admin_client, make_team, make_game):
+        """
+        Test that a scoring event posted twice with its client ID is recorded once
+        """
+        eagles, falcons = make_team('Eagles'), make_team('Falcons')
+        score = make_game(eagles, falcons)
+        data = {**create_goal(eagles, 5)['data'], 'score': str(score.id)}
+        url = reverse('scores:score-detail-list')
+
+        created = admin_client.post(url, data, format='json')
+        repeated = admin_client.post(url, data, format='json')
+        batch = admin_client.post(
+            reverse('scores:score-score-detail-batch', kwargs={'score_pk': score.id}), [data], format='json'
+        )
+
+        assert created.status_code == status.HTTP_201_CREATED
+        assert repeated.status_code == status.HTTP_200_OK
+        assert repeated.data == created.data
+        assert batch.status_code == status.HTTP_201_CREATED and batch.data['details'] == []
+        assert ScoreDetail.objects.filter(score=score).count() == 1
+
+    def test_batch_records_a_repeated_client_id_once(self, admin_client, make_team, make_game):
+        """
+        Test that a scoring event repeated within one batch is recorded once
+        """
+        eagles, falcons = make_team('Eagles'), make_team('Falcons')
+        score = make_game(eagles, falcons)
+        data = create_goal(eagles, 5)['data']
+        url = reverse('scores:score-score-detail-batch', kwargs={'score_pk': score.id})
+
+        response = admin_client.post(url, [data, create_goal(falcons, 7)['data'], data], format='json')
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert len(response.data['details']) == 2
+        assert ScoreDetail.objects.filter(score=score, client_id=data['client_id']).count() == 1
+        score.refresh_from_db()
+        assert (score.final_score_team1, score.final_score_team2) == (1, 1)
+
+    def test_client_id_is_scoped_to_the_score_and_user(
+        self, admin_client, scorekeeper_user, make_team, make_game
+    ):
+        """
+        Test that a client ID only identifies a repeat for the same score and recording user
+        """
+        eagles, falcons = make_team('Eagles'), make_team('Falcons')
+        score, other = make_game(eagles, falcons), make_game(falcons, eagles)
+        score.game.scorekeeper = scorekeeper_user
+        score.game.save(update_fields=['scorekeeper'])
+        data = create_goal(eagles, 5)['data']
+        url = reverse('scores:score-detail-list')
+
+        statuses = [
+            admin_client.post(url, {**data, 'score': str(score.id)}, format='json').status_code,
+            admin_client.post(url, {**data, 'score': str(other.id)}, format='json').status_code,
+        ]
+        admin_client.force_authenticate(scorekeeper_user)
+        statuses.append(admin_client.post(url, {**data, 'score': str(score.id)}, format='json').status_code)
+
+        assert statuses == [status.HTTP_201_CREATED] * 3
+        assert ScoreDetail.objects.filter(client_id=data['client_id']).count() == 3
+
+    def test_concurrent_repeat_returns_the_recorded_event(self, admin_client, make_team, make_game, monkeypatch):
+        """
+        Test that a repeat inserted between the lookup and the insert returns the first event
+        """
+        eagles, falcons = make_team('Eagles'), make_team('Falcons')
+        score = make_game(eagles, falcons)
+        data = {**create_goal(eagles, 5)['data'], 'score': str(score.id)}
+        url = reverse('scores:score-detail-list')
+        created = admin_client.post(url, data, format='json')
+
+        lookups = []
+        recorded_detail = ScoreDetailViewSet.recorded_detail
+
+        def racing_lookup(view, serializer):
+            # The first lookup runs before the other submission commits
+            lookups.append(view)
+            return None if len(lookups) == 1 else recorded_detail(view, serializer)
+
+        monkeypatch.setattr(ScoreDetailViewSet, 'recorded_detail', racing_lookup)
+        repeated = admin_client.post(url, data, format='json')
+
+        assert repeated.status_code == status.HTTP_200_OK
+        assert repeated.data == created.data
+        assert len(lookups) == 2
+        assert ScoreDetail.objects.filter(score=score).count() == 1
@@ -0,0 +1,109 @@
+import uuid
+
+import pytest
+from django.contrib import admin
+from django.urls import reverse
+from rest_framework import status
+
+from leaderboards.models import LeaderboardEntry
+from scores.admin import ScoreAdmin
+from scores.models import Score, ScoreChange
+
+pytestmark = pytest.mark.scores  # Mark all tests in this file as scores tests
+
+
+def complete_game(make_team, make_game, home, away, home_score, away_score):
+    """
+    Create a completed game whose score is waiting for verification
+    """
+    score = make_game(make_team(home), make_team(away), home_score, away_score)
+    Score.objects.filter(pk=score.pk).update(verification_status='pending_verification')
+    return score
+
+
+@pytest.mark.django_db
+class TestBulkScoreVerification:
+    """
+    Bulk score verification tests
+    """
+
+    def test_verifies_scores_and_summarises_the_rest(
+        self, admin_client, admin_user, make_team, make_game, monkeypatch,
+        django_capture_on_commit_callbacks
+    ):
+        """
+        Test that completed scores are verified once and the leaderboard is refreshed once
+        """
+        from leaderboards import signals
+
+        refreshed = []
+        recalculate = signals.recalculate_leaderboard
+        monkeypatch.setattr(
+            signals, 'recalculate_leaderboard',
+            lambda leaderboard: refreshed.append(leaderboard.sport_event_id) or recalculate(leaderboard)
+        )
+        first = complete_game(make_team, make_game, 'Eagles', 'Falcons', 2, 1)
+        second = complete_game(make_team, make_game, 'Hawks', 'Owls', 0, 0)
+        verified = make_game(make_team('Lions'), make_team('Tigers'), 1, 0)
+        live = make_game(make_team('Bears'), make_team('Wolves'))
+        missing = uuid.uuid4()
+        changes = ScoreChange.objects.count()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            response = admin_client.post(
+                reverse('scores:score-verify-bulk'),
+                {'scores': [str(first.id), str(second.id), str(verified.id), str(live.id), str(missing)]},
+                format='json'
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['verified'] == [first.id, second.id]
+        assert response.data['already_verified'] == [verified.id]
+        assert response.data['not_completed'] == [live.id]
+        assert response.data['not_found'] == [missing]
+        assert response.data['sport_events'] == [str(first.game.sport_event_id)]
+        assert refreshed == [first.game.sport_event_id]
+        assert ScoreChange.objects.count() == changes + 2
+
+        first.refresh_from_db()
+        assert first.verification_status == 'verified'
+        assert first.verified_by == admin_user and first.verified_at is not None
+        assert LeaderboardEntry.objects.filter(
+            leaderboard__sport_event=first.game.sport_event, team=first.team1
+        ).values_list('points', flat=True).get() == 3
+
+    def test_requires_verification_permission(self, scorekeeper_client, make_team, make_game):
+        """
+        Test that only administrators can verify scores in bulk
+        """
+        score = complete_game(make_team, make_game, 'Eagles', 'Falcons', 2, 1)
+
+        response = scorekeeper_client.post(
+            reverse('scores:score-verify-bulk'), {'scores': [str(score.id)]}, format='json'
+        )
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        score.refresh_from_db()
+        assert score.verification_status == 'pending_verification'
+
+    def test_admin_action_moves_scores_back_to_pending(self, make_team, make_game, django_capture_on_commit_callbacks):
+        """
+        Test that un-verifying scores in the admin bumps them, logs them and drops them from the leaderboard
+        """
+        verified = make_game(make_team('Eagles'), make_team('Falcons'), 2, 1)
+        pending = complete_game(make_team, make_game, 'Hawks', 'Owls', 0, 0)
+        version = verified.version
+        changes = ScoreChange.objects.count()
+        entries = LeaderboardEntry.objects.filter(leaderboard__sport_event=verified.game.sport_event)
+        assert entries.get(team=verified.team1).points == 3
+
+        score_admin = ScoreAdmin(Score, admin.site)
+        with django_capture_on_commit_callbacks(execute=True):
+            score_admin.mark_as_pending_verification(None, Score.objects.filter(pk__in=[verified.pk, pending.pk]))
+
+        verified.refresh_from_db()
+        assert verified.verification_status == 'pending_verification'
+        assert verified.verified_by is None and verified.verified_at is None
+        assert verified.version == version + 1
+        assert ScoreChange.objects.count() == changes + 1
+        assert not entries.filter(team=verified.team1, points__gt=0).exists()
@@ -2,19 +2,28 @@ from rest_framework import viewsets, filters, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
+from rest_framework.renderers import JSONRenderer
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from django_filters.rest_framework import DjangoFilterBackend
-from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
-from django.db.models import Q
+from django.db.models import Q, prefetch_related_objects
+from django.http import StreamingHttpResponse
 from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiResponse
 
+from scores.caching import get_cached_data, get_versioned_data, read_tags
+from scores.concurrency import IF_MATCH_PARAMETER, VersionCheckedUpdateMixin
+from scores.changes import changes_since, cursor_expired
+from scores.live import EventStreamRenderer, get_feed, stream_changes
+from scores.loaders import score_details_prefetch, score_progression
+from scores.reports import report_data
 from scores.models import Score
+from scores.sync import SyncError, apply_operations
 from scores.serializers import (
     ScoreSerializer, 
     ScoreUpdateSerializer,
     ScoreVerificationSerializer,
+    ScoreBulkVerificationSerializer,
     ScoreCreateSerializer,
+    ScoreSyncSerializer,
     PublicScoreSerializer,
     PublicLiveScoreSerializer,
     LeaderboardScoreSerializer
@@ -27,9 +36,14 @@ from scores.permissions import (
 )
 from games.models import Game
 from games.serializers import ScorekeeperAssignmentSerializer
+from leaderboards.standings import calculate_standings, fresh_standings
 
+# Default and maximum number of change log entries read per sync request
+SYNC_PAGE_SIZE = 500
+SYNC_MAX_PAGE_SIZE = 2000
 
-class ScoreViewSet(viewsets.ModelViewSet):
+
+class ScoreViewSet(VersionCheckedUpdateMixin, viewsets.ModelViewSet):
     """
     API endpoint for managing game scores.
     
@@ -40,11 +54,14 @@ class ScoreViewSet(viewsets.ModelViewSet):
     
     Authentication is done via JWT Bearer token.
     """
-    queryset = Score.objects.all()
+    queryset = Score.objects.select_related(
+        'game__sport_event__event', 'team1', 'team2', 'winner', 'scorekeeper'
+    )
     authentication_classes = [JWTAuthentication]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['game', 'status', 'verification_status']
     ordering_fields = ['created_at', 'updated_at', 'game__start_datetime']
+    conflict_serializer_class = ScoreSerializer
     
     def get_serializer_class(self):
         if self.action == 'create':
@@ -53,6 +70,10 @@ class ScoreViewSet(viewsets.ModelViewSet):
             return ScoreUpdateSerializer
         elif self.action == 'verify_score':
             return ScoreVerificationSerializer
+        elif self.action == 'verify_bulk':
+            return ScoreBulkVerificationSerializer
+        elif self.action == 'sync':
+            return ScoreSyncSerializer
         return ScoreSerializer
     
     def get_queryset(self):
@@ -67,6 +88,12 @@ class ScoreViewSet(viewsets.ModelViewSet):
         queryset = super().get_queryset()
         user = self.request.user
         
+        if self.action == 'list':
+            # ScoreSerializer lists every scoring event of the score
+            queryset = queryset.prefetch_related(score_details_prefetch())
+        elif self.action == 'retrieve':
+            queryset = queryset.select_related('match_report')
+        
         if not user.is_authenticated:
             return queryset  # Public user sees all
             
@@ -94,11 +121,13 @@ class ScoreViewSet(viewsets.ModelViewSet):
     def get_permissions(self):
         if self.action in ['create', 'destroy']:
             permission_classes = [IsAuthenticated, CanManageScores]
-        elif self.action in ['update', 'partial_update']:
+        elif self.action in ['update', 'partial_update', 'sync']:
             permission_classes = [IsAuthenticated, IsAssignedScorekeeper|CanManageScores]
-        elif self.action == 'verify_score':
+        elif self.action in ['verify_score', 'verify_bulk']:
             permission_classes = [IsAuthenticated, CanVerifyScores]
-        elif self.action in ['public_scores', 'live_scores', 'retrieve']:
+        elif self.action in [
+            'public_scores', 'live_scores', 'live_stream', 'changes', 'retrieve', 'progression', 'event_leaderboard'
+        ]:
             permission_classes = [AllowAny]
         elif self.action == 'my_assignments':
             permission_classes = [IsAuthenticated, IsScorekeeper]
@@ -161,18 +190,33 @@ class ScoreViewSet(viewsets.ModelViewSet):
         """
         Retrieve detailed information about a specific score.
         Includes score details and team information.
+        Verified scores are served from their frozen match report; other
+        representations are cached until the score or its game changes.
         """
-        return super().retrieve(request, *args, **kwargs)
+        instance = self.get_object()
+        report = report_data(instance)
+        if report is not None:
+            return self.with_etag(Response(report), report['version'])
+        
+        def build():
+            prefetch_related_objects([instance], score_details_prefetch())
+            return self.get_serializer(instance).data
+        
+        tags = [f'score:{instance.pk}', f'game:{instance.game_id}']
+        data = get_cached_data(request, tags, build)
+        return self.with_etag(Response(data), data['version'])
     
     @extend_schema(
         summary="Update score",
         description="Update details of a score (full update)",
         request=ScoreUpdateSerializer,
+        parameters=[IF_MATCH_PARAMETER],
         responses={
             200: ScoreSerializer,
             400: OpenApiResponse(description="Bad request - invalid data"),
             403: OpenApiResponse(description="Forbidden - insufficient permissions"),
-            404: OpenApiResponse(description="Not found - score does not exist")
+            404: OpenApiResponse(description="Not found - score does not exist"),
+            412: OpenApiResponse(description="Precondition failed - changed since the If-Match version; the current state is returned")
         }
     )
     def update(self, request, *args, **kwargs):
@@ -186,11 +230,13 @@ class ScoreViewSet(viewsets.ModelViewSet):
         summary="Partially update score",
         description="Update specific fields of a score",
         request=ScoreUpdateSerializer,
+        parameters=[IF_MATCH_PARAMETER],
         responses={
             200: ScoreSerializer,
             400: OpenApiResponse(description="Bad request - invalid data"),
             403: OpenApiResponse(description="Forbidden - insufficient permissions"),
-            404: OpenApiResponse(description="Not found - score does not exist")
+            404: OpenApiResponse(description="Not found - score does not exist"),
+            412: OpenApiResponse(description="Precondition failed - changed since the If-Match version; the current state is returned")
         }
     )
     def partial_update(self, request, *args, **kwargs):
@@ -243,6 +289,133 @@ class ScoreViewSet(viewsets.ModelViewSet):
         return_serializer = ScoreSerializer(score)
         return Response(return_serializer.data)
     
+    @extend_schema(
+        summary="Verify scores in bulk",
+        description=(
+            "Verify many completed scores in one transaction. Each affected "
+            "leaderboard is refreshed once, and a summary is returned."
+        ),
+        request=ScoreBulkVerificationSerializer,
+        responses={
+            200: OpenApiResponse(description="IDs of the verified scores and of the scores left unchanged, by reason"),
+            400: OpenApiResponse(description="Bad request - invalid data"),
+            403: OpenApiResponse(description="Forbidden - insufficient permissions")
+        }
+    )
+    @action(detail=False, methods=['post'], url_path='verify-bulk')
+    def verify_bulk(self, request):
+        """
+        Verify many completed scores at once.
+        Scores that are not completed, already verified or do not exist are
+        left unchanged and listed in the summary.
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        score_ids = list(dict.fromkeys(serializer.validated_data['scores']))
+        
+        verified = Score.verify_batch(score_ids, request.user)
+        verified_ids = {score.pk for score in verified}
+        
+        summary = {
+            'verified': [score_id for score_id in score_ids if score_id in verified_ids],
+            'already_verified': [],
+            'not_completed': [],
+            'not_found': [],
+            'sport_events': sorted({str(score.game.sport_event_id) for score in verified})
+        }
+        remaining = dict(Score.objects.filter(
+            pk__in=[score_id for score_id in score_ids if score_id not in verified_ids]
+        ).values_list('pk', 'status'))
+        for score_id in score_ids:
+            if score_id in verified_ids:
+                continue
+            if score_id not in remaining:
+                summary['not_found'].append(score_id)
+            elif remaining[score_id] != 'completed':
+                summary['not_completed'].append(score_id)
+            else:
+                summary['already_verified'].append(score_id)
+        return Response(summary)
+    
+    @extend_schema(
+        summary="Sync score",
+        description=(
+            "Replay operations queued by an offline scorekeeper client. Operations are "
+            "applied in order and all or none; operations applied before are skipped."
+        ),
+        request=ScoreSyncSerializer,
+        responses={
+            200: OpenApiResponse(description="Applied and skipped operation IDs and the updated score"),
+            400: OpenApiResponse(description="Bad request - an operation is invalid, nothing was applied"),
+            403: OpenApiResponse(description="Forbidden - insufficient permissions"),
+            404: OpenApiResponse(description="Not found - score does not exist")
+        }
+    )
+    @action(detail=True, methods=['post'], url_path='sync')
+    def sync(self, request, pk=None):
+        """
+        Apply a batch of offline operations to a score.
+        Each operation is applied at most once, so a batch can safely be sent
+        again after a lost response. The score is recalculated once per batch.
+        """
+        score = self.get_object()
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        
+        try:
+            score, applied, skipped = apply_operations(
+                score,
+                serializer.validated_data['operations'],
+                request.user,
+                self.get_serializer_context()
+            )
+        except SyncError as exc:
+            return Response(
+                {'errors': [{'index': exc.index, 'errors': exc.errors}]},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        score = self.queryset.prefetch_related(score_details_prefetch()).get(pk=score.pk)
+        return Response({
+            'applied': applied,
+            'skipped': skipped,
+            'score': ScoreSerializer(score, context=self.get_serializer_context()).data
+        })
+    
+    @extend_schema(
+        summary="Score progression",
+        description=(
+            "Get the running scoreline of a game after each scoring event, "
+            "e.g. for broadcast graphics and match pages"
+        ),
+        responses={
+            200: OpenApiResponse(description="Cumulative scores of both teams after each scoring event"),
+            404: OpenApiResponse(description="Not found - score does not exist")
+        }
+    )
+    @action(detail=True, methods=['get'], url_path='progression', permission_classes=[AllowAny])
+    def progression(self, request, pk=None):
+        """
+        Get the cumulative score series of a game.
+        Computed in the database in one query and cached until the score
+        moves to a new version.
+        """
+        score = self.get_object()
+        
+        def build():
+            return {
+                'score': str(score.pk),
+                'version': score.version,
+                'team1': str(score.team1_id) if score.team1_id else None,
+                'team1_name': score.team1.name if score.team1_id else None,
+                'team2': str(score.team2_id) if score.team2_id else None,
+                'team2_name': score.team2.name if score.team2_id else None,
+                'series': score_progression(score)
+            }
+        
+        data = get_versioned_data('progression', score, build)
+        return self.with_etag(Response(data), score.version)
+    
     @extend_schema(
         summary="Public scores",
         description="Get a list of scores for public display",
@@ -279,13 +452,16 @@ class ScoreViewSet(viewsets.ModelViewSet):
         if status_param:
             queryset = queryset.filter(status=status_param)
         
-        page = self.paginate_queryset(queryset)
-        if page is not None:
-            serializer = PublicScoreSerializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
+        def build():
+            page = self.paginate_queryset(queryset)
+            if page is not None:
+                serializer = PublicScoreSerializer(page, many=True)
+                return self.get_paginated_response(serializer.data).data
+            
+            serializer = PublicScoreSerializer(queryset, many=True)
+            return serializer.data
         
-        serializer = PublicScoreSerializer(queryset, many=True)
-        return Response(serializer.data)
+        return Response(get_cached_data(request, read_tags(sport_event), build))
     
     @extend_schema(
         summary="Live scores",
@@ -309,8 +485,105 @@ class ScoreViewSet(viewsets.ModelViewSet):
         if sport_event:
             queryset = queryset.filter(game__sport_event=sport_event)
         
-        serializer = PublicLiveScoreSerializer(queryset, many=True)
-        return Response(serializer.data)
+        def build():
+            return PublicLiveScoreSerializer(queryset, many=True).data
+        
+        return Response(get_cached_data(request, read_tags(sport_event), build))
+    
+    @extend_schema(
+        summary="Live score stream",
+        description=(
+            "Server-Sent Events stream of score and scoring event changes. "
+            "Each event carries the change id, its kind (score, detail or detail_deleted) "
+            "and a compact JSON payload. Reconnecting clients resume after the "
+            "Last-Event-ID header, or the last_event_id parameter."
+        ),
+        parameters=[
+            OpenApiParameter(name="sport_event", description="Filter by sport event ID", required=False, type=str),
+            OpenApiParameter(name="last_event_id", description="Resume after this event id", required=False, type=int)
+        ],
+        responses={
+            (200, 'text/event-stream'): OpenApiResponse(description="Stream of score change events"),
+            400: OpenApiResponse(description="Bad request - invalid event id")
+        }
+    )
+    @action(
+        detail=False,
+        methods=['get'],
+        url_path='live/stream',
+        permission_classes=[AllowAny],
+        renderer_classes=[EventStreamRenderer, JSONRenderer]
+    )
+    def live_stream(self, request):
+        """
+        Stream live score changes as Server-Sent Events.
+        All streams of a process share one change feed polling the database.
+        """
+        last_event_id = request.headers.get('Last-Event-ID') or request.query_params.get('last_event_id')
+        if last_event_id is not None:
+            try:
+                last_event_id = int(last_event_id)
+            except ValueError:
+                return Response(
+                    {"detail": "Last-Event-ID must be an integer."},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+        
+        response = StreamingHttpResponse(
+            stream_changes(get_feed(), last_event_id, request.query_params.get('sport_event')),
+            content_type='text/event-stream'
+        )
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'
+        return response
+    
+    @extend_schema(
+        summary="Score changes since a cursor",
+        description=(
+            "Get the current state of scores and scoring events changed after the cursor "
+            "returned by the previous call. since=0 returns every score and event with the "
+            "cursor to continue from. Each score and event is listed once, in compact form; "
+            "deleted ones are listed by id. While 'more' is "
+            "true, call again with the returned cursor. A 410 response means the cursor "
+            "is older than the retained change log and the client has to sync from 0."
+        ),
+        parameters=[
+            OpenApiParameter(name="since", description="Cursor returned by the previous call", required=False, type=int),
+            OpenApiParameter(name="sport_event", description="Filter by sport event ID", required=False, type=str),
+            OpenApiParameter(name="limit", description=f"Change log entries to read (max {SYNC_MAX_PAGE_SIZE})", required=False, type=int)
+        ],
+        responses={
+            200: OpenApiResponse(description="Changed scores and scoring events with the next cursor"),
+            400: OpenApiResponse(description="Bad request - invalid cursor or limit"),
+            410: OpenApiResponse(description="Gone - cursor expired, sync from 0")
+        }
+    )
+    @action(detail=False, methods=['get'], url_path='changes', permission_classes=[AllowAny])
+    def changes(self, request):
+        """
+        Get the scores and scoring events changed since a cursor.
+        Lets clients stay in sync without downloading unchanged scores.
+        """
+        try:
+            since = int(request.query_params.get('since', 0))
+            limit = int(request.query_params.get('limit', SYNC_PAGE_SIZE))
+        except ValueError:
+            return Response(
+                {"detail": "since and limit must be integers."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if since < 0 or not 0 < limit <= SYNC_MAX_PAGE_SIZE:
+            return Response(
+                {"detail": f"since must not be negative and limit must be between 1 and {SYNC_MAX_PAGE_SIZE}."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if cursor_expired(since):
+            return Response(
+                {"detail": "Cursor expired; sync again from since=0."},
+                status=status.HTTP_410_GONE
+            )
+        
+        return Response(changes_since(since, request.query_params.get('sport_event'), limit))
     
     @extend_schema(
         summary="Scorekeeper's assigned games (direct)",
@@ -333,7 +606,12 @@ class ScoreViewSet(viewsets.ModelViewSet):
         
     @extend_schema(
         summary="Event leaderboard",
-        description="Get a leaderboard for a specific sport event",
+        description=(
+            "Get a leaderboard for a specific sport event. "
+            "Served from the stored leaderboard when it is up to date; the "
+            "X-Leaderboard-Freshness header is 'fresh' in that case and 'stale' "
+            "when the standings had to be computed from the results."
+        ),
         parameters=[
             OpenApiParameter(name="sport_event", description="Sport event ID", required=True, type=str)
         ],
@@ -343,7 +621,8 @@ class ScoreViewSet(viewsets.ModelViewSet):
     def event_leaderboard(self, request):
         """
         Get a leaderboard for a specific sport event.
-        Calculates team standings based on game results.
+        Reads the stored leaderboard entries when they are fresh and falls back
+        to calculating team standings from game results otherwise.
         """
         sport_event = request.query_params.get('sport_event')
         if not sport_event:
@@ -352,86 +631,30 @@ class ScoreViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Get all completed games for this sport event
-        scores = Score.objects.filter(
-            game__sport_event=sport_event,
-            status='completed',
-            verification_status='verified'
-        )
-        
-        # Get all teams that participated in these games
-        team_ids = set()
-        for score in scores:
-            for team_relation in score.game.game_teams.all():
-                team_ids.add(team_relation.team.id)
+        stored_leaderboard, rows = fresh_standings(sport_event)
+        freshness = 'fresh'
+        if rows is None:
+            rows = calculate_standings(sport_event)
+            freshness = 'stale'
         
-        # Initialize leaderboard data
-        leaderboard = []
-        for team_id in team_ids:
-            team = scores[0].game.game_teams.filter(team_id=team_id).first().team
-            
-            # Calculate team statistics
-            team_stats = {
-                'team_id': team_id,
-                'team_name': team.name,
-                'played': 0,
-                'won': 0,
-                'drawn': 0,
-                'lost': 0,
-                'goals_for': 0,
-                'goals_against': 0,
-                'goal_difference': 0,
-                'points': 0
+        leaderboard = [
+            {
+                'team_id': row['team_id'],
+                'team_name': row['team_name'],
+                'played': row['played'],
+                'won': row['won'],
+                'drawn': row['drawn'],
+                'lost': row['lost'],
+                'goals_for': row['goals_for'],
+                'goals_against': row['goals_against'],
+                'goal_difference': row['goal_difference'],
+                'points': row['points']
             }
-            
-            # Process each score to update statistics
-            for score in scores:
-                # Check if this team participated in this game
-                team_designations = score.game.game_teams.filter(team_id=team_id)
-                if not team_designations.exists():
-                    continue
-                
-                # Increment games played
-                team_stats['played'] += 1
-                
-                # Get team designation
-                team_designation = team_designations.first().designation
-                
-                # Set team position (1 or 2) based on designation
-                team_position = 1 if team_designation in ['team_a', 'home'] else 2
-                
-                # Get opponent position
-                opponent_position = 2 if team_position == 1 else 1
-                
-                # Add goals for/against
-                if team_position == 1:
-                    team_stats['goals_for'] += score.goals_for_team1
-                    team_stats['goals_against'] += score.goals_against_team1
-                else:
-                    team_stats['goals_for'] += score.goals_for_team2
-                    team_stats['goals_against'] += score.goals_against_team2
-                
-                # Determine win/loss/draw
-                if score.is_draw:
-                    team_stats['drawn'] += 1
-                    team_stats['points'] += 1  # 1 point for a draw
-                elif score.winner and score.winner.id == team_id:
-                    team_stats['won'] += 1
-                    team_stats['points'] += 3  # 3 points for a win
-                else:
-                    team_stats['lost'] += 1
-                    # 0 points for a loss
-            
-            # Calculate goal difference
-            team_stats['goal_difference'] = team_stats['goals_for'] - team_stats['goals_against']
-            
-            leaderboard.append(team_stats)
-        
-        # Sort leaderboard by points (descending), goal difference, goals for
-        leaderboard.sort(
-            key=lambda x: (-x['points'], -x['goal_difference'], -x['goals_for'])
-        )
+            for row in rows
+        ]
         
-        return Response(leaderboard)
-
-
+        response = Response(leaderboard)
+        response['X-Leaderboard-Freshness'] = freshness
+        if freshness == 'fresh':
+            response['X-Leaderboard-Updated'] = stored_leaderboard.last_updated.isoformat()
+        return response
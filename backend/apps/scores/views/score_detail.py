@@ -1,8 +1,13 @@
-from rest_framework import viewsets, filters
+import uuid
+
+from rest_framework import viewsets, filters, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.generics import get_object_or_404
+from rest_framework.pagination import PageNumberPagination
 from rest_framework_simplejwt.authentication import JWTAuthentication
+from django.db import IntegrityError, transaction
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiResponse
 
@@ -10,11 +15,39 @@ from scores.models import Score, ScoreDetail
 from scores.serializers import (
     ScoreDetailSerializer,
     ScoreDetailCreateSerializer,
+    ScoreDetailBatchSerializer,
 )
 from scores.permissions import CanManageScores
+from scores.concurrency import IF_MATCH_PARAMETER, VersionCheckedUpdateMixin
+from utils.pagination import KeysetPagination
+
+# Maximum number of scoring events accepted in one batch request
+MAX_BATCH_SIZE = 100
+
+
+def client_id(item):
+    """
+    Return the client ID of a submitted scoring event, or None if it has no valid one.
+    """
+    try:
+        return uuid.UUID(str(item['client_id']))
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+class ScoreDetailPagination(KeysetPagination):
+    """
+    Keyset pagination of scoring events in the order they occurred.
+
+    Events at the same time are ordered by when they were recorded; the
+    random UUID id only separates events recorded at the same instant.
+    Requests using ``ordering`` are paged by page number, as before.
+    """
+    ordering = ('time_occurred', 'created_at', 'id')
+    fallback_class = PageNumberPagination
 
 
-class ScoreDetailViewSet(viewsets.ModelViewSet):
+class ScoreDetailViewSet(VersionCheckedUpdateMixin, viewsets.ModelViewSet):
     """
     API endpoint for managing score details (individual scoring events within a game).
     
@@ -25,11 +58,14 @@ class ScoreDetailViewSet(viewsets.ModelViewSet):
     
     Authentication is done via JWT Bearer token.
     """
-    queryset = ScoreDetail.objects.all()
+    queryset = ScoreDetail.objects.select_related('team', 'player', 'assisted_by')
     authentication_classes = [JWTAuthentication]
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_fields = ['score', 'team', 'player', 'event_type']
     ordering_fields = ['time_occurred', 'minute', 'created_at']
+    # Scoring events are paged in the order they occurred, unless ordering is given
+    pagination_class = ScoreDetailPagination
+    conflict_serializer_class = ScoreDetailSerializer
     
     def get_serializer_class(self):
         if self.action == 'create':
@@ -37,7 +73,7 @@ class ScoreDetailViewSet(viewsets.ModelViewSet):
         return ScoreDetailSerializer
     
     def get_permissions(self):
-        if self.action in ['create', 'update', 'partial_update', 'destroy']:
+        if self.action in ['create', 'update', 'partial_update', 'destroy', 'batch']:
             permission_classes = [IsAuthenticated, CanManageScores]
         else:
             permission_classes = [IsAuthenticated]
@@ -55,6 +91,10 @@ class ScoreDetailViewSet(viewsets.ModelViewSet):
         queryset = super().get_queryset()
         user = self.request.user
         
+        if 'score_pk' in self.kwargs:
+            # Nested routes only list the scoring events of their score
+            queryset = queryset.filter(score_id=self.kwargs['score_pk'])
+        
         if not user.is_authenticated:
             return queryset  # Public user sees all
             
@@ -114,13 +154,13 @@ class ScoreDetailViewSet(viewsets.ModelViewSet):
             OpenApiParameter(name="team", description="Filter by team ID", required=False, type=str),
             OpenApiParameter(name="player", description="Filter by player ID", required=False, type=str),
             OpenApiParameter(name="event_type", description="Filter by event type", required=False, type=str),
-            OpenApiParameter(name="ordering", description="Order by field", required=False, type=str)
+            OpenApiParameter(name="ordering", description="Order by field, paging by page number instead of cursor", required=False, type=str)
         ],
         responses={200: ScoreDetailSerializer(many=True)}
     )
     def list(self, request, *args, **kwargs):
         """
-        List all scoring events.
+        List all scoring events, in the order they occurred.
         Supports filtering by score, team, player, and event_type.
         """
         return super().list(request, *args, **kwargs)
@@ -139,8 +179,38 @@ class ScoreDetailViewSet(viewsets.ModelViewSet):
         Create a new scoring event.
         Only scorekeepers assigned to the game or users with score management 
         permissions can create scoring events.
+        An event sent again by the same user with the same client_id for
+        the same score is not recorded twice; the existing event is returned
+        instead, with 200, even when both submissions arrive at once.
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        existing = self.recorded_detail(serializer)
+        if existing is not None:
+            return Response(self.get_serializer(existing).data)
+        try:
+            with transaction.atomic():
+                self.perform_create(serializer)
+        except IntegrityError:
+            # A concurrent submission of the same event was recorded first
+            existing = self.recorded_detail(serializer)
+            if existing is None:
+                raise
+            return Response(self.get_serializer(existing).data)
+        headers = self.get_success_headers(serializer.data)
+        return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
+    
+    def recorded_detail(self, serializer):
+        """
+        Return the scoring event this user already recorded for the score
+        under the submitted client_id, if any.
         """
-        return super().create(request, *args, **kwargs)
+        data = serializer.validated_data
+        key = data.get('client_id')
+        if key is None:
+            return None
+        score = data.get('score') or serializer.context.get('score')
+        return ScoreDetail.objects.filter(score=score, created_by=self.request.user, client_id=key).first()
     
     @extend_schema(
         summary="Retrieve score detail",
@@ -154,17 +224,20 @@ class ScoreDetailViewSet(viewsets.ModelViewSet):
         """
         Retrieve detailed information about a specific scoring event.
         """
-        return super().retrieve(request, *args, **kwargs)
+        response = super().retrieve(request, *args, **kwargs)
+        return self.with_etag(response, response.data['version'])
     
     @extend_schema(
         summary="Update score detail",
         description="Update a scoring event (full update)",
         request=ScoreDetailSerializer,
+        parameters=[IF_MATCH_PARAMETER],
         responses={
             200: ScoreDetailSerializer,
             400: OpenApiResponse(description="Bad request - invalid data"),
             403: OpenApiResponse(description="Forbidden - insufficient permissions"),
-            404: OpenApiResponse(description="Not found - scoring event does not exist")
+            404: OpenApiResponse(description="Not found - scoring event does not exist"),
+            412: OpenApiResponse(description="Precondition failed - changed since the If-Match version; the current state is returned")
         }
     )
     def update(self, request, *args, **kwargs):
@@ -179,11 +252,13 @@ class ScoreDetailViewSet(viewsets.ModelViewSet):
         summary="Partially update score detail",
         description="Update specific fields of a scoring event",
         request=ScoreDetailSerializer,
+        parameters=[IF_MATCH_PARAMETER],
         responses={
             200: ScoreDetailSerializer,
             400: OpenApiResponse(description="Bad request - invalid data"),
             403: OpenApiResponse(description="Forbidden - insufficient permissions"),
-            404: OpenApiResponse(description="Not found - scoring event does not exist")
+            404: OpenApiResponse(description="Not found - scoring event does not exist"),
+            412: OpenApiResponse(description="Precondition failed - changed since the If-Match version; the current state is returned")
         }
     )
     def partial_update(self, request, *args, **kwargs):
@@ -223,9 +298,10 @@ class ScoreDetailViewSet(viewsets.ModelViewSet):
     def by_score(self, request, score_id=None):
         """
         Get all scoring events for a specific game score.
-        Ordered by time occurred.
+        Ordered by time occurred and paged by cursor, so pages stay stable
+        while events are being added.
         """
-        score_details = self.queryset.filter(score_id=score_id).order_by('time_occurred')
+        score_details = self.queryset.filter(score_id=score_id)
         
         page = self.paginate_queryset(score_details)
         if page is not None:
@@ -233,4 +309,82 @@ class ScoreDetailViewSet(viewsets.ModelViewSet):
             return self.get_paginated_response(serializer.data)
         
         serializer = self.get_serializer(score_details, many=True)
-        return Response(serializer.data)
\ No newline at end of file
+        return Response(serializer.data)
+    
+    @extend_schema(
+        summary="Record a batch of score details",
+        description=(
+            "Record several scoring events of a game score at once. "
+            "Either every event is recorded or, if any is invalid, none is and "
+            "the errors are reported per item by its position in the request."
+        ),
+        parameters=[
+            OpenApiParameter(name="score_pk", location=OpenApiParameter.PATH, description="Score ID", required=True, type=str)
+        ],
+        request=ScoreDetailCreateSerializer(many=True),
+        responses={
+            201: ScoreDetailBatchSerializer,
+            400: OpenApiResponse(description="Bad request - invalid items, listed with their index"),
+            403: OpenApiResponse(description="Forbidden - insufficient permissions"),
+            404: OpenApiResponse(description="Not found - score does not exist")
+        }
+    )
+    @action(detail=False, methods=['post'])
+    def batch(self, request, score_pk=None):
+        """
+        Record a batch of scoring events for a score in one transaction.
+        The parent score is recalculated once and its new totals returned.
+        """
+        if score_pk is None:
+            return Response(
+                {"detail": "Batches must be posted to a score's details."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        score = get_object_or_404(Score.objects.select_related('game'), pk=score_pk)
+        self.check_object_permissions(request, score)
+        
+        items = request.data
+        if not isinstance(items, list) or not items:
+            return Response(
+                {"detail": "Expected a non-empty list of scoring events."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(items) > MAX_BATCH_SIZE:
+            return Response(
+                {"detail": f"A batch can contain at most {MAX_BATCH_SIZE} scoring events."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        context = {'request': request, 'format': self.format_kwarg, 'view': self, 'score': score}
+        with transaction.atomic():
+            # Serialise retries of the same batch
+            score = Score.objects.select_for_update().select_related('game').get(pk=score.pk)
+            # Events already recorded under their client_id, or repeated
+            # within the batch, are only recorded once
+            recorded = set(ScoreDetail.objects.filter(
+                score=score, created_by=request.user,
+                client_id__in=[client_id(item) for item in items]
+            ).values_list('client_id', flat=True))
+            details, errors = [], []
+            for index, item in enumerate(items):
+                key = client_id(item)
+                if key in recorded:
+                    continue
+                serializer = ScoreDetailCreateSerializer(data=item, context=context)
+                if not serializer.is_valid():
+                    errors.append({'index': index, 'errors': serializer.errors})
+                    continue
+                data = serializer.validated_data
+                if data.get('score', score).pk != score.pk:
+                    errors.append({'index': index, 'errors': {'score': ["Must match the score in the URL."]}})
+                    continue
+                if key:
+                    recorded.add(key)
+                details.append(ScoreDetail(**{**data, 'created_by': request.user}))
+            if errors:
+                return Response({'errors': errors}, status=status.HTTP_400_BAD_REQUEST)
+            
+            if details:
+                details = ScoreDetail.record_batch(score, details)
+        score.details = details
+        return Response(ScoreDetailBatchSerializer(score).data, status=status.HTTP_201_CREATED)
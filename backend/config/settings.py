@@ -120,6 +120,20 @@ DATABASES = {
     }
 }
 
+# Cache
+# Cached score and leaderboard responses are invalidated by writes made in any
+# process, so every process must share one cache: Redis or Memcached
+CACHE_BACKENDS = {
+    'redis': 'django.core.cache.backends.redis.RedisCache',
+    'memcached': 'django.core.cache.backends.memcached.PyMemcacheCache',
+}
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKENDS[os.environ.get('CACHE_BACKEND', 'redis')],
+        'LOCATION': os.environ.get('CACHE_LOCATION', 'redis://localhost:6379/0'),
+    }
+}
+
 # Settings for pytest-django
 if 'pytest' in sys.modules:
     # Use fast in-memory SQLite database for tests
@@ -240,6 +254,32 @@ SIMPLE_JWT = {
     'TOKEN_TYPE_CLAIM': 'token_type',
 }
 
+# Leaderboard settings
+# 'incremental' applies each verified result to its leaderboard immediately,
+# 'deferred' only queues the sport event for the process_leaderboard_queue worker
+LEADERBOARD_UPDATE_MODE = os.environ.get('LEADERBOARD_UPDATE_MODE', 'incremental')
+LEADERBOARD_QUEUE_QUIET_SECONDS = float(os.environ.get('LEADERBOARD_QUEUE_QUIET_SECONDS', '5'))
+LEADERBOARD_QUEUE_MAX_DELAY_SECONDS = float(os.environ.get('LEADERBOARD_QUEUE_MAX_DELAY_SECONDS', '60'))
+LEADERBOARD_QUEUE_POLL_SECONDS = float(os.environ.get('LEADERBOARD_QUEUE_POLL_SECONDS', '2'))
+LEADERBOARD_CACHE_TIMEOUT = int(os.environ.get('LEADERBOARD_CACHE_TIMEOUT', '3600'))
+LEADERBOARD_SIMULATION_SEASONS = int(os.environ.get('LEADERBOARD_SIMULATION_SEASONS', '20000'))
+LEADERBOARD_SIMULATION_MAX_SEASONS = int(os.environ.get('LEADERBOARD_SIMULATION_MAX_SEASONS', '100000'))
+LEADERBOARD_SIMULATION_WORKERS = int(os.environ.get('LEADERBOARD_SIMULATION_WORKERS', '2'))
+LEADERBOARD_SIMULATION_BUDGET_SECONDS = float(os.environ.get('LEADERBOARD_SIMULATION_BUDGET_SECONDS', '2'))
+
+# Score settings
+# Public score responses are invalidated on writes; the timeout only bounds memory use
+SCORE_CACHE_TIMEOUT = int(os.environ.get('SCORE_CACHE_TIMEOUT', '3600'))
+# Changes are logged on commit and only read once this old, so inserts of lower ids have finished
+SCORE_CHANGE_SETTLE_SECONDS = float(os.environ.get('SCORE_CHANGE_SETTLE_SECONDS', '1'))
+
+# Live score stream settings
+LIVE_SCORE_POLL_SECONDS = float(os.environ.get('LIVE_SCORE_POLL_SECONDS', '1'))
+LIVE_SCORE_HEARTBEAT_SECONDS = float(os.environ.get('LIVE_SCORE_HEARTBEAT_SECONDS', '15'))
+LIVE_SCORE_STREAM_SECONDS = float(os.environ.get('LIVE_SCORE_STREAM_SECONDS', '300'))
+LIVE_SCORE_REPLAY_LIMIT = int(os.environ.get('LIVE_SCORE_REPLAY_LIMIT', '500'))
+LIVE_SCORE_POLL_LIMIT = int(os.environ.get('LIVE_SCORE_POLL_LIMIT', '500'))
+
 # CORS settings
 CORS_ALLOWED_ORIGINS = os.environ.get(
     'CORS_ALLOWED_ORIGINS', 
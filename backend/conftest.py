@@ -133,4 +133,175 @@ def public_client(public_user, api_client):
     """
     refresh = RefreshToken.for_user(public_user)
     api_client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
-    return api_client
\ No newline at end of file
+    return api_client
+
+@pytest.fixture
+def team_manager_user(db):
+    """
+    Fixture that creates and returns a team manager user
+    """
+    manager = User.objects.create_user(
+        email='manager@example.com',
+        username='manager',
+        password='password123',
+        first_name='Team',
+        last_name='Manager',
+        role='team_manager'
+    )
+    return manager
+
+@pytest.fixture
+def make_sport_event(db, admin_user):
+    """
+    Fixture that returns a factory creating sport events, by default a
+    football sport event of a new event
+    """
+    from datetime import date
+    from django.utils import timezone
+    from events.models import Event, SportEvent
+
+    def _make_sport_event(name='Football Cup', sport_type='football', event=None):
+        if event is None:
+            event = Event.objects.create(
+                name='Annual Tournament',
+                start_date=date(2025, 3, 1),
+                end_date=date(2025, 3, 31),
+                location='Main Stadium',
+                created_by=admin_user
+            )
+        return SportEvent.objects.create(
+            event=event,
+            sport_type=sport_type,
+            name=name,
+            start_date=date(2025, 3, 1),
+            end_date=date(2025, 3, 31),
+            registration_deadline=timezone.now(),
+            created_by=admin_user
+        )
+    return _make_sport_event
+
+@pytest.fixture
+def sport_event(make_sport_event):
+    """
+    Fixture that creates and returns a football sport event
+    """
+    return make_sport_event()
+
+@pytest.fixture
+def make_team(db, team_manager_user):
+    """
+    Fixture that returns a factory creating teams by name
+    """
+    from teams.models import Team
+
+    def _make_team(name):
+        return Team.objects.create(
+            name=name,
+            manager=team_manager_user,
+            contact_email=f'{name.lower()}@example.com'
+        )
+    return _make_team
+
+@pytest.fixture
+def make_game(db, admin_user, sport_event):
+    """
+    Fixture that returns a factory creating a game between two teams
+    with its score record.
+
+    When both scores are given the score is completed and verified.
+    """
+    from datetime import timedelta
+    from django.utils import timezone
+    from games.models import Game, GameTeam
+    from scores.models import Score
+
+    def _make_game(home, away, home_score=None, away_score=None, event=None):
+        start = timezone.now()
+        game = Game.objects.create(
+            sport_event=event or sport_event,
+            name=f'{home.name} vs {away.name}',
+            location='Main Stadium',
+            start_datetime=start,
+            end_datetime=start + timedelta(hours=2),
+            created_by=admin_user
+        )
+        GameTeam.objects.create(game=game, team=home, designation='home')
+        GameTeam.objects.create(game=game, team=away, designation='away')
+
+        score = Score.objects.create(game=game, final_score_team1=0, final_score_team2=0)
+        if home_score is not None and away_score is not None:
+            game.status = 'completed'
+            game.save(update_fields=['status'])
+            score.final_score_team1 = home_score
+            score.final_score_team2 = away_score
+            score.status = 'completed'
+            winner = score.determine_winner()
+            score.winner = winner
+            score.is_draw = winner is None
+            score.verification_status = 'verified'
+            score.verified_by = admin_user
+            score.verified_at = timezone.now()
+            score.save()
+        return score
+    return _make_game
+
+@pytest.fixture(autouse=True)
+def settled_score_changes(settings):
+    """
+    Fixture that makes score changes readable as soon as they are logged
+    """
+    settings.SCORE_CHANGE_SETTLE_SECONDS = 0
+
+
+@pytest.fixture
+def locmem_cache(settings):
+    """
+    Fixture that replaces the dummy test cache with a real in-memory cache
+    """
+    settings.CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'test-cache',
+        }
+    }
+
+@pytest.fixture
+def make_player(db):
+    """
+    Fixture that returns a factory creating players of a team
+    """
+    from datetime import date
+    from teams.models import Player
+
+    def _make_player(team, first_name, last_name='Player', jersey_number=None):
+        return Player.objects.create(
+            team=team,
+            first_name=first_name,
+            last_name=last_name,
+            jersey_number=jersey_number or Player.objects.filter(team=team).count() + 1,
+            date_of_birth=date(2000, 1, 1),
+            joined_date=date(2024, 1, 1)
+        )
+    return _make_player
+
+@pytest.fixture
+def make_score_event(db):
+    """
+    Fixture that returns a factory recording a scoring event for a team,
+    at 15:<minute> of the match day
+    """
+    from datetime import time
+    from scores.models import ScoreDetail
+
+    def _make_score_event(score, team, player=None, event_type='goal', points=1, minute=10, assisted_by=None):
+        return ScoreDetail.objects.create(
+            score=score,
+            team=team,
+            player=player,
+            assisted_by=assisted_by,
+            event_type=event_type,
+            points=points,
+            minute=minute,
+            time_occurred=time(15, minute % 60)
+        )
+    return _make_score_event
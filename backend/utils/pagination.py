@@ -0,0 +1,174 @@
+"""
+Keyset pagination for lists that grow while they are being read.
+
+Pages are selected by the ordering values of the last item already seen
+rather than by an offset, so reading a page needs neither a COUNT(*) nor an
+OFFSET, and items inserted meanwhile never shift later pages. Requests
+that choose their own ``ordering`` can fall back to offset pagination.
+"""
+import base64
+import json
+from datetime import date, datetime, time
+from uuid import UUID
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+def encode_cursor(values):
+    """
+    Return the opaque cursor for a position given by its ordering values.
+    """
+    values = [
+        value.isoformat() if isinstance(value, (date, datetime, time)) else
+        str(value) if isinstance(value, UUID) else value
+        for value in values
+    ]
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+def decode_cursor(cursor, size):
+    """
+    Return the ordering values of a cursor, or None if it is not valid.
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (TypeError, ValueError):
+        return None
+    if not isinstance(values, list) or len(values) != size:
+        return None
+    return values
+
+
+def after(ordering, values):
+    """
+    Return the filter selecting rows that come after ``values`` in
+    ``ordering``, compared as a tuple: ``(a, b) > (x, y)`` is
+    ``a > x OR (a = x AND b > y)``.
+    """
+    condition = Q()
+    equal = Q()
+    for field, value in zip(ordering, values):
+        name = field.lstrip('-')
+        lookup = 'lt' if field.startswith('-') else 'gt'
+        condition |= equal & Q(**{f'{name}__{lookup}': value})
+        equal &= Q(**{name: value})
+    return condition
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination over a unique tuple of ordering fields.
+
+    ``next`` links to the following page while more items exist. ``newer``
+    always links to the items after the last one returned, so a client at
+    the head of a growing timeline can poll it for items added later.
+    Subclasses set ``ordering``; its last field must make the order unique.
+
+    With ``fallback_class`` set, requests carrying an ``ordering`` query
+    parameter are paged by that pagination class instead, in the order the
+    client asked for and then by ``ordering`` to break ties.
+    """
+    ordering = ('-created_at', 'id')
+    fallback_class = None
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = _('Invalid cursor')
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(size, 1), self.max_page_size)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.fallback = None
+        if self.fallback_class and request.query_params.get(api_settings.ORDERING_PARAM):
+            self.fallback = self.fallback_class()
+            queryset = queryset.order_by(*queryset.query.order_by, *self.ordering)
+            return self.fallback.paginate_queryset(queryset, request, view)
+
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.cursor = request.query_params.get(self.cursor_query_param)
+        size = self.get_page_size(request)
+
+        queryset = queryset.order_by(*self.ordering)
+        if self.cursor:
+            values = decode_cursor(self.cursor, len(self.ordering))
+            if values is None:
+                raise NotFound(self.invalid_cursor_message)
+            try:
+                queryset = queryset.filter(after(self.ordering, values))
+            except (ValidationError, TypeError, ValueError):
+                # A cursor value that does not fit its field
+                raise NotFound(self.invalid_cursor_message)
+
+        # One extra row tells whether another page follows
+        page = list(queryset[:size + 1])
+        self.has_next = len(page) > size
+        self.page = page[:size]
+        return self.page
+
+    def position(self, item):
+        return [getattr(item, field.lstrip('-')) for field in self.ordering]
+
+    def get_link(self, cursor):
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def get_newer_link(self):
+        if self.page:
+            return self.get_link(encode_cursor(self.position(self.page[-1])))
+        if self.cursor:
+            return self.get_link(self.cursor)
+        return self.base_url
+
+    def get_paginated_response(self, data):
+        if self.fallback:
+            return self.fallback.get_paginated_response(data)
+        newer = self.get_newer_link()
+        return Response({
+            'next': newer if self.has_next else None,
+            'newer': newer,
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        link = {'type': 'string', 'format': 'uri', 'nullable': True}
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {**link, 'description': 'Next page, while more items exist'},
+                'newer': {**link, 'nullable': False, 'description': 'Items added after the last one returned'},
+                'results': schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Position after which the page starts, taken from a next or newer link',
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': self.page_size_query_param,
+                'required': False,
+                'in': 'query',
+                'description': f'Number of results per page, up to {self.max_page_size}',
+                'schema': {'type': 'integer'},
+            },
+        ]
+